@@ -72,6 +72,7 @@ setuptools.setup(
         "netius.adapters",
         "netius.auth",
         "netius.base",
+        "netius.bench",
         "netius.clients",
         "netius.common",
         "netius.examples",
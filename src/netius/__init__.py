@@ -35,9 +35,15 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 from . import adapters
-from . import auth
 from . import base
 
 from .adapters import *
-from .auth import *
 from .base import *
+
+# the authentication package is only loaded when one of its names
+# is first accessed, the remaining packages are required by the base
+# infra-structure and so there's no gain in loading them lazily
+legacy.lazy(globals(), (
+    ("auth", ("AddressAuth", "AllowAuth", "Auth", "DenyAuth", "DummyAuth",
+        "MemoryAuth", "PasswdAuth", "SimpleAuth")),
+), exports = [name for name in list(globals()) if not name.startswith("_")])
@@ -36,6 +36,7 @@ __license__ = "Apache License, Version 2.0"
 
 from . import agent
 from . import asynchronous
+from . import buffer
 from . import client
 from . import common
 from . import compat
@@ -45,12 +46,14 @@ from . import container
 from . import errors
 from . import legacy
 from . import log
+from . import metrics
 from . import observer
 from . import poll
 from . import protocol
 from . import request
 from . import server
 from . import stream
+from . import timer
 from . import tls
 from . import transport
 from . import util
@@ -60,6 +63,7 @@ from .asynchronous import Future, Task, Handle, Executor, ThreadPoolExecutor, co
     async_test_all, async_test, ensure_generator, get_asyncio, is_coroutine,\
     is_coroutine_object, is_coroutine_native, is_future, is_neo, is_asynclib, is_await,\
     wakeup, sleep, wait, notify, coroutine_return
+from .buffer import BufferPool
 from .client import Client, DatagramClient, StreamClient
 from .common import NAME, VERSION, IDENTIFIER_SHORT, IDENTIFIER_LONG,\
     IDENTIFIER, TCP_TYPE, UDP_TYPE, SSL_KEY_PATH, SSL_CER_PATH, SSL_CA_PATH,\
@@ -74,12 +78,14 @@ from .container import Container, ContainerServer
 from .errors import NetiusError, RuntimeError, StopError, PauseError, WakeupError,\
     DataError, ParserError, GeneratorError, SecurityError, NotImplemented, AssertionError
 from .log import SILENT, rotating_handler, smtp_handler
+from .metrics import Metric, Counter, Gauge, Histogram, Registry
 from .observer import Observable
 from .poll import Poll, EpollPoll, KqueuePoll, PollPoll, SelectPoll
 from .protocol import Protocol, DatagramProtocol, StreamProtocol
 from .request import Request, Response
 from .server import Server, DatagramServer, StreamServer
 from .stream import Stream
+from .timer import Timer, TimerWheel
 from .tls import fingerprint, match_fingerprint, match_hostname, dnsname_match,\
     dump_certificate
 from .transport import Transport, TransportDatagram, TransportStream
@@ -202,8 +202,7 @@ class Handle(object):
 
     def cancel(self):
         if not self._callable_t: return
-        options = self._callable_t[4]
-        options[0] = False
+        self._callable_t.cancel()
 
 class Executor(object):
 
@@ -0,0 +1,84 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+BUFFER_SIZE = 16384
+""" The size (in bytes) of each of the buffers created by
+the pool, should be large enough to hold a complete chunk
+of data received from a socket (as in chunk size) """
+
+BUFFER_LIMIT = 64
+""" The maximum number of (unused) buffers that are kept
+in the pool, the remaining ones are discarded on release
+so that the memory is returned to the system """
+
+class BufferPool(object):
+    """
+    Pool of reusable (bytearray) buffers that are meant to be
+    used as the target of the receive operations (recv_into),
+    avoiding the allocation of a new bytes object per read.
+
+    A pool is meant to be used from a single event loop (thread)
+    so no locking is performed on its operations.
+    """
+
+    def __init__(self, size = BUFFER_SIZE, limit = BUFFER_LIMIT):
+        self.size = size
+        self.limit = limit
+        self.buffers = []
+        self.created = 0
+
+    def acquire(self):
+        if self.buffers: return self.buffers.pop()
+        self.created += 1
+        return bytearray(self.size)
+
+    def release(self, buffer):
+        if len(self.buffers) >= self.limit: return
+        self.buffers.append(buffer)
+
+    def clear(self):
+        del self.buffers[:]
+
+    def info_dict(self):
+        return dict(
+            size = self.size,
+            limit = self.limit,
+            available = len(self.buffers),
+            created = self.created
+        )
@@ -121,6 +121,21 @@ class Client(Base):
             self.poll_timeout,
             cast = float
         )
+        if env: self.poll_adaptive = self.get_env(
+            "POLL_ADAPTIVE",
+            self.poll_adaptive,
+            cast = bool
+        )
+        if env: self.poll_dispatch = self.get_env(
+            "POLL_DISPATCH",
+            self.poll_dispatch,
+            cast = bool
+        )
+        if env: self.read_budget = self.get_env(
+            "READ_BUDGET",
+            self.read_budget,
+            cast = int
+        )
 
         # prints a debug message about the new thread to be created for
         # the client infra-structure (required for execution)
@@ -514,8 +529,14 @@ class StreamClient(Client):
     def ticks(self):
         self.set_state(STATE_TICK)
         self._lid = (self._lid + 1) % 2147483647
+        self._readies()
         if self.pendings: self._connects()
         self._delays()
+        self._flushes()
+
+    def get_timeout(self):
+        if self.pendings: return 0.0
+        return Client.get_timeout(self)
 
     def info_dict(self, full = False):
         info = Client.info_dict(self, full = full)
@@ -765,6 +786,11 @@ class StreamClient(Client):
         try: self.pendings.append(connection)
         finally: self._pending_lock.release()
 
+        # wakes up the event loop (in case the connect operation has been
+        # requested from a different thread) so that the pending connection
+        # is handled as soon as possible (no timer driven poll return)
+        self.wakeup()
+
         # returns the "final" connection, that is now scheduled for connect
         # to the caller method, it may now be used for operations
         return connection
@@ -774,6 +800,10 @@ class StreamClient(Client):
         self.delay(acquire)
 
     def on_read(self, _socket):
+        # in case the socket is already scheduled in the ready queue
+        # it's going to be read on the next tick (round robin fairness)
+        if _socket in self._ready_s: return
+
         # tries to retrieve a possible callback registered for the socket
         # and if there's one calls it to be able to "append" extra operations
         # to the execution of the read operation in the socket
@@ -804,15 +834,19 @@ class StreamClient(Client):
             if self._pending(connection): return
 
             # iterates continuously trying to read as much data as possible
-            # when there's a failure to read more data it should raise an
-            # exception that should be handled properly
+            # (limited by the read budget) when there's a failure to read
+            # more data it should raise an exception that should be handled
+            count = 0
             while True:
                 data = connection.recv(CHUNK_SIZE)
                 if data: self.on_data(connection, data)
-                else: connection.close(); break
+                else: connection.close(reason = "peer"); break
                 if not connection.status == OPEN: break
                 if not connection.renable == True: break
                 if not connection.socket == _socket: break
+                count += len(data)
+                if self.read_budget and count >= self.read_budget:
+                    self.ready(_socket); break
         except ssl.SSLError as error:
             error_v = error.args[0] if error.args else None
             error_m = error.reason if hasattr(error, "reason") else None
@@ -883,16 +917,16 @@ class StreamClient(Client):
         if not connection: return
         if not connection.status == OPEN: return
 
-        connection.close()
+        connection.close(reason = "error")
 
     def on_exception(self, exception, connection):
         self.warning(exception)
         self.log_stack()
-        connection.close()
+        connection.close(reason = "exception")
 
     def on_expected(self, exception, connection):
         self.debug(exception)
-        connection.close()
+        connection.close(reason = "expected")
 
     def on_connect(self, connection):
         self.debug(
@@ -1004,7 +1038,7 @@ class StreamClient(Client):
                 self.warning(error)
                 self.log_stack()
                 self.trigger("error", self, connection, error)
-                connection.close()
+                connection.close(reason = "connect")
                 return
         except socket.error as error:
             error_v = error.args[0] if error.args else None
@@ -1012,7 +1046,7 @@ class StreamClient(Client):
                 self.warning(error)
                 self.log_stack()
                 self.trigger("error", self, connection, error)
-                connection.close()
+                connection.close(reason = "connect")
                 return
         except (KeyboardInterrupt, SystemExit):
             raise
@@ -1020,7 +1054,7 @@ class StreamClient(Client):
             self.warning(exception)
             self.log_stack()
             self.trigger("error", self, connection, exception)
-            connection.close()
+            connection.close(reason = "connect")
             raise
 
         # otherwise the connect operation has finished correctly
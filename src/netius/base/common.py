@@ -40,7 +40,6 @@ __license__ = "Apache License, Version 2.0"
 import os
 import copy
 import json
-import heapq
 import signal
 import logging
 import hashlib
@@ -51,7 +50,12 @@ import netius.pool
 import netius.adapters
 
 from . import log
+from . import buffer
+from . import metrics
+from . import profiler
+from . import watchdog
 from . import util
+from . import timer
 from . import compat
 from . import asynchronous
 
@@ -202,6 +206,11 @@ UDP_TYPE = 2
 """ The datagram based udp protocol enumeration value to be used
 in static references to this kind of socket usage """
 
+PHASES = ("ticks", "delays", "poll", "reads", "writes", "errors")
+""" The names of the various phases of the event loop that are
+timed under the instrumentation mode, note that the delays phase
+is part of the ticks one (nested phase) """
+
 STATE_STOP = 1
 """ The stop state value, this value is set when the service
 is either in the constructed stage or when the service has been
@@ -275,6 +284,12 @@ KEEPALIVE_COUNT = 3
 """ The amount of times the "ping" packet is re-sent until the
 connection is considered to be offline and is dropped """
 
+READ_BUDGET = 262144
+""" The maximum amount of bytes that are going to be read from
+a connection in a single loop tick, after that the connection
+is placed in the ready queue (round robin) so that the other
+connections are given the chance to be handled, zero disables """
+
 ALLOW_BLOCK = False
 """ The default value for the allow sub-blocking operation, it's
 set as not allowed because this is considered to be a dangerous
@@ -328,6 +343,7 @@ class AbstractBase(observer.Observable):
         self.diag = kwargs.get("diag", False)
         self.middleware = kwargs.get("middleware", [])
         self.children = kwargs.get("children", 0)
+        self.affinity = kwargs.get("affinity", False)
         self.tid = None
         self.tname = None
         self.logger = None
@@ -339,10 +355,20 @@ class AbstractBase(observer.Observable):
         self.poll = self.poll_c()
         self.poll_name = self.poll.name()
         self.poll_timeout = kwargs.get("poll_timeout", POLL_TIMEOUT)
+        self.poll_adaptive = kwargs.get("poll_adaptive", True)
+        self.poll_dispatch = kwargs.get("poll_dispatch", False)
         self.keepalive_timeout = kwargs.get("keepalive_timeout", KEEPALIVE_TIMEOUT)
         self.keepalive_interval = kwargs.get("keepalive_interval", KEEPALIVE_INTERVAL)
         self.keepalive_count = kwargs.get("keepalive_count", KEEPALIVE_COUNT)
+        self.read_budget = kwargs.get("read_budget", READ_BUDGET)
+        self.instrument = kwargs.get("instrument", False)
+        self.profile_mode = kwargs.get("profile_mode", "sample")
+        self.profile_rate = kwargs.get("profile_rate", profiler.PROFILE_RATE)
+        self.profile_path = kwargs.get("profile_path", None)
+        self.watchdog = kwargs.get("watchdog", False)
+        self.watchdog_threshold = kwargs.get("watchdog_threshold", watchdog.SLOW_THRESHOLD)
         self.allow_block = kwargs.get("allow_block", ALLOW_BLOCK)
+        self.budget_c = 0
         self.poll_owner = True
         self.diag_app = None
         self.middleware_l = []
@@ -352,7 +378,6 @@ class AbstractBase(observer.Observable):
         self._uuid = uuid.uuid4()
         self._compat = compat.CompatLoop(self)
         self._lid = 0
-        self._did = 0
         self._main = kwargs.get("_main", False)
         self._slave = kwargs.get("_slave", False)
         self._running = False
@@ -360,15 +385,32 @@ class AbstractBase(observer.Observable):
         self._loaded = False
         self._forked = False
         self._child = False
+        self._child_index = None
+        self._child_pipe = None
         self._concrete = False
         self._childs = []
         self._events = {}
         self._notified = []
-        self._delayed = []
-        self._delayed_o = []
+        self._delayed = timer.TimerWheel()
         self._delayed_n = []
         self._delayed_l = threading.RLock()
+        self._delayed_w = False
+        self._lateness = metrics.Histogram()
+        self._phases = dict(
+            (name, metrics.Histogram(metrics.PHASE_BUCKETS)) for name in PHASES
+        )
+        self._events_h = metrics.Histogram(metrics.COUNT_BUCKETS)
+        self._callbacks_h = metrics.Histogram(metrics.COUNT_BUCKETS)
+        self._ready = collections.deque()
+        self._buffers = buffer.BufferPool()
+        self._ready_s = set()
+        self._dirty = collections.deque()
+        self._dirty_s = set()
+        self._profiler = None
+        self._profiled = None
+        self._watchdog = watchdog.Watchdog(self)
         self._extra_handlers = []
+        self._metrics()
         self._expanded = []
         self._ssl_init()
         self.set_state(STATE_STOP)
@@ -547,7 +589,8 @@ class AbstractBase(observer.Observable):
         timeout = None,
         immediately = False,
         verify = False,
-        safe = False
+        safe = False,
+        handle = None
     ):
         # in case the safe flag is set and the thread trying to add
         # delayed elements is not the main the proper (safe) method
@@ -560,6 +603,10 @@ class AbstractBase(observer.Observable):
                 verify = verify
             )
 
+        # in case a handle has been provided (created by a safe delay) and
+        # it has already been canceled there's nothing to be scheduled
+        if handle and not handle.run: return None
+
         # in case the legacy module is no longer defined (probably
         # at exit execution) then returns immediately as it's not
         # possible to proceed with this execution
@@ -567,39 +614,22 @@ class AbstractBase(observer.Observable):
 
         # creates the original target value with a zero value (forced
         # execution in next tick) in case the timeout value is set the
-        # value is incremented to the current time, then created the
-        # callable original tuple with the target (time) and the callable
+        # value is incremented to the current time
         target = -1 if immediately else 0
         if timeout: target = time.time() + timeout
-        callable_o = (target, callable)
-        callable_o = legacy.orderable(callable_o)
-
-        # in case the verify flag is set, must verify if the callable
-        # is already inserted in the list of delayed operations in
-        # case it does returns immediately to avoid duplicated values
-        is_duplicate = verify and callable_o in self._delayed_o
-        if is_duplicate: return
-
-        # creates the list that is going to be used to populate the
-        # options to be used by the calling tuple
-        options = [True]
-
-        # creates the "final" callable tuple with the target time, the
-        # callable and the loop id (lid) then inserts both the delayed
-        # (original) callable tuple and the callable tuple in the lists
-        callable_t = (target, self._did, callable, self._lid, options)
-        callable_t = legacy.orderable(callable_t)
-        heapq.heappush(self._delayed, callable_t)
-        heapq.heappush(self._delayed_o, callable_o)
-
-        # increments the "delay" identifier by one, this identifier is
-        # used to correctly identify a delayed object so that for the
-        # same target value a sorting is performed (fifo like)
-        self._did += 1
-
-        # returns the callable tuple that may be latter used to control
-        # the execution or not of the delayed operation (cancellation)
-        return callable_t
+
+        # schedules the callable in the timer structure, in case the verify
+        # flag is set and the callable is already scheduled for the same
+        # target an invalid value is returned (avoids duplicated values),
+        # otherwise the timer handle is returned, so that it may be latter
+        # used to control the execution or not of the delayed operation
+        return self._delayed.schedule(
+            callable,
+            target,
+            self._lid,
+            verify = verify,
+            timer = handle
+        )
 
     def delay_s(
         self,
@@ -633,24 +663,41 @@ class AbstractBase(observer.Observable):
         :type wakeup: bool
         :param wakeup: If the main event loop should be awaken so that the
         callable is processed as soon as possible.
+        :rtype: Timer
+        :return: The handle that may be used to cancel the execution of the
+        callable, even before it's merged into the event loop structures.
         """
 
-        # creates the next element tuple that is going to be scheduled according
-        # to the definition provided to the method
-        next = (callable, timeout, immediately, verify)
+        # creates the handle that is going to be used to control the delayed
+        # execution and the next element tuple that is going to be scheduled
+        # according to the definition provided to the method
+        handle = timer.Timer(callable = callable)
+        next = (callable, timeout, immediately, verify, handle)
 
         # acquires the lock that controls the access to the delayed for next
         # tick list and then adds the callable to such list, please note that
         # the delayed (next) list is only going to be joined/merged with delay
-        # operations and list on the next tick (through the merge operation)
+        # operations and list on the next tick (through the merge operation),
+        # the wakeup pending flag is also verified and set under the same lock
+        # so that only the first delay after a merge awakes the event loop,
+        # the remaining ones are going to be merged by that same wakeup
         self._delayed_l.acquire()
-        try: self._delayed_n.append(next)
-        finally: self._delayed_l.release()
+        try:
+            self._delayed_n.append(next)
+            pending = self._delayed_w
+            if wakeup: self._delayed_w = True
+        finally:
+            self._delayed_l.release()
 
         # in case the wakeup flag is set this delay operation should have
         # been called from a different thread and the event loop should
-        # awaken as soon as possible to handle the event
-        if wakeup: self.wakeup()
+        # awaken as soon as possible to handle the event, notice that if
+        # there's a wakeup already pending no new notification is sent
+        if wakeup and not pending: self.wakeup()
+
+        # returns the handle to the caller so that it may be used to cancel
+        # the execution of the callable, if that's required
+        return handle
 
     def delay_m(self):
         """
@@ -663,20 +710,70 @@ class AbstractBase(observer.Observable):
         # the case returns immediately as there's nothing to be merged
         if not self._delayed_n: return
 
-        # iterates over the complete set of next elements in the delay next list
+        # swaps the delay next list with an empty one (under the lock) so that
+        # the complete batch of pending elements is drained at once and the
+        # other threads are free to keep adding elements while it's merged,
+        # the wakeup pending flag is unset so that the next delay operation
+        # (from a different thread) awakes the event loop again
+        self._delayed_l.acquire()
+        try:
+            nexts = self._delayed_n
+            self._delayed_n = []
+            self._delayed_w = False
+        finally:
+            self._delayed_l.release()
+
+        # iterates over the complete set of next elements in the drained batch
         # and schedules them as delay for the next tick execution
-        for next in self._delayed_n:
-            callable, timeout, immediately, verify = next
+        for next in nexts:
+            callable, timeout, immediately, verify, handle = next
             self.delay(
                 callable,
                 timeout = timeout,
                 immediately = immediately,
-                verify = verify
+                verify = verify,
+                handle = handle
             )
 
-        # deletes the complete set of elements present in the delay next list, this
-        # is considered to be equivalent to the empty operation
-        del self._delayed_n[:]
+    def ready(self, _socket):
+        """
+        Schedules the provided socket to be read on the next loop tick,
+        this is used when the read budget of a connection has been
+        exhausted while there's still (possibly) data pending in it.
+
+        The sockets in the ready queue are handled in a round robin
+        fashion, before the next poll operation, which is required
+        for edge triggered polling mechanisms (no new event is raised).
+
+        :type _socket: Socket
+        :param _socket: The socket that is going to be scheduled for
+        reading in the next loop tick (ready queue).
+        """
+
+        self.budget_c += 1
+        if _socket in self._ready_s: return
+        self._ready_s.add(_socket)
+        self._ready.append(_socket)
+
+    def dirty(self, connection):
+        """
+        Marks the provided connection as dirty (with data pending to
+        be written) so that its pending data is flushed once at the end
+        of the current tick, this coalesces the multiple send operations
+        of a connection into a single flush (and possibly a single
+        vectored write operation).
+
+        Should only be called from the thread running the event loop
+        as no locking is performed on the dirty structures.
+
+        :type connection: Connection
+        :param connection: The connection that contains pending data
+        that is going to be flushed at the end of the tick.
+        """
+
+        if connection in self._dirty_s: return
+        self._dirty_s.add(connection)
+        self._dirty.append(connection)
 
     def ensure(
         self,
@@ -1138,6 +1235,18 @@ class AbstractBase(observer.Observable):
         # redirected to the proper logic through exceptions
         self.bind_signals()
 
+        # enables the slow callback detection in case it has been
+        # requested, binding the watched handlers to the loop
+        if self.watchdog: self.watchdog_set(True)
+
+        # binds the profiler signal (in case it's available) so that the
+        # profiler may be toggled at runtime without any restart
+        if hasattr(signal, "SIGUSR2"):
+            self.bind_signals(
+                signals = (signal.SIGUSR2,), #@UndefinedVariable
+                handler = self._profile_signal
+            )
+
         # sets the private loading flag ensuring that no extra load operations
         # will be done after this first call to the loading (no duplicates)
         self._loaded = True
@@ -1169,6 +1278,13 @@ class AbstractBase(observer.Observable):
         # runs the unbind operation for the signals so that no side effects
         # occur while the unloading is going to take place
         self.unbind_signals()
+        if hasattr(signal, "SIGUSR2"):
+            self.unbind_signals(signals = (signal.SIGUSR2,)) #@UndefinedVariable
+
+        # unsets the watcher of the observables in case it's the one of
+        # the current loop, avoiding reports into an unloaded loop
+        if observer.Observable.watcher == self._watchdog:
+            observer.Observable.watcher = None
 
         # unloads the middleware infra-structure that has been created for the
         # current service, no longer going to be used
@@ -1482,6 +1598,15 @@ class AbstractBase(observer.Observable):
         self.children = self.get_env("CHILDREN", self.children, cast = int)
         self.logging = self.get_env("LOGGING", self.logging)
         self.poll_name = self.get_env("POLL", self.poll_name)
+        self.read_budget = self.get_env("READ_BUDGET", self.read_budget, cast = int)
+        self.instrument = self.get_env("INSTRUMENT", self.instrument, cast = bool)
+        self.profile_mode = self.get_env("PROFILE_MODE", self.profile_mode)
+        self.profile_rate = self.get_env("PROFILE_RATE", self.profile_rate, cast = int)
+        self.profile_path = self.get_env("PROFILE_PATH", self.profile_path)
+        self.watchdog = self.get_env("WATCHDOG", self.watchdog, cast = bool)
+        self.watchdog_threshold = self.get_env(
+            "WATCHDOG_THRESHOLD", self.watchdog_threshold, cast = float
+        )
 
     def forever(self, env = True):
         if env: self.bind_env()
@@ -1559,6 +1684,11 @@ class AbstractBase(observer.Observable):
         if self.is_paused(): self.finish()
         else: self._running = False
 
+        # wakes up the event loop (in case the stop is being requested
+        # from a different thread) so that the poll operation does not
+        # block the stop operation (possible infinite poll timeout)
+        self.wakeup()
+
         # in case the current process is the parent in a pre-fork
         # environment raises the stop error to wakeup the process
         # from its current infinite loop for stop handling
@@ -1691,9 +1821,14 @@ class AbstractBase(observer.Observable):
         # destroys the current information on the delays that are is longer
         # going to be executed as the poll/system is closing, this is required
         # in order to avoid any possible memory leak with clojures/cycles
-        del self._delayed[:]
-        del self._delayed_o[:]
+        self._delayed.clear()
+        self._ready.clear()
+        self._ready_s.clear()
+        self._dirty.clear()
+        self._dirty_s.clear()
+        self._buffers.clear()
         del self._delayed_n[:]
+        self._delayed_w = False
 
         # runs the expand destroy operation so that the complete set of expanded
         # values get their (temporary) files removed (garbage collection)
@@ -1758,6 +1893,13 @@ class AbstractBase(observer.Observable):
         # iterates continuously while the running flag is set, once
         # it becomes unset the loop breaks at the next execution cycle
         while True:
+            # in case the instrumentation mode is enabled the loop is
+            # delegated to the instrumented iteration, that times each
+            # of the phases (avoids overhead in the default mode)
+            if self.instrument:
+                if not self._loop_instrumented(): break
+                continue
+
             # calls the base tick int handler indicating that a new
             # tick loop iteration is going to be started, all the
             # "in between loop" operation should be performed in this
@@ -1773,10 +1915,21 @@ class AbstractBase(observer.Observable):
             # that the base service is selecting the connections
             self.set_state(STATE_POLL)
 
+            # calculates the timeout for the poll operation, note that
+            # the timeout of the poll is driven by the pending timers
+            timeout = self.get_timeout()
+
+            # in case the (flat) dispatch mode is enabled and supported by
+            # the poll, the events are dispatched directly to the handlers
+            # of the sockets and the current iteration is finished
+            if self.poll_dispatch and self.poll.is_dispatch() and not self.watchdog:
+                self.dispatch(timeout = timeout)
+                continue
+
             # runs the main selection operation on the current set
             # of connection for each of the three operations returning
             # the resulting active sets for the callbacks
-            reads, writes, errors = self.poll.poll()
+            reads, writes, errors = self.poll.poll(timeout = timeout)
 
             # calls the various callbacks with the selections lists,
             # these are the main entry points for the logic to be executed
@@ -1787,6 +1940,188 @@ class AbstractBase(observer.Observable):
             self.writes(writes)
             self.errors(errors)
 
+    def metrics(self):
+        """
+        Renders the complete set of metrics of the current event
+        loop in the Prometheus text exposition format.
+
+        As the metrics are kept incrementally this operation is
+        linear on the number of metrics and not on the number
+        of connections currently handled by the loop.
+
+        :rtype: String
+        :return: The Prometheus text representation of the
+        metrics registered for the event loop.
+        """
+
+        return self.registry.render()
+
+    def watchdog_set(self, enabled = True, threshold = None, reset = False):
+        """
+        Enables or disables the slow callback detection (watchdog) for
+        the current event loop, when enabled the delayed calls, the read
+        and write handlers and the event handlers are timed and the ones
+        that exceed the threshold are logged and kept in a top table.
+
+        Note that the timing of the event handlers is process wide, as
+        the observable objects are not bound to a single event loop.
+
+        :type enabled: bool
+        :param enabled: If the slow callback detection should be enabled.
+        :type threshold: float
+        :param threshold: The amount of time (in seconds) above which a
+        callback is considered slow, if not provided the current one is used.
+        :type reset: bool
+        :param reset: If the table of slow callbacks should be reset.
+        """
+
+        # resets the table of offenders (in case it's requested) and then
+        # updates the threshold of the watchdog (if provided) and the flag
+        # that controls if the delayed calls are going to be watched
+        if reset: self._watchdog.reset()
+        if threshold: self.watchdog_threshold = threshold
+        self._watchdog.threshold = self.watchdog_threshold
+        self.watchdog = enabled
+
+        # in case the watchdog is disabled removes the watched handlers
+        # (instance level) restoring the class ones and unsets the watcher
+        # of the observables in case it's the one of the current loop
+        if not enabled:
+            self.__dict__.pop("on_read", None)
+            self.__dict__.pop("on_write", None)
+            if observer.Observable.watcher == self._watchdog:
+                observer.Observable.watcher = None
+            return
+
+        # binds the watched version of the read and write handlers at the
+        # instance level (no overhead when disabled), note that the flat
+        # dispatch mode is not used while the watchdog is enabled as the
+        # poll keeps references to the (unwatched) handlers
+        if not "on_read" in self.__dict__:
+            on_read, on_write = self.on_read, self.on_write
+            self.on_read = lambda _socket: self._watchdog.call(on_read, _socket)
+            self.on_write = lambda _socket: self._watchdog.call(on_write, _socket)
+        observer.Observable.watcher = self._watchdog
+
+    def watchdog_dict(self):
+        info = self._watchdog.info_dict()
+        info["enabled"] = self.watchdog
+        return info
+
+    def profile_start(self, mode = None, duration = None):
+        """
+        Starts the profiler for the current event loop, either the
+        sampling one (that samples the stack of the loop thread) or
+        the deterministic one (cProfile wrapped around the loop).
+
+        In case this method is called from a thread other than the
+        loop one the start operation is scheduled for the next tick.
+
+        :type mode: String
+        :param mode: The profiling mode to be used (sample or cprofile),
+        in case it's not provided the default one is used.
+        :type duration: float
+        :param duration: The number of seconds after which the profiler
+        is going to be stopped and its output written to disk, if not
+        provided the profiler runs until explicitly stopped.
+        """
+
+        # in case the current thread is not the loop one schedules the
+        # start for the next tick, required for the cProfile mode as
+        # it only profiles the thread that enables it
+        if not self.is_main():
+            self.delay_s(lambda: self.profile_start(mode = mode, duration = duration))
+            return
+
+        # in case there's a profiler already running there's nothing
+        # to be done, returns immediately (no duplicates)
+        if self._profiler: return
+
+        # builds the profiler for the requested mode targeting the loop
+        # thread and starts it, scheduling the stop in case a duration
+        # has been provided (only for the same profiler instance)
+        mode = mode or self.profile_mode
+        ident = self.tid or threading.current_thread().ident
+        self._profiler = profiler.build(mode, ident, rate = self.profile_rate)
+        self._profiler.start()
+        self.info("Started '%s' profiler ..." % mode)
+        if not duration: return
+        _profiler = self._profiler
+        def stop():
+            if not self._profiler == _profiler: return
+            self.profile_stop()
+        self.delay(stop, timeout = duration)
+
+    def profile_stop(self):
+        """
+        Stops the currently running profiler and writes its output
+        (collapsed stacks or pstats) to a file under the profile path
+        (defaulting to the temporary directory).
+
+        :rtype: String
+        :return: The path to the file where the output of the profiler
+        has been written, or an invalid value if there was no profiler
+        running or if the operation has been scheduled.
+        """
+
+        if not self.is_main():
+            self.delay_s(self.profile_stop)
+            return None
+
+        if not self._profiler: return None
+        _profiler = self._profiler
+        self._profiler = None
+        _profiler.stop()
+        path = self._profile_file(_profiler)
+        _profiler.dump(path)
+        self._profiled = path
+        self.info("Stopped profiler, output written to '%s'" % path)
+        return path
+
+    def profile_toggle(self):
+        if self._profiler: self.profile_stop()
+        else: self.profile_start()
+
+    def profile_dict(self):
+        info = dict(
+            mode = self.profile_mode,
+            rate = self.profile_rate,
+            running = True if self._profiler else False,
+            last = self._profiled
+        )
+        if self._profiler: info["profiler"] = self._profiler.info_dict()
+        return info
+
+    def loop_dict(self):
+        """
+        Retrieves the map containing the instrumentation values of the
+        event loop, including the duration of each of the phases, the
+        lag of the timers (scheduled versus actual execution), the
+        number of events per poll and the number of callbacks per tick.
+
+        Note that only the lag is recorded when the instrumentation
+        mode is not enabled (the remaining histograms are empty).
+
+        :rtype: Dictionary
+        :return: The map with the histograms of the event loop.
+        """
+
+        return dict(
+            instrument = self.instrument,
+            phases = dict(
+                (name, histogram.info_dict()) for name, histogram in self._phases.items()
+            ),
+            lag = self._lateness.info_dict(),
+            events = self._events_h.info_dict(),
+            callbacks = self._callbacks_h.info_dict()
+        )
+
+    def loop_reset(self):
+        for histogram in self._phases.values(): histogram.reset()
+        self._lateness.reset()
+        self._events_h.reset()
+        self._callbacks_h.reset()
+
     def block(self):
         """
         Runs the sub-blocking operation, by "forking" the current loop
@@ -1864,6 +2199,7 @@ class AbstractBase(observer.Observable):
         for _index in range(self.children):
             pid = os.fork() #@UndefinedVariable
             self._child = pid == 0
+            if self._child: self._child_index = _index
             if self._child: self.on_child(pipe = pipe_send)
             if self._child: break
             self._childs.append(pid)
@@ -2023,10 +2359,18 @@ class AbstractBase(observer.Observable):
         # in a modulus way so that no overflow occurs
         self._lid = (self._lid + 1) % 2147483647
 
+        # services the connections that have exhausted their read budget
+        # on the previous tick and still have pending data to be read
+        self._readies()
+
         # runs the processing of the delayed calls so that the pending
         # calls are called if the correct time has been reached
         self._delays()
 
+        # flushes the pending data of the connections that have been
+        # written to during the previous reads and the current delays
+        self._flushes()
+
     def reads(self, reads, state = True):
         # in case the update state is requested updates the current loop
         # instance into the read state (debugging purposes)
@@ -2069,6 +2413,39 @@ class AbstractBase(observer.Observable):
         # error method handler to properly handle each event
         for error in errors: self.on_error(error)
 
+    def dispatch(self, timeout = None):
+        """
+        Runs the (flat) dispatch operation in the poll, meaning that each
+        of the events is going to be handled by the pre-bound handler of
+        the socket as soon as it's retrieved from the poll.
+
+        :type timeout: float
+        :param timeout: The timeout (in seconds) for the poll operation.
+        :rtype: int
+        :return: The number of events dispatched by the poll.
+        """
+
+        return self.poll.dispatch(timeout = timeout)
+
+    def dispatcher(self, socket):
+        """
+        Builds the handler tuple for the provided socket, to be used by
+        the poll in the (flat) dispatch mode, the handler contains the
+        socket and the read, write and error callables for it.
+
+        This method should be overridden by concrete implementations
+        that handle some of their sockets in a different way.
+
+        :type socket: Socket
+        :param socket: The socket for which the handler is going to
+        be built (should be registered in the poll).
+        :rtype: Tuple
+        :return: The tuple containing the socket and the bound read,
+        write and error handlers for it.
+        """
+
+        return (socket, self.on_read, self.on_write, self.on_error)
+
     def datagram(
         self,
         family = socket.AF_INET,
@@ -2457,7 +2834,7 @@ class AbstractBase(observer.Observable):
 
         # triggers the event notifying any listener about the new connection
         # that is now ready for operation to be performed in it
-        self.trigger("connection_c", self, connection)
+        self.fire("connection_c", self, connection)
 
     def on_connection_d(self, connection):
         # prints some debug information about the connection
@@ -2473,7 +2850,7 @@ class AbstractBase(observer.Observable):
 
         # triggers the event notifying any listener about the
         # deletion/destruction f the connection
-        self.trigger("connection_d", self, connection)
+        self.fire("connection_d", self, connection)
 
     def on_stream_c(self, stream):
         # retrieves the reference to the connection that is associated
@@ -2514,6 +2891,14 @@ class AbstractBase(observer.Observable):
         self.trigger("join", self)
 
     def on_child(self, pipe = None):
+        # stores the reference to the pipe (sender) so that it may be
+        # used latter to send commands from the child to the parent
+        self._child_pipe = pipe
+
+        # in case the affinity flag is set the child process is pinned
+        # to one of the available CPUs, according to its index
+        if self.affinity: self._affinity()
+
         # triggers the child event indicating that a new child has been
         # created and than any callback operation may now be performed
         self.trigger("child", self, pipe = pipe)
@@ -2550,6 +2935,11 @@ class AbstractBase(observer.Observable):
         self.trigger("resume", self)
 
     def on_read(self, _socket):
+        # in case the socket is already scheduled in the ready queue
+        # it's going to be read on the next tick, in order to keep the
+        # round robin fairness no read should be performed now
+        if _socket in self._ready_s: return
+
         # tries to retrieve a possible callback registered for the socket
         # and if there's one calls it to be able to "append" extra operations
         # to the execution of the read operation in the socket
@@ -2580,15 +2970,19 @@ class AbstractBase(observer.Observable):
             if self._pending(connection): return
 
             # iterates continuously trying to read as much data as possible
-            # when there's a failure to read more data it should raise an
-            # exception that should be handled properly
+            # (limited by the read budget) when there's a failure to read
+            # more data it should raise an exception that should be handled
+            count = 0
             while True:
                 data = connection.recv(CHUNK_SIZE)
                 if data: self.on_data_base(connection, data)
-                else: connection.close(); break
+                else: connection.close(reason = "peer"); break
                 if not connection.status == OPEN: break
                 if not connection.renable == True: break
                 if not connection.socket == _socket: break
+                count += len(data)
+                if self.read_budget and count >= self.read_budget:
+                    self.ready(_socket); break
         except ssl.SSLError as error:
             error_v = error.args[0] if error.args else None
             error_m = error.reason if hasattr(error, "reason") else None
@@ -2659,16 +3053,16 @@ class AbstractBase(observer.Observable):
         if not connection: return
         if not connection.status == OPEN: return
 
-        connection.close()
+        connection.close(reason = "error")
 
     def on_exception(self, exception, connection):
         self.warning(exception)
         self.log_stack()
-        connection.close()
+        connection.close(reason = "exception")
 
     def on_expected(self, exception, connection):
         self.debug(exception)
-        connection.close()
+        connection.close(reason = "expected")
 
     def on_connect(self, connection):
         connection.set_connected()
@@ -2723,8 +3117,17 @@ class AbstractBase(observer.Observable):
         )
         if full: info.update(
             name = self.name,
+            timers = len(self._delayed),
+            ready = len(self._ready),
+            dirty = len(self._dirty),
+            budget_c = self.budget_c,
+            buffers = self._buffers.info_dict(),
+            lateness = self._lateness.info_dict(),
             _lid = self._lid
         )
+        if full and self.instrument: info["loop"] = self.loop_dict()
+        if full and self._profiler: info["profile"] = self.profile_dict()
+        if full and self.watchdog: info["watchdog"] = self.watchdog_dict()
         return info
 
     def info_string(self, full = False, safe = True):
@@ -3014,6 +3417,28 @@ class AbstractBase(observer.Observable):
     def get_state(self):
         return self._state
 
+    def get_timeout(self):
+        """
+        Retrieves the timeout (in seconds) that should be used for the
+        next poll operation of the event loop.
+
+        In case the adaptive mode is enabled the timeout is calculated
+        from the nearest pending timer deadline, meaning that it's zero
+        if there's work ready to be executed and infinite (negative) in
+        case there's nothing pending at all.
+
+        :rtype: float
+        :return: The timeout to be used in the next poll operation, a
+        negative value means that the poll should block indefinitely.
+        """
+
+        if self._ready or self._dirty: return 0.0
+        if not self.poll_adaptive: return self.poll_timeout
+        if self._notified or self._delayed_n: return 0.0
+        timeout = self._delayed.timeout(time.time())
+        if timeout == None: return -1
+        return timeout
+
     def set_state(self, state):
         self._state = state
 
@@ -3287,68 +3712,34 @@ class AbstractBase(observer.Observable):
         if not self._delayed and not self._notified: return
 
         # retrieves the value for the current timestamp, to be used in
-        # comparisons against the target timestamps of the callables
+        # comparisons against the target timestamps of the callables and
+        # collects the timed callables that have reached their target
         current = time.time()
+        self._delayed.harvest(current)
 
-        # creates the lists that will hold all the values that are not
-        # yet ready to be called in this iteration, the value in this
-        # list will be added back to the heap at the end of the iteration
-        pendings = []
-        pendings_o = []
-
-        # iterates over all the delayed callable tuples to try to find
-        # (and call) the ones that are meant to be executed in the past
-        # (have a target timestamp with a value less than the current)
-        while self._delayed or self._notified:
+        # iterates over all the ready timers (immediate, next tick and
+        # expired ones) to call their callables, note that the next tick
+        # timers created under the current loop identifier are left for
+        # the next iteration cycle, this verification avoids loops in calls
+        count = 0
+        while True:
 
             # runs the notifies verification cycle and if there's at
             # least one processed event continues the loop meaning that
             # the if test evaluations must be re-processed
             if self._notifies(): continue
 
-            # "pops" the current item from the delayed list to be used
-            # in the execution of the current iteration cycle
-            callable_t = heapq.heappop(self._delayed)
-            callable_o = heapq.heappop(self._delayed_o)
-
-            # unpacks the current callable tuple in iteration into a
-            # target (timestamp value) and a method to be called in
-            # case the target timestamp is valid (in the past)
-            target, _did, method, lid, options = callable_t
-
-            # defines the proper target value that is going to be used
-            # for the comparison against the current time reference
-            # this is performed by defaulting the value against negative
-            # ensuring immediate execution of the associated callable
-            if target == None: target = -1
-
-            # tests if the current target is valid (less than or
-            # equals to the current time value) and in case it's
-            # not restores the value to the heap and breaks the loop
-            is_valid = target <= current
-            if not is_valid:
-                pendings.append(callable_t)
-                pendings_o.append(callable_o)
-                break
-
-            # in case the loop id present in the delayed call tuple is
-            # the same as the current iteration identifier then the
-            # call must be done in the next iteration cycle, this
-            # verification avoids loops in calls, note that this verification
-            # is only required for target zero calls referring the delayed
-            # calls to be executed immediately (on next loop)
-            if target == 0 and self._lid == lid:
-                pendings.append(callable_t)
-                pendings_o.append(callable_o)
-                continue
-
-            # unpacks the multiple options so that it's possible to determine
-            # the way the delayed operation is going to be executed
-            run, = options
+            # retrieves the next timer that is ready to be executed and
+            # in case there's none breaks the loop, as there's nothing
+            # more to be processed in the current tick
+            _timer = self._delayed.pop(self._lid)
+            if not _timer: break
 
-            # in case the method is not meant to be run, probably canceled
-            # the execution of it should be properly ignored
-            if not run: continue
+            # in case the timer is a timed one records the time that it
+            # took (since its target) for it to be executed (lateness), note
+            # that the time is taken now as previous callbacks may be slow
+            if _timer.target > 0: self._lateness.observe(time.time() - _timer.target)
+            count += 1
 
             # calls the callback method as the delayed operation is
             # now meant to be run, this is an operation that may change
@@ -3356,23 +3747,110 @@ class AbstractBase(observer.Observable):
             # must be implemented with the proper precautions, note that
             # proper exception is set so that proper top level handling
             # is defined and logging is performed
-            try: method()
+            try:
+                if self.watchdog: self._watchdog.call(_timer.callable)
+                else: _timer.callable()
             except (KeyboardInterrupt, SystemExit, errors.StopError):
                 raise
             except BaseException as exception:
                 self.error(exception)
                 self.log_stack(method = self.warning)
 
-        # iterates over all the pending callable tuple values and adds
-        # them back to the delayed heap list so that they are called
-        # latter on (not ready to be called now)
-        for pending, pending_o in zip(pendings, pendings_o):
-            heapq.heappush(self._delayed, pending)
-            heapq.heappush(self._delayed_o, pending_o)
+        # in case the instrumentation mode is enabled records both the
+        # duration of the delays phase and the number of callbacks called
+        if not self.instrument: return
+        self._phases["delays"].observe(time.time() - current)
+        self._callbacks_h.observe(count)
+
+    def _profile_signal(self, signum = None, frame = None):
+        # schedules the toggling of the profiler for the next tick, using
+        # the safe version of delay as the signal handler may interrupt
+        # any operation over the timer structures of the loop
+        self.delay_s(self.profile_toggle)
+
+    def _profile_file(self, profiler):
+        path = self.profile_path or tempfile.gettempdir()
+        name = "netius-%d-%d.%s" % (os.getpid(), int(time.time()), profiler.extension)
+        return os.path.join(path, name)
+
+    def _metrics(self):
+        # creates the registry of metrics for the event loop and registers
+        # the base set of metrics, keeping a reference to the ones that are
+        # incremented in the hot paths to avoid any lookup on them
+        self.registry = metrics.Registry()
+        self._bytes_in = self.registry.counter(
+            "bytes_in_total", "Number of bytes received by the connections"
+        )
+        self._bytes_out = self.registry.counter(
+            "bytes_out_total", "Number of bytes sent by the connections"
+        )
+        self._closes = self.registry.counter(
+            "closes_total", "Number of connections closed by reason", label = "reason"
+        )
+        self.registry.gauge(
+            "connections", "Number of currently open connections",
+            getter = lambda: len(self.connections)
+        )
+        self.registry.gauge(
+            "timers", "Number of currently scheduled timers",
+            getter = lambda: len(self._delayed)
+        )
+        self.registry.register(self._lateness, name = "loop_lag_seconds")
+        self._lateness.help = "Delay of the timers in relation to their target"
+
+    def _loop_instrumented(self):
+        """
+        Runs a single iteration of the event loop timing each of its
+        phases into the proper histograms, this is the equivalent of
+        the default loop iteration under the instrumentation mode.
+
+        :rtype: bool
+        :return: If the loop should continue running, an invalid value
+        means that the running flag has been unset (stop requested).
+        """
 
-        # in case the delayed list is empty resets the delay id so that
-        # it never gets into a very large number, would break performance
-        if not self._delayed: self._did = 0
+        # runs the ticks phase (includes the delays one) recording
+        # the time it took for it to be executed
+        start = time.time()
+        self.ticks()
+        end = time.time()
+        self._phases["ticks"].observe(end - start)
+
+        # in case running flag is disabled it's time to break the
+        # cycle (just before the possible block)
+        if not self._running: return False
+
+        # updates the current state to poll and calculates the timeout
+        # for the poll operation from the pending timers
+        self.set_state(STATE_POLL)
+        timeout = self.get_timeout()
+
+        # in case the (flat) dispatch mode is enabled the poll and the
+        # handling of the events are a single phase (recorded as poll)
+        if self.poll_dispatch and self.poll.is_dispatch() and not self.watchdog:
+            count = self.dispatch(timeout = timeout)
+            self._phases["poll"].observe(time.time() - end)
+            self._events_h.observe(count)
+            return True
+
+        # runs the main selection operation recording its duration and
+        # the number of events that have been retrieved from it
+        reads, writes, errors = self.poll.poll(timeout = timeout)
+        start = time.time()
+        self._phases["poll"].observe(start - end)
+        self._events_h.observe(len(reads) + len(writes) + len(errors))
+
+        # calls the various callbacks with the selections lists, timing
+        # each of them under their own phase histogram
+        self.reads(reads)
+        end = time.time()
+        self._phases["reads"].observe(end - start)
+        self.writes(writes)
+        start = time.time()
+        self._phases["writes"].observe(start - end)
+        self.errors(errors)
+        self._phases["errors"].observe(time.time() - start)
+        return True
 
     def _generate(self, hashed = True):
         """
@@ -3421,7 +3899,7 @@ class AbstractBase(observer.Observable):
                 self.warning(error)
                 self.log_stack()
                 self.trigger("error", self, connection, error)
-                connection.close()
+                connection.close(reason = "connect")
                 return
         except socket.error as error:
             error_v = error.args[0] if error.args else None
@@ -3429,7 +3907,7 @@ class AbstractBase(observer.Observable):
                 self.warning(error)
                 self.log_stack()
                 self.trigger("error", self, connection, error)
-                connection.close()
+                connection.close(reason = "connect")
                 return
         except (KeyboardInterrupt, SystemExit):
             raise
@@ -3437,7 +3915,7 @@ class AbstractBase(observer.Observable):
             self.warning(exception)
             self.log_stack()
             self.trigger("error", self, connection, exception)
-            connection.close()
+            connection.close(reason = "connect")
             raise
 
         # otherwise the connect operation has finished correctly
@@ -3975,6 +4453,54 @@ class AbstractBase(observer.Observable):
         delta_s += "%ds" % seconds
         return delta_s.strip()
 
+    def _affinity(self):
+        """
+        Pins the current (child) process to one of the CPUs available
+        for the process, selected in a round robin fashion using the
+        index of the child, this avoids the scheduler moving the
+        process between CPUs (cache locality).
+
+        In case the operative system does not support the setting of
+        the affinity the operation is ignored.
+        """
+
+        if not hasattr(os, "sched_setaffinity"): return
+        if self._child_index == None: return
+        cpus = sorted(os.sched_getaffinity(0)) #@UndefinedVariable
+        if not cpus: return
+        cpu = cpus[self._child_index % len(cpus)]
+        os.sched_setaffinity(0, (cpu,)) #@UndefinedVariable
+        self.debug("Pinned child process '%d' to CPU %d" % (os.getpid(), cpu))
+
+    def _readies(self):
+        """
+        Runs the read operation for the sockets that are currently
+        in the ready queue (exhausted their read budget), note that
+        only the sockets present at the start of the operation are
+        handled, the ones re-scheduled are left for the next tick.
+        """
+
+        if not self._ready: return
+        for _index in range(len(self._ready)):
+            _socket = self._ready.popleft()
+            self._ready_s.discard(_socket)
+            self.on_read(_socket)
+
+    def _flushes(self):
+        """
+        Flushes the pending data of the connections marked as dirty
+        using a single write operation per connection, note that the
+        connections marked as dirty during the flush (eg: by the send
+        callbacks) are left for the next tick.
+        """
+
+        if not self._dirty: return
+        sockets = [connection.socket for connection in self._dirty if\
+            connection.is_open() and connection.wready]
+        self._dirty.clear()
+        self._dirty_s.clear()
+        self.writes(sockets, state = False)
+
     def _wait_forever(self, sleep = 60):
         """
         Runs a simple event loop that sleeps for a certain amount
@@ -4023,6 +4549,8 @@ class DiagBase(AbstractBase):
         self.reads_c = 0
         self.writes_c = 0
         self.errors_c = 0
+        self.dispatch_c = 0
+        self.events_c = 0
 
     def reads(self, *args, **kwargs):
         AbstractBase.reads(self, *args, **kwargs)
@@ -4036,12 +4564,26 @@ class DiagBase(AbstractBase):
         AbstractBase.errors(self, *args, **kwargs)
         self.errors_c += 1
 
+    def dispatch(self, *args, **kwargs):
+        # the dispatch operation replaces the (batch) reads, writes
+        # and errors operations of the loop iteration so their counters
+        # are also incremented, keeping them coherent in both modes
+        result = AbstractBase.dispatch(self, *args, **kwargs)
+        self.reads_c += 1
+        self.writes_c += 1
+        self.errors_c += 1
+        self.dispatch_c += 1
+        self.events_c += result
+        return result
+
     def info_dict(self, full = False):
         info = AbstractBase.info_dict(self, full = full)
         info.update(
             reads_c = self.reads_c,
             writes_c = self.writes_c,
-            errors_c = self.errors_c
+            errors_c = self.errors_c,
+            dispatch_c = self.dispatch_c,
+            events_c = self.events_c
         )
         return info
 
@@ -37,6 +37,7 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import ssl
 import time
 import uuid
@@ -67,6 +68,52 @@ CHUNK_SIZE = 16384
 """ The size of the chunk to be used while received
 data from the service socket """
 
+IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") and\
+    "SC_IOV_MAX" in os.sysconf_names else 1024
+""" The maximum number of buffers that may be provided to
+a single vectored (gathering) write operation, as defined
+by the operative system (defaults to the common value) """
+
+SENDMSG = hasattr(socket.socket, "sendmsg")
+""" If the vectored (gathering) write operation is available
+for the current platform, this is not the case for some of
+the operative systems (eg: Windows) and Python 2 """
+
+SENDFILE = hasattr(os, "sendfile")
+""" If the zero copy file send operation is available for the
+current platform, meaning that the contents of a file may be
+sent to a socket without passing through user space """
+
+FILE_CHUNK_SIZE = 65536
+""" The size of the chunk to be used while reading the contents
+of a file to be sent, in case the zero copy strategy is not
+possible for the connection (eg: SSL or encoded connections) """
+
+class FileChunk(object):
+    """
+    Range of bytes of a file pending to be sent through a
+    connection using the zero copy (sendfile) strategy, the
+    offset and the count are updated as partial sends occur.
+    """
+
+    def __init__(self, file, offset, count):
+        self.file = file
+        self.fileno = file.fileno()
+        self.offset = offset
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def send(self, socket):
+        count = os.sendfile(socket.fileno(), self.fileno, self.offset, self.count)
+        if count == 0: raise IOError("Unexpected end of file")
+        return count
+
+    def advance(self, count):
+        self.offset += count
+        self.count -= count
+
 class BaseConnection(observer.Observable):
     """
     Abstract connection object that should encapsulate
@@ -79,6 +126,40 @@ class BaseConnection(observer.Observable):
     appropriate operations.
     """
 
+    __slots__ = (
+        "id",
+        "owner",
+        "socket",
+        "address",
+        "datagram",
+        "ssl",
+        "renable",
+        "wready",
+        "status",
+        "connecting",
+        "upgrading",
+        "views",
+        "max_pending",
+        "min_pending",
+        "pending_s",
+        "restored_s",
+        "starters",
+        "pending",
+        "restored",
+        "pending_lock",
+        "restored_lock",
+        "ssl_host",
+        "ssl_fingerprint",
+        "ssl_dump",
+        "ssl_handshake",
+        "ssl_connecting",
+        "_starter",
+        "_buffer"
+    )
+    """ The explicit set of attributes of the connection, avoids
+    the creation of a dictionary per connection, relevant when
+    handling a large number of (idle) connections """
+
     def __init__(
         self,
         owner = None,
@@ -108,6 +189,7 @@ class BaseConnection(observer.Observable):
         self.min_pending = min_pending
         self.renable = True
         self.wready = False
+        self.views = False
         self.pending_s = 0
         self.restored_s = 0
         self.starters = collections.deque()
@@ -116,6 +198,7 @@ class BaseConnection(observer.Observable):
         self.pending_lock = threading.RLock()
         self.restored_lock = threading.RLock()
         self._starter = None
+        self._buffer = None
 
     def destroy(self):
         observer.Observable.destroy(self)
@@ -165,7 +248,7 @@ class BaseConnection(observer.Observable):
         # the current netius specification and strategy
         self.trigger("open", self)
 
-    def close(self, flush = False, destroy = True):
+    def close(self, flush = False, destroy = True, reason = None):
         # in case the current status of the connection is closes it does
         # nor make sense to proceed with the closing as the connection
         # is already in the closed state (nothing to be done)
@@ -178,6 +261,10 @@ class BaseConnection(observer.Observable):
         if flush and self.status == OPEN and not self.connecting:
             return self.close_flush()
 
+        # increments the counter of closed connections for the reason
+        # of the closing, defaulting to a local (explicit) closing
+        self.owner._closes.inc(key = reason or "local")
+
         # immediately sets the status of the connection as closed
         # so that no one else changed the current connection status
         # this is relevant to avoid any erroneous situation
@@ -208,6 +295,10 @@ class BaseConnection(observer.Observable):
         self.restored_s = 0
         self.restored.clear()
 
+        # returns the receive buffer (in case there's one) to the
+        # pool of the owner so that it may be re-used by others
+        self._release()
+
         # retrieves the reference to the owner object from the
         # current instance to be used to removed the socket from the
         # proper pooling mechanisms (at least for reading)
@@ -320,8 +411,8 @@ class BaseConnection(observer.Observable):
         self.trigger("upgrade", self)
 
     def set_data(self, data, address = None):
-        if address: self.trigger("data", self, data, address)
-        else: self.trigger("data", self, data)
+        if address: self.fire("data", self, data, address)
+        else: self.fire("data", self, data)
 
     def ensure_write(self, flush = True):
         # retrieves the identifier of the current thread and
@@ -461,48 +552,76 @@ class BaseConnection(observer.Observable):
         # the target address (for datagram) and the callback
         data = (data, address, callback)
 
-        # retrieves the identifier of the current thread and then
-        # verifies if it's the same as thread where the event loop
-        # is being executed (safe execution) for options to be taken
-        cthread = threading.current_thread()
-        tid = cthread.ident or 0
-        is_safe = tid == self.owner.tid
-
-        # runs the pend operation that adds the current data to the
-        # structures that control the data pending in output to be
-        # sent in the proper (flush) write operation
-        self.pend(data)
-
-        # verifies if the write ready flag is set, for that case the
-        # write flushing operation must be performed, so that all pending
-        # bytes to be sent in the connection may be flushed as fast as
-        # possible (avoiding extra loops in polling)
-        if self.wready:
-            # checks if the safe flag is set and if it is runs
-            # the send operation right way otherwise "waits" until
-            # the next tick operation (delayed execution), note that
-            # running the flush operation immediately may lead to
-            # typical stack overflow errors (due to recursion limit)
-            if is_safe and not delay: self._flush_write()
-            else: self.owner.delay(
-                self._flush_write,
-                immediately = True,
-                verify = True,
-                safe = True
-            )
-
-        # otherwise the write stream is not ready and so the
-        # connection must be ensured to be write ready, should
-        # subscribe to the write events as soon as possible
-        else: self.ensure_write()
+        # adds the data to the pending structures and runs the
+        # flush or the subscription of the write operations
+        self._send_pend(data, delay = delay)
 
         # returns the final number of bytes (length of data)
         # that has been submitted to be sent (as soon as possible)
         return data_l
 
+    def send_file(self, file, offset = 0, count = None, delay = True, callback = None):
+        """
+        Sends the contents of the provided file (a range of it) through
+        the connection, using the zero copy (sendfile) strategy when
+        that's possible, meaning that the contents are never copied into
+        user space (no reads or writes from the event loop).
+
+        In case the zero copy strategy is not possible (eg: SSL or
+        datagram connections) the file is read in chunks that are
+        sent one after the other (the next read happens on send).
+
+        :type file: File
+        :param file: The file object (with a valid file descriptor)
+        from which the contents are going to be sent.
+        :type offset: int
+        :param offset: The offset in the file where the sending of
+        the contents is going to start.
+        :type count: int
+        :param count: The number of bytes of the file to be sent, if
+        not provided the file is sent until its end.
+        :type delay: bool
+        :param delay: If the send operation should be delayed until
+        the next tick operation or if it should be performed as
+        soon as possible (as defined in specification).
+        :type callback: Function
+        :param callback: Function to be called when the complete range
+        of the file has been sent to the socket.
+        :rtype: int
+        :return: The number of bytes of the file scheduled to be sent.
+        """
+
+        # in case no count is provided the complete file (starting
+        # at the provided offset) is going to be sent
+        if count == None: count = os.fstat(file.fileno()).st_size - offset
+
+        # verifies that the connection is currently in the open
+        # state and then verifies if that's not the case returns
+        # immediately, not possible to send data
+        if not self.status == OPEN: return 0
+
+        # in case there's nothing to be sent or the zero copy strategy
+        # is not possible for the connection uses the buffered strategy
+        if not count or not self.is_sendfile():
+            return self._send_file_buffered(
+                file,
+                offset,
+                count,
+                lambda data, callback: self.send(data, delay = delay, callback = callback),
+                callback = callback
+            )
+
+        # adds the file chunk to the pending structures, so that it's
+        # sent (with sendfile) once the previous data has been sent
+        data = (FileChunk(file, offset, count), None, callback)
+        self._send_pend(data, delay = delay)
+        return count
+
     def recv(self, size = CHUNK_SIZE, force = False):
         if not self.status == OPEN and not force: return b""
-        return self._recv(size = size)
+        data = self._recv(size = size)
+        if data and not self.datagram: self.owner._bytes_in.inc(len(data))
+        return data
 
     def pend(self, data, back = True):
         # verifies if the provided data is a tuple and if that's
@@ -535,7 +654,7 @@ class BaseConnection(observer.Observable):
         # sends the pend event indicating that a new set of data has been
         # set as pending in the internal buffers of the connection and
         # some of the flow controlling operation may have to be performed
-        self.trigger("pend", self)
+        self.fire("pend", self)
 
     def restore(self, data, back = True):
         """
@@ -696,6 +815,48 @@ class BaseConnection(observer.Observable):
     def is_pending_data(self):
         return self.restored_s > 0
 
+    def is_sendfile(self):
+        return SENDFILE and not self.ssl and not self.datagram
+
+    def _send_pend(self, data, delay = True):
+        # retrieves the identifier of the current thread and then
+        # verifies if it's the same as thread where the event loop
+        # is being executed (safe execution) for options to be taken
+        cthread = threading.current_thread()
+        tid = cthread.ident or 0
+        is_safe = tid == self.owner.tid
+
+        # runs the pend operation that adds the current data to the
+        # structures that control the data pending in output to be
+        # sent in the proper (flush) write operation
+        self.pend(data)
+
+        # verifies if the write ready flag is set, for that case the
+        # write flushing operation must be performed, so that all pending
+        # bytes to be sent in the connection may be flushed as fast as
+        # possible (avoiding extra loops in polling)
+        if self.wready:
+            # checks if the safe flag is set and if it is runs
+            # the send operation right way otherwise marks the connection
+            # as dirty so that the pending data is flushed (once) at the
+            # end of the current tick, note that running the flush operation
+            # immediately may lead to typical stack overflow errors (due to
+            # recursion limit), for the unsafe (other thread) situation the
+            # flush is delayed until the next tick (thread safe operation)
+            if is_safe and not delay: self._flush_write()
+            elif is_safe: self.owner.dirty(self)
+            else: self.owner.delay(
+                self._flush_write,
+                immediately = True,
+                verify = True,
+                safe = True
+            )
+
+        # otherwise the write stream is not ready and so the
+        # connection must be ensured to be write ready, should
+        # subscribe to the write events as soon as possible
+        else: self.ensure_write()
+
     def _send(self):
         # sets the write ready flag so that any further request to
         # write operation will be immediately performed
@@ -720,6 +881,12 @@ class BaseConnection(observer.Observable):
                 # nothing pending to be done for such case
                 if not self.pending: break
 
+                # in case there's more than one chunk of data pending
+                # tries to send them using a single (vectored) write
+                # operation, falling back to the chunk by chunk strategy
+                # in case that's not possible (eg: SSL or close chunk)
+                if len(self.pending) > 1 and self._send_vector(): continue
+
                 # retrieves the current data chunk to be send from the
                 # list of pending things and then saves the data chunk
                 # in an "original" object an tries to unpack it in case
@@ -728,6 +895,7 @@ class BaseConnection(observer.Observable):
                 data_o = data
                 data, address, callback = data
                 is_close = data == None
+                is_file = type(data) == FileChunk
                 data_l = 0 if is_close else len(data)
 
                 try:
@@ -739,6 +907,7 @@ class BaseConnection(observer.Observable):
                     # data is provided the shutdown operation is performed
                     # instead to close the stream between both sockets
                     if is_close: self._shutdown(); count = 0
+                    elif is_file: count = data.send(self.socket)
                     elif address: count = self.socket.sendto(data, address)
                     elif data: count = self.socket.send(data)
                     else: count = 0
@@ -775,20 +944,25 @@ class BaseConnection(observer.Observable):
                 else:
                     # decrements the size of the pending buffer by the number
                     # of bytes that were correctly send through the buffer
+                    # and increments the global counter of sent bytes
                     self.pending_s -= count
+                    self.owner._bytes_out.inc(count)
 
                     # verifies if the data has been correctly (and completely)
                     # sent through the socket and if that's not the case re-pushes
                     # the pending data back to the pending stack
                     is_valid = count == data_l
-                    if not is_valid:
-                        data_o = (data[count:], address, callback)
+                    if not is_valid and is_file:
+                        data.advance(count)
+                        self.pending.append(data_o)
+                    elif not is_valid:
+                        data_o = (memoryview(data)[count:], address, callback)
                         self.pending.append(data_o)
 
                     # triggers the unpend event as some of the data has been
                     # removed from the pending buffer and so any listener must
                     # be notified so that flow operations may be performed
-                    self.trigger("unpend", self)
+                    self.fire("unpend", self)
 
                     # in case the is valid flag is set (all of the data for
                     # the current write operation has been sent) calls the
@@ -803,12 +977,132 @@ class BaseConnection(observer.Observable):
         # that are monitored for any write event (no longer required)
         self.remove_write()
 
+    def _send_vector(self):
+        """
+        Sends the multiple chunks of data pending in the connection
+        using a single (vectored) write operation, avoiding one system
+        call per chunk, partial writes are tracked using memoryview
+        slices so that no copy of the remaining data is performed.
+
+        The callbacks associated with each of the chunks are called
+        once the chunk has been completely sent (as in the normal
+        strategy), note that this method should be called with the
+        pending lock acquired.
+
+        :rtype: bool
+        :return: If the vectored write operation has been performed,
+        in case it's not possible (eg: SSL, datagram or close chunk)
+        an invalid value is returned and nothing is sent.
+        """
+
+        # verifies if the vectored write operation is possible for
+        # the current connection, as it's not possible to perform it
+        # under SSL (no gathering support) or for datagram connections
+        if not SENDMSG or self.ssl or self.datagram: return False
+
+        # gathers the sequence of chunks of data from the pending
+        # queue (up to the maximum number of buffers), stopping at the
+        # first chunk that is not "plain" data (eg: close chunk)
+        items = []
+        while self.pending and len(items) < IOV_MAX:
+            data, address, _callback = self.pending[-1]
+            if data == None or address: break
+            if type(data) == FileChunk: break
+            items.append(self.pending.pop())
+
+        # in case not enough chunks have been gathered to justify the
+        # vectored write operation they're restored to the pending queue
+        # and the normal (chunk by chunk) strategy is used instead
+        if len(items) < 2:
+            for item in reversed(items): self.pending.append(item)
+            return False
+
+        try:
+            # sends the complete set of gathered buffers through the socket
+            # using a single write operation, in case no data is sent
+            # the socket is considered to be in a would block situation
+            count = self.socket.sendmsg([item[0] for item in items])
+            if count == 0: raise socket.error(errno.EWOULDBLOCK)
+        except:
+            # sets the write ready flag to false and ensures that a write
+            # event is going to be triggered, then restores the gathered
+            # chunks to the pending queue (in the original order)
+            self.wready = False
+            self.ensure_write()
+            for item in reversed(items): self.pending.append(item)
+            raise
+
+        # decrements the size of the pending buffer by the number
+        # of bytes that were correctly send through the socket
+        # and increments the global counter of sent bytes
+        self.pending_s -= count
+        self.owner._bytes_out.inc(count)
+
+        # iterates over the gathered chunks to determine the ones that
+        # have been completely sent, gathering their callbacks, the
+        # first partially sent (if any) chunk is sliced (no copy)
+        callbacks = []
+        for index in range(len(items)):
+            data, address, callback = items[index]
+            data_l = len(data)
+            if count < data_l: break
+            count -= data_l
+            if callback: callbacks.append(callback)
+        else:
+            index = len(items)
+
+        # restores the chunks that have not been (completely) sent to
+        # the pending queue, keeping the original order of them
+        for item in reversed(items[index + 1:]): self.pending.append(item)
+        if index < len(items) and count == 0: self.pending.append(items[index])
+        elif index < len(items):
+            data, address, callback = items[index]
+            self.pending.append((memoryview(data)[count:], address, callback))
+
+        # triggers the unpend event as some of the data has been removed
+        # from the pending buffer and then calls the callbacks of the
+        # chunks that have been completely sent (in order)
+        self.fire("unpend", self)
+        for callback in callbacks: callback(self)
+        return True
+
     def _recv(self, size):
         data = self._recv_restored(size)
         if data: return data
         if self.datagram: return self.socket.recvfrom(size)
+        elif self.views: return self._recv_into(size)
         else: return self.socket.recv(size)
 
+    def _recv_into(self, size):
+        """
+        Receives data from the socket into a buffer obtained from
+        the pool of the owner and returns a memoryview over the
+        received bytes, avoiding the allocation of a new bytes
+        object per receive operation.
+
+        The returned view is only valid until the next receive
+        operation on the connection, so the handlers of the data
+        must not retain it (copies should be made if required).
+
+        :type size: int
+        :param size: The maximum number of bytes to be received.
+        :rtype: memoryview
+        :return: The view over the received bytes, or an empty
+        bytes value in case the connection has been closed.
+        """
+
+        if self._buffer == None: self._buffer = self.owner._buffers.acquire()
+        size = min(size, len(self._buffer))
+        try: count = self.socket.recv_into(self._buffer, size)
+        except BaseException: self._release(); raise
+        if not count: self._release(); return b""
+        return memoryview(self._buffer)[:count]
+
+    def _release(self):
+        if self._buffer == None: return
+        self.owner._buffers.release(self._buffer)
+        self._buffer = None
+
     def _recv_ssl(self, size):
         data = self._recv_restored(size)
         if data: return data
@@ -867,6 +1161,56 @@ class BaseConnection(observer.Observable):
 
         connection.close()
 
+    def _send_file_buffered(self, file, offset, count, send, callback = None):
+        """
+        Sends the range of the file by reading it in chunks, each of
+        the chunks is read once the previous one has been sent, so that
+        the file is never completely loaded into memory.
+
+        The provided send function is used for the sending of each of
+        the chunks, allowing upper layers to apply their own encoding
+        to the contents (eg: chunked or compressed HTTP messages).
+
+        :type file: File
+        :param file: The file object from which the contents are
+        going to be read (using the provided offset).
+        :type offset: int
+        :param offset: The offset in the file where the reading of
+        the contents is going to start.
+        :type count: int
+        :param count: The number of bytes to be read and sent.
+        :type send: Function
+        :param send: The function to be used to send each chunk, should
+        receive both the data and the callback for the sending.
+        :type callback: Function
+        :param callback: Function to be called when the complete range
+        of the file has been sent.
+        :rtype: int
+        :return: The number of bytes of the file scheduled to be sent.
+        """
+
+        # seeks the file to the requested position and creates the
+        # state structure holding the number of pending bytes (required
+        # as the clojure needs to change it, Python 2 compatibility)
+        file.seek(offset)
+        state = dict(pending = count)
+
+        def send_chunk(connection = None):
+            # reads the next chunk of data from the file (limited by
+            # the pending size) and updates the pending number of bytes
+            size = min(state["pending"], FILE_CHUNK_SIZE)
+            data = file.read(size) if size else b""
+            state["pending"] -= len(data)
+
+            # in case this is the final chunk (no more data pending or
+            # end of file reached) the final callback is used, otherwise
+            # the sending of the next chunk is chained
+            is_final = not data or state["pending"] == 0
+            send(data, callback if is_final else send_chunk)
+
+        send_chunk()
+        return count
+
     def _flush_write(self):
         """
         Flush operations to be called by the delaying controller
@@ -898,6 +1242,12 @@ class DiagConnection(BaseConnection):
         self.sends += 1
         return result
 
+    def send_file(self, file, *args, **kwargs):
+        result = BaseConnection.send_file(self, file, *args, **kwargs)
+        if self.is_sendfile(): self.out_bytes += result
+        self.sends += 1
+        return result
+
     def info_dict(self, full = False):
         info = BaseConnection.info_dict(self, full = full)
         info.update(
@@ -37,6 +37,7 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+from . import agent
 from . import server
 
 from .common import * #@UnusedWildImport
@@ -47,6 +48,7 @@ class Container(Base):
         Base.__init__(self, *args, **kwargs)
         self.owner = None
         self.bases = []
+        self.agents = []
 
     def start(self, owner):
         # sets the current polling structure of the owner in the container
@@ -58,6 +60,7 @@ class Container(Base):
         self.poll = owner.poll
         self.poll_name = owner.poll_name
         self.poll_timeout = owner.poll_timeout
+        self.poll_adaptive = owner.poll_adaptive
         self.level = owner.level
         self.logger = owner.logger
         self._loaded = True
@@ -87,6 +90,11 @@ class Container(Base):
         for base in self.bases: base.cleanup()
         del self.bases[:]
 
+        # runs the same cleanup operation for the agents, which should close
+        # any protocol that is still pending under them (eg: pools)
+        for agent in self.agents: agent.cleanup()
+        del self.agents[:]
+
         # unbinds the start operation from the on start event, as this is no longer
         # required, should re-register for it on "next start" event
         self.unbind("start", self.on_start)
@@ -109,7 +117,8 @@ class Container(Base):
             # runs the "owner" based version of the poll operation
             # so that the poll results are indexed by their owner
             # reference to be easily routed to the base services
-            result = self.poll.poll_owner()
+            timeout = self.get_timeout()
+            result = self.poll.poll_owner(timeout = timeout)
             for base, values in legacy.iteritems(result):
                 reads, writes, errors = values
                 base.reads(reads)
@@ -117,10 +126,22 @@ class Container(Base):
                 base.errors(errors)
 
     def ticks(self):
-        self.set_state(STATE_TICK)
-        self._lid = (self._lid + 1) % 2147483647
+        # runs the tick operations of the container itself, as it may be
+        # used as the global loop (eg: compat protocols) and its pending
+        # work is considered in the timeout of the poll, and then runs the
+        # tick operations for the complete set of bases
+        Base.ticks(self)
         for base in self.bases: base.ticks()
 
+    def get_timeout(self):
+        # gathers the timeouts of the complete set of bases (including the
+        # container itself) and uses the smallest one, note that negative
+        # values represent an infinite timeout (nothing pending)
+        timeouts = [Base.get_timeout(self)]
+        timeouts.extend(base.get_timeout() for base in self.bases)
+        timeouts = [timeout for timeout in timeouts if timeout >= 0]
+        return min(timeouts) if timeouts else -1
+
     def connections_dict(self, full = False):
         all = dict()
         for base in self.bases:
@@ -153,10 +174,16 @@ class Container(Base):
         self.call_all("on_stop")
 
     def add_base(self, base):
+        # in case the base is an agent (protocol based client) it's only
+        # kept for cleanup purposes, as it has no event loop of its own
+        # and its protocols run under the loop of the container's owner
+        if isinstance(base, agent.Agent): self.agents.append(base); return
+
         self.apply_base(base)
         self.bases.append(base)
 
     def remove_base(self, base):
+        if base in self.agents: self.agents.remove(base); return
         self.bases.remove(base)
 
     def start_base(self, base):
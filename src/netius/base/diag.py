@@ -82,6 +82,54 @@ class DiagApp(appier.APIApp):
         info = self.system.info_dict(full = full)
         return self.json(info, sort_keys = True)
 
+    @appier.route("/loop", "GET")
+    def show_loop(self):
+        info = self.system.loop_dict()
+        return self.json(info, sort_keys = True)
+
+    @appier.route("/loop/set", ("GET", "POST"))
+    def set_loop(self):
+        instrument = self.field("instrument", True, cast = bool)
+        reset = self.field("reset", False, cast = bool)
+        self.system.instrument = instrument
+        if reset: self.system.loop_reset()
+        return self.show_loop()
+
+    @appier.route("/watchdog", "GET")
+    def show_watchdog(self):
+        info = self.system.watchdog_dict()
+        return self.json(info, sort_keys = True)
+
+    @appier.route("/watchdog/set", ("GET", "POST"))
+    def set_watchdog(self):
+        enabled = self.field("enabled", True, cast = bool)
+        threshold = self.field("threshold", None, cast = float)
+        reset = self.field("reset", False, cast = bool)
+        self.system.watchdog_set(enabled = enabled, threshold = threshold, reset = reset)
+        return self.show_watchdog()
+
+    @appier.route("/profile", "GET")
+    def show_profile(self):
+        info = self.system.profile_dict()
+        return self.json(info, sort_keys = True)
+
+    @appier.route("/profile/start", ("GET", "POST"))
+    def start_profile(self):
+        mode = self.field("mode", None)
+        duration = self.field("duration", None, cast = float)
+        self.system.profile_start(mode = mode, duration = duration)
+        return self.show_profile()
+
+    @appier.route("/profile/stop", ("GET", "POST"))
+    def stop_profile(self):
+        self.system.profile_stop()
+        return self.show_profile()
+
+    @appier.route("/metrics", "GET")
+    def show_metrics(self):
+        self.content_type("text/plain; version=0.0.4")
+        return self.system.metrics()
+
     @appier.route("/connections", "GET")
     def list_connections(self):
         full = self.field("full", True, cast = bool)
@@ -41,6 +41,7 @@ import os
 import imp
 import sys
 import inspect
+import importlib
 import functools
 import itertools
 import contextlib
@@ -71,17 +72,18 @@ with ctx_absolute():
     try: import http
     except ImportError: http = None
 
-with ctx_absolute():
-    try: import urllib.error
-    except ImportError: pass
+def _import_http():
+    with ctx_absolute():
+        try: import urllib.error
+        except ImportError: pass
 
-with ctx_absolute():
-    try: import urllib.request
-    except ImportError: pass
+    with ctx_absolute():
+        try: import urllib.request
+        except ImportError: pass
 
-with ctx_absolute():
-    try: import http.client
-    except ImportError: pass
+    with ctx_absolute():
+        try: import http.client
+        except ImportError: pass
 
 try: import HTMLParser
 except ImportError: import html.parser; HTMLParser = html.parser
@@ -111,6 +113,11 @@ PYTHON_36 = sys.version_info[0] >= 3 and sys.version_info[1] >= 6
 """ Global variable that defines if the current Python
 interpreter is at least Python 3.6 compliant """
 
+PYTHON_37 = sys.version_info[0] >= 3 and sys.version_info[1] >= 7
+""" Global variable that defines if the current Python
+interpreter is at least Python 3.7 compliant, meaning
+that module level attribute resolution is supported """
+
 PYTHON_39 = sys.version_info[0] >= 3 and sys.version_info[1] >= 9
 """ Global variable that defines if the current Python
 interpreter is at least Python 3.9 compliant """
@@ -161,20 +168,38 @@ _range = range
 try: _xrange = xrange #@UndefinedVariable
 except Exception: _xrange = None
 
-if PYTHON_3: Request = urllib.request.Request
-else: Request = urllib2.Request
-
-if PYTHON_3: HTTPHandler = urllib.request.HTTPHandler
-else: HTTPHandler = urllib2.HTTPHandler
-
-if PYTHON_3: HTTPError = urllib.error.HTTPError
-else: HTTPError = urllib2.HTTPError
-
-if PYTHON_3: HTTPConnection = http.client.HTTPConnection #@UndefinedVariable
-else: HTTPConnection = httplib.HTTPConnection
-
-if PYTHON_3: HTTPSConnection = http.client.HTTPSConnection #@UndefinedVariable
-else: HTTPSConnection = httplib.HTTPSConnection
+def _http_names():
+    _import_http()
+    if PYTHON_3: return dict(
+        Request = urllib.request.Request,
+        HTTPHandler = urllib.request.HTTPHandler,
+        HTTPError = urllib.error.HTTPError,
+        HTTPConnection = http.client.HTTPConnection, #@UndefinedVariable
+        HTTPSConnection = http.client.HTTPSConnection #@UndefinedVariable
+    )
+    return dict(
+        Request = urllib2.Request,
+        HTTPHandler = urllib2.HTTPHandler,
+        HTTPError = urllib2.HTTPError,
+        HTTPConnection = httplib.HTTPConnection,
+        HTTPSConnection = httplib.HTTPSConnection
+    )
+
+HTTP_NAMES = ("Request", "HTTPHandler", "HTTPError", "HTTPConnection", "HTTPSConnection")
+""" The sequence of HTTP related names that are resolved on
+demand, as their modules (`urllib.request` and `http.client`)
+are responsible for a large share of the import time """
+
+def __getattr__(name):
+    if not name in HTTP_NAMES:
+        raise AttributeError(
+            "module '%s' has no attribute '%s'" % (__name__, name)
+        )
+    names = _http_names()
+    globals().update(names)
+    return names[name]
+
+if not PYTHON_37: globals().update(_http_names())
 
 try: _execfile = execfile #@UndefinedVariable
 except Exception: _execfile = None
@@ -188,6 +213,75 @@ except Exception: _reload = None
 try: _unichr = unichr #@UndefinedVariable
 except Exception: _unichr = None
 
+def lazy(scope, entries, exports = ()):
+    """
+    Installs lazy resolution of the provided entries in the
+    package whose global scope is provided, so that both the
+    sub-modules and the names they define are only imported
+    at the moment they are first accessed (PEP 562).
+
+    Each entry is a tuple with the name of the sub-module and
+    a sequence of names exported from it, which are going to be
+    made available at the package level.
+
+    Under interpreters without support for module level attribute
+    resolution every entry is imported eagerly, keeping the exact
+    same public API under such environments.
+
+    :type scope: Dictionary
+    :param scope: The global scope of the package (as returned
+    by the `globals()` call) that is going to be populated.
+    :type entries: Tuple
+    :param entries: The sequence of sub-module and name tuples
+    that are going to be resolved on demand.
+    :type exports: Tuple
+    :param exports: The sequence of extra names (already defined
+    in the scope) that should be exported on star imports.
+    """
+
+    package = scope["__name__"]
+
+    # builds the map that associates each of the public names with
+    # the sub-module that defines it, the sub-modules themselves are
+    # associated with an invalid value (as they are the target)
+    mapping = dict()
+    for module, names in entries:
+        mapping[module] = None
+        for name in names: mapping[name] = module
+
+    def __getattr__(name):
+        if not name in mapping:
+            raise AttributeError(
+                "module '%s' has no attribute '%s'" % (package, name)
+            )
+        module = mapping[name]
+        if module == None:
+            value = importlib.import_module("." + name, package)
+        else:
+            value = getattr(importlib.import_module("." + module, package), name)
+        scope[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(scope) | set(mapping))
+
+    # updates the scope of the package with the names that should be
+    # exported on star imports, as the lazy names are not yet present
+    # in the scope they must be explicitly listed
+    scope["__all__"] = list(exports) + [module for module, _names in entries] +\
+        [name for _module, names in entries for name in names]
+
+    # in case the current interpreter does not support module level
+    # attribute resolution every name is resolved eagerly, otherwise
+    # the resolution functions are set in the package scope
+    if PYTHON_37:
+        scope["__getattr__"] = __getattr__
+        scope["__dir__"] = __dir__
+    else:
+        for name in scope["__all__"]:
+            if name in scope: continue
+            __getattr__(name)
+
 def with_meta(meta, *bases):
     return meta("Class", bases, {})
 
@@ -340,10 +434,12 @@ def unichr(*args, **kwargs):
     return _unichr(*args, **kwargs)
 
 def urlopen(*args, **kwargs):
+    _import_http()
     if PYTHON_3: return urllib.request.urlopen(*args, **kwargs)
     else: return urllib2.urlopen(*args, **kwargs) #@UndefinedVariable
 
 def build_opener(*args, **kwargs):
+    _import_http()
     if PYTHON_3: return urllib.request.build_opener(*args, **kwargs)
     else: return urllib2.build_opener(*args, **kwargs) #@UndefinedVariable
 
@@ -0,0 +1,271 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import bisect
+
+from . import errors
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+""" The default set of bucket upper bounds (in seconds) to be
+used in latency oriented histograms, should cover values from
+the millisecond up to the (very bad) ten seconds scenario """
+
+PHASE_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001,
+    0.005, 0.01, 0.05, 0.1, 0.5, 1.0
+)
+""" The set of bucket upper bounds (in seconds) to be used in
+the histograms of the event loop phases, these are much finer
+than the latency ones as most of the phases are sub millisecond """
+
+COUNT_BUCKETS = (
+    0, 1, 2, 4, 8, 16, 32, 64,
+    128, 256, 512, 1024, 4096
+)
+""" The set of bucket upper bounds for histograms that count
+items (eg: events per poll, callbacks per tick), using powers
+of two so that a wide range of values is covered """
+
+class Metric(object):
+    """
+    Top level abstract class for the metrics that are kept
+    (incrementally) by the event loop and that are able to
+    render themselves in the Prometheus text format.
+
+    Optionally a metric may be labelled by a single label
+    name, in which case a value is kept per label value.
+    """
+
+    type = "untyped"
+    """ The Prometheus type of the metric, to be used in the
+    type comment line of the exposition format """
+
+    def __init__(self, name = None, help = None, label = None):
+        self.name = name
+        self.help = help
+        self.label = label
+
+    def render(self, lines = None):
+        lines = [] if lines == None else lines
+        if self.help: lines.append("# HELP %s %s" % (self.name, self.help))
+        lines.append("# TYPE %s %s" % (self.name, self.type))
+        self._render(lines)
+        return lines
+
+    def _render(self, lines):
+        raise errors.NotImplemented("Missing implementation")
+
+    def _sample(self, value, key = None, name = None, labels = None):
+        name = name or self.name
+        labels = list(labels or [])
+        if not key == None: labels.insert(0, (self.label, key))
+        labels_s = ",".join(
+            "%s=\"%s\"" % (_name, _escape(_value)) for _name, _value in labels
+        )
+        if labels_s: name += "{%s}" % labels_s
+        return "%s %s" % (name, _format(value))
+
+class Counter(Metric):
+    """
+    Monotonic counter metric, may be either incremented
+    directly or computed on render time by a getter, this
+    last option avoids any extra operation in hot paths that
+    already keep the value in an attribute.
+    """
+
+    type = "counter"
+
+    def __init__(self, name = None, help = None, label = None, getter = None):
+        Metric.__init__(self, name = name, help = help, label = label)
+        self.getter = getter
+        self.value = 0
+        self.values = dict()
+
+    def inc(self, amount = 1, key = None):
+        if key == None: self.value += amount
+        else: self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, key = None):
+        if self.getter: return self.getter()
+        if key == None: return self.value
+        return self.values.get(key, 0)
+
+    def reset(self):
+        self.value = 0
+        self.values.clear()
+
+    def _render(self, lines):
+        if self.getter:
+            lines.append(self._sample(self.getter()))
+        elif self.label:
+            for key, value in sorted(self.values.items()):
+                lines.append(self._sample(value, key = key))
+        else:
+            lines.append(self._sample(self.value))
+
+class Gauge(Counter):
+    """
+    Gauge metric, that unlike the counter may be set to
+    any value and decremented, most of the gauges are
+    expected to be computed by a getter at render time.
+    """
+
+    type = "gauge"
+
+    def set(self, value, key = None):
+        if key == None: self.value = value
+        else: self.values[key] = value
+
+    def dec(self, amount = 1, key = None):
+        self.inc(amount = amount * -1, key = key)
+
+class Histogram(Metric):
+    """
+    Fixed bucket histogram structure that counts the observed
+    values under a set of pre-defined upper bounds.
+
+    The observe operation is logarithmic on the number of
+    buckets and no memory is allocated per observation.
+    """
+
+    type = "histogram"
+
+    def __init__(self, buckets = LATENCY_BUCKETS, name = None, help = None):
+        Metric.__init__(self, name = name, help = help)
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def reset(self):
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def info_dict(self):
+        buckets = [str(bucket) for bucket in self.buckets] + ["+Inf"]
+        return dict(
+            buckets = dict(zip(buckets, self.counts)),
+            count = self.count,
+            sum = self.sum
+        )
+
+    def _render(self, lines):
+        # the Prometheus format requires the bucket counts to be
+        # cumulative, so the (per bucket) counts are accumulated
+        # while rendering, the last bucket is the infinite one
+        bucket_n = self.name + "_bucket"
+        total = 0
+        for bucket, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            lines.append(self._sample(total, name = bucket_n, labels = (("le", bucket),)))
+        lines.append(self._sample(self.sum, name = self.name + "_sum"))
+        lines.append(self._sample(self.count, name = self.name + "_count"))
+
+class Registry(object):
+    """
+    Registry of the metrics of an event loop, the metrics
+    are kept incrementally (by the loop, connections and
+    servers) so that rendering the registry is linear on
+    the number of metrics and not on the number of connections.
+
+    Registering a metric whose name already exists returns
+    the previously registered one, allowing multiple levels
+    of a class hierarchy to share the same metric.
+    """
+
+    def __init__(self, prefix = "netius"):
+        self.prefix = prefix
+        self.metrics = []
+        self.metrics_m = dict()
+
+    def counter(self, name, help = None, label = None, getter = None):
+        return self.register(
+            Counter(self._name(name), help = help, label = label, getter = getter)
+        )
+
+    def gauge(self, name, help = None, label = None, getter = None):
+        return self.register(
+            Gauge(self._name(name), help = help, label = label, getter = getter)
+        )
+
+    def histogram(self, name, help = None, buckets = LATENCY_BUCKETS):
+        return self.register(
+            Histogram(buckets, name = self._name(name), help = help)
+        )
+
+    def register(self, metric, name = None):
+        if name: metric.name = self._name(name)
+        if metric.name in self.metrics_m: return self.metrics_m[metric.name]
+        self.metrics.append(metric)
+        self.metrics_m[metric.name] = metric
+        return metric
+
+    def get(self, name):
+        return self.metrics_m.get(self._name(name), None)
+
+    def render(self):
+        lines = []
+        for metric in self.metrics: metric.render(lines = lines)
+        return "\n".join(lines) + "\n"
+
+    def _name(self, name):
+        if not self.prefix: return name
+        if name.startswith(self.prefix + "_"): return name
+        return self.prefix + "_" + name
+
+def _format(value):
+    if isinstance(value, float): return repr(value)
+    return str(value)
+
+def _escape(value):
+    value = str(value)
+    value = value.replace("\\", "\\\\")
+    value = value.replace("\"", "\\\"")
+    value = value.replace("\n", "\\n")
+    return value
@@ -47,8 +47,25 @@ class Observable(object):
     and should avoid variable naming collision.
     """
 
+    __slots__ = (
+        "events",
+        "oneshots",
+        "__dict__",
+        "__weakref__"
+    )
+    """ The slots of the observable, the dictionary is kept so
+    that attributes may still be set dynamically on any subclass,
+    but it's only created when such attribute is set, the weak
+    reference slot keeps the (sub-classes) objects referenceable """
+
+    watcher = None
+    """ The watchdog that is going to time the calls to the
+    handlers of the events, set (process wide) by the event
+    loop when the slow callback detection is enabled """
+
     def __init__(self, *args, **kwargs):
         self.events = {}
+        self.oneshots = None
 
     def build(self):
         pass
@@ -57,31 +74,88 @@ class Observable(object):
         self.unbind_all()
 
     def bind(self, name, method, oneshot = False):
-        if oneshot: method.oneshot = oneshot
-        methods = self.events.get(name, [])
-        methods.append(method)
-        self.events[name] = methods
+        # the handlers of each event are stored as an immutable
+        # tuple that is only rebuilt on bind/unbind, so that the
+        # trigger operation (much more frequent) may iterate over
+        # it without any copy and without being affected by handlers
+        # that bind or unbind while the event is being triggered
+        methods = self.events.get(name, ())
+        self.events[name] = methods + (method,)
+
+        # the oneshot handlers are tracked in a separate (lazily
+        # created) map instead of being marked in the method itself,
+        # this avoids any per handler check on the trigger path and
+        # allows bound methods to also be used as oneshots
+        if not oneshot: return
+        if self.oneshots == None: self.oneshots = {}
+        oneshots = self.oneshots.get(name, ())
+        self.oneshots[name] = oneshots + (method,)
 
     def unbind(self, name, method = None):
         methods = self.events.get(name, None)
         if not methods: return
-        if method: methods.remove(method)
-        else: del methods[:]
+        if method: methods = self._remove(methods, method)
+        else: methods = ()
+        if methods: self.events[name] = methods
+        else: del self.events[name]
+
+        if not self.oneshots: return
+        oneshots = self.oneshots.get(name, None)
+        if not oneshots: return
+        if method and method in oneshots: oneshots = self._remove(oneshots, method)
+        elif not method: oneshots = ()
+        if oneshots: self.oneshots[name] = oneshots
+        else: del self.oneshots[name]
+        if not self.oneshots: self.oneshots = None
 
     def unbind_all(self):
         if not hasattr(self, "events"): return
-        for methods in self.events.values(): del methods[:]
         self.events.clear()
+        self.oneshots = None
 
     def trigger(self, name, *args, **kwargs):
         methods = self.events.get(name, None)
         if not methods: return
-        oneshots = None
+        if self.watcher or self.oneshots:
+            self._trigger(name, methods, args, kwargs)
+            return
+        for method in methods: method(*args, **kwargs)
+
+    def fire(self, name, *args):
+        """
+        Faster variant of the trigger operation, meant to be used
+        for the hot events (eg: data and parser events) as it only
+        accepts positional arguments, avoiding the packing (and
+        unpacking) of the keyword arguments on each call.
+
+        :type name: String
+        :param name: The name of the event that is going to be
+        triggered, calling each of its handlers.
+        """
+
+        methods = self.events.get(name, None)
+        if not methods: return
+        if self.watcher or self.oneshots:
+            self._trigger(name, methods, args, {})
+            return
+        for method in methods: method(*args)
+
+    def _trigger(self, name, methods, args, kwargs):
+        watcher = self.watcher
         for method in methods:
-            method(*args, **kwargs)
-            if not hasattr(method, "oneshot"): continue
-            if not method.oneshot: continue
-            oneshots = [] if oneshots == None else oneshots
-            oneshots.append(method)
+            if watcher: watcher.call(method, *args, **kwargs)
+            else: method(*args, **kwargs)
+
+        # retrieves the oneshot handlers of the event and unbinds
+        # the ones that have just been called, notice that the ones
+        # bound (or unbound) by the handlers themselves are skipped
+        oneshots = self.oneshots.get(name, None) if self.oneshots else None
         if not oneshots: return
-        for oneshot in oneshots: self.unbind(name, oneshot)
+        for oneshot in oneshots:
+            if not oneshot in methods: continue
+            if not oneshot in self.events.get(name, ()): continue
+            self.unbind(name, oneshot)
+
+    def _remove(self, methods, method):
+        index = methods.index(method)
+        return methods[:index] + methods[index + 1:]
@@ -40,10 +40,13 @@ __license__ = "Apache License, Version 2.0"
 import time
 import select
 
+from . import errors
+
 POLL_TIMEOUT = 0.25
 """ The timeout to be used under the all the poll methods
 this should be considered the maximum amount of time a
-thread waits for a poll request """
+thread waits for a poll request, note that negative values
+(per poll operation) imply an infinite waiting time """
 
 class Poll(object):
     """
@@ -87,11 +90,11 @@ class Poll(object):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout = None):
         return []
 
-    def poll_owner(self):
-        reads, writes, errors = self.poll()
+    def poll_owner(self, timeout = None):
+        reads, writes, errors = self.poll(timeout = timeout)
 
         result = dict()
 
@@ -121,12 +124,18 @@ class Poll(object):
 
         return result
 
+    def dispatch(self, timeout = None):
+        raise errors.NotImplemented("Missing implementation")
+
     def is_open(self):
         return self._open
 
     def is_edge(self):
         return False
 
+    def is_dispatch(self):
+        return False
+
     def is_empty(self):
         return not self.read_o and not self.write_o and not self.error_o
 
@@ -191,6 +200,7 @@ class EpollPoll(Poll):
         self.epoll = select.epoll() #@UndefinedVariable
 
         self.fd_m = {}
+        self.fd_h = {}
 
         self.read_o = {}
         self.write_o = {}
@@ -205,15 +215,17 @@ class EpollPoll(Poll):
         self.epoll = None
 
         self.fd_m.clear()
+        self.fd_h.clear()
 
         self.read_o.clear()
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout = None):
         result = ([], [], [])
 
-        events = self.epoll.poll(self.timeout)
+        timeout = self.timeout if timeout == None else timeout
+        events = self.epoll.poll(timeout)
         for fd, event in events:
             if event & select.EPOLLIN: #@UndefinedVariable
                 socket = self.fd_m.get(fd, None)
@@ -227,13 +239,54 @@ class EpollPoll(Poll):
 
         return result
 
+    def dispatch(self, timeout = None):
+        """
+        Runs the poll operation and dispatches each of the resulting
+        events directly to the pre-bound handler of the file descriptor
+        in a single (flat) loop, without any intermediate lists.
+
+        The handlers are called for each descriptor in the read, write
+        and error order, which is different from the classic poll where
+        all the reads are handled before all the writes, note that the
+        handlers are resolved for all the events before dispatching.
+
+        :type timeout: float
+        :param timeout: The timeout (in seconds) for the poll operation,
+        in case it's not provided the default poll timeout is used.
+        :rtype: int
+        :return: The number of events that have been dispatched.
+        """
+
+        timeout = self.timeout if timeout == None else timeout
+        events = self.epoll.poll(timeout)
+
+        # resolves the handlers of the complete set of events before any
+        # of them is called, as a handler may close a descriptor that is
+        # then re-used (eg: accept) by a new socket in the same batch, and
+        # a stale event must not be routed to the new socket's handler
+        fd_h = self.fd_h
+        handlers = [(fd_h.get(fd, None), event) for fd, event in events]
+
+        for handler, event in handlers:
+            if not handler: continue
+            socket, read, write, error = handler
+            if event & select.EPOLLIN: read(socket) #@UndefinedVariable
+            if event & select.EPOLLOUT: write(socket) #@UndefinedVariable
+            if event & (select.EPOLLERR | select.EPOLLHUP): error(socket) #@UndefinedVariable
+
+        return len(events)
+
     def is_edge(self):
         return True
 
+    def is_dispatch(self):
+        return True
+
     def sub_read(self, socket, owner = None):
         if socket in self.read_o: return
         socket_fd = socket.fileno()
         self.fd_m[socket_fd] = socket
+        if owner: self.fd_h[socket_fd] = owner.dispatcher(socket)
         self.read_o[socket] = owner
         self.write_o[socket] = owner
         self.error_o[socket] = owner
@@ -255,6 +308,7 @@ class EpollPoll(Poll):
             socket_fd
         )
         del self.fd_m[socket_fd]
+        self.fd_h.pop(socket_fd, None)
         del self.read_o[socket]
         del self.write_o[socket]
         del self.error_o[socket]
@@ -302,10 +356,12 @@ class KqueuePoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout = None):
         result = ([], [], [])
 
-        events = self.kqueue.control(None, 32, self.timeout)
+        timeout = self.timeout if timeout == None else timeout
+        if timeout != None and timeout < 0: timeout = None
+        events = self.kqueue.control(None, 32, timeout)
         for event in events:
             if event.flags & select.KQ_EV_ERROR: #@UndefinedVariable
                 socket = self.fd_m.get(event.udata, None)
@@ -416,10 +472,11 @@ class PollPoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout = None):
         result = ([], [], [])
 
-        events = self._poll.poll(self.timeout * 1000)
+        timeout = self.timeout if timeout == None else timeout
+        events = self._poll.poll(timeout * 1000)
         for fd, event in events:
             if event & select.POLLIN: #@UndefinedVariable
                 socket = self.read_fd.get(fd, None)
@@ -519,11 +576,17 @@ class SelectPoll(Poll):
         self.write_o.clear()
         self.error_o.clear()
 
-    def poll(self):
+    def poll(self, timeout = None):
+        # resolves the timeout for the current poll operation defaulting
+        # to the one defined for the poll in case none is provided, note
+        # that negative values imply an infinite timeout (unset)
+        timeout = self.timeout if timeout == None else timeout
+        if timeout != None and timeout < 0: timeout = None
+
         # "calculates" the amount of time the select method is going
         # to be sleeping for empty polls based on the fact that the
         # current timeout value may be unset
-        sleep_timeout = self.timeout or POLL_TIMEOUT
+        sleep_timeout = POLL_TIMEOUT if timeout == None else timeout
 
         # verifies if the current selection list is empty
         # in case it's sleeps for a while and then continues
@@ -538,7 +601,7 @@ class SelectPoll(Poll):
             self.read_l,
             self.write_l,
             self.error_l,
-            self.timeout
+            timeout
         )
 
     def is_edge(self):
@@ -0,0 +1,269 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import sys
+import time
+import cProfile
+import threading
+
+from . import errors
+
+PROFILE_RATE = 100
+""" The default rate (in samples per second) at which the
+stack of the loop thread is going to be sampled, this value
+should be low enough to avoid any visible overhead """
+
+MAX_DEPTH = 128
+""" The maximum number of frames to be collected per stack
+sample, avoids unbounded work for deeply recursive stacks """
+
+class Profiler(object):
+    """
+    Abstract profiler class that defines the interface to be
+    used by the event loop to control the profiling process,
+    the output of the profiler is written to a file.
+    """
+
+    extension = "prof"
+    """ The extension of the file to which the output of
+    the profiler is going to be written """
+
+    def __init__(self, ident, rate = PROFILE_RATE):
+        self.ident = ident
+        self.rate = rate
+        self.start_t = None
+        self.stop_t = None
+
+    def start(self):
+        self.start_t = time.time()
+        self.stop_t = None
+
+    def stop(self):
+        self.stop_t = time.time()
+
+    def dump(self, path):
+        raise errors.NotImplemented("Missing implementation")
+
+    def top(self, count = 10):
+        raise errors.NotImplemented("Missing implementation")
+
+    def info_dict(self):
+        return dict(
+            type = self.__class__.__name__,
+            rate = self.rate,
+            start = self.start_t,
+            stop = self.stop_t,
+            top = self.top()
+        )
+
+class Sampler(Profiler):
+    """
+    Statistical profiler that samples the stack of the loop
+    thread (from a background thread) at a fixed rate, the
+    stacks are aggregated into the collapsed format that is
+    compatible with the flame graph tools.
+
+    The time of each sample is attributed to the callback
+    invoked by netius (the first frame outside of netius
+    called by netius or the inner netius frame otherwise)
+    so that hot handlers are easily identified.
+    """
+
+    extension = "folded"
+
+    def __init__(self, ident, rate = PROFILE_RATE, depth = MAX_DEPTH):
+        Profiler.__init__(self, ident, rate = rate)
+        self.depth = depth
+        self.samples = 0
+        self.stacks = dict()
+        self.callbacks = dict()
+        self._labels = dict()
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        Profiler.start(self)
+        self._running = True
+        self._thread = threading.Thread(target = self._run, name = "sampler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        Profiler.stop(self)
+        self._running = False
+        if self._thread: self._thread.join()
+        self._thread = None
+
+    def sample(self):
+        # retrieves the current frame of the target thread, in case
+        # there's none the thread is gone and nothing is sampled
+        frame = sys._current_frames().get(self.ident, None)
+        if frame == None: return
+
+        # walks the stack from the inner frame to the outer one
+        # collecting the label and the netius flag of each frame
+        frames = []
+        while frame and len(frames) < self.depth:
+            frames.append(self._label(frame))
+            frame = frame.f_back
+        frames.reverse()
+
+        # determines the callback to which the sample is attributed
+        # going from the outer frame to the inner one, this is the
+        # first non netius frame called by netius or the last netius
+        # frame in case no external code is being executed
+        callback = None
+        previous = False
+        for label, is_netius in frames:
+            if is_netius: callback = label
+            elif previous: callback = label; break
+            previous = is_netius
+
+        # updates the aggregated counters under the lock as they are
+        # read from other threads (eg: diagnostics and dump operations)
+        stack = ";".join(label for label, _is_netius in frames)
+        self._lock.acquire()
+        try:
+            self.stacks[stack] = self.stacks.get(stack, 0) + 1
+            if callback: self.callbacks[callback] = self.callbacks.get(callback, 0) + 1
+            self.samples += 1
+        finally:
+            self._lock.release()
+
+    def dump(self, path):
+        self._lock.acquire()
+        try: stacks = list(self.stacks.items())
+        finally: self._lock.release()
+        file = open(path, "w")
+        try:
+            for stack, count in sorted(stacks):
+                file.write("%s %d\n" % (stack, count))
+        finally:
+            file.close()
+
+    def top(self, count = 10):
+        self._lock.acquire()
+        try: items, total = list(self.callbacks.items()), self.samples
+        finally: self._lock.release()
+        items.sort(key = lambda item: item[1], reverse = True)
+        return [
+            dict(name = name, samples = samples, ratio = float(samples) / total)\
+            for name, samples in items[:count]
+        ]
+
+    def info_dict(self):
+        info = Profiler.info_dict(self)
+        info.update(samples = self.samples, stacks = len(self.stacks))
+        return info
+
+    def _run(self):
+        interval = 1.0 / self.rate
+        while self._running:
+            self.sample()
+            time.sleep(interval)
+
+    def _label(self, frame):
+        # tries to retrieve the label for the code of the frame from
+        # the cache, only qualified names are cached as the class name
+        # inferred from the instance may vary for the same code
+        code = frame.f_code
+        label = self._labels.get(code, None)
+        if label: return label
+
+        # builds the label from the name of the module and the qualified
+        # name of the code, falling back to the name of the class of the
+        # instance when the qualified name is not available (Python 2)
+        module = frame.f_globals.get("__name__", "?")
+        name = getattr(code, "co_qualname", None)
+        if not name and code.co_argcount and code.co_varnames[0] == "self":
+            instance = frame.f_locals.get("self", None)
+            name = "%s.%s" % (instance.__class__.__name__, code.co_name)
+        label = ("%s:%s" % (module, name or code.co_name), module.startswith("netius"))
+        if hasattr(code, "co_qualname"): self._labels[code] = label
+        return label
+
+class Tracer(Profiler):
+    """
+    Deterministic profiler that wraps the cProfile module
+    around the loop, must be started and stopped in the loop
+    thread as cProfile only profiles the calling thread, the
+    output is written in the pstats (binary) format.
+    """
+
+    extension = "pstats"
+
+    def __init__(self, ident, rate = PROFILE_RATE):
+        Profiler.__init__(self, ident, rate = rate)
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        Profiler.start(self)
+        self.profile.enable()
+
+    def stop(self):
+        Profiler.stop(self)
+        self.profile.disable()
+
+    def dump(self, path):
+        self.profile.dump_stats(path)
+
+    def top(self, count = 10):
+        # imports the statistics module only when needed as its import
+        # is expensive and only required when a report is requested
+        import pstats
+        if self.stop_t == None: return []
+        stats = pstats.Stats(self.profile)
+        items = sorted(stats.stats.items(), key = lambda item: item[1][2], reverse = True)
+        return [
+            dict(name = "%s:%d(%s)" % key, calls = value[1], time = value[2])\
+            for key, value in items[:count]
+        ]
+
+PROFILERS = dict(
+    sample = Sampler,
+    cprofile = Tracer
+)
+""" The map associating the name of the profiling mode with
+the class that implements such profiler """
+
+def build(mode, ident, rate = PROFILE_RATE):
+    cls = PROFILERS.get(mode, None)
+    if not cls: raise errors.NetiusError("Invalid profiler mode '%s'" % mode)
+    return cls(ident, rate = rate)
@@ -279,7 +279,7 @@ class DatagramProtocol(Protocol):
         pass
 
     def on_data(self, address, data):
-        self.trigger("data", self, data)
+        self.fire("data", self, data)
 
     def send(
         self,
@@ -363,7 +363,7 @@ class StreamProtocol(Protocol):
         pass
 
     def on_data(self, data):
-        self.trigger("data", self, data)
+        self.fire("data", self, data)
 
     def send(self, data, delay = True, force = False, callback = None):
         # ensures that the provided data value is a bytes sequence
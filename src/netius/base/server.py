@@ -51,6 +51,12 @@ is going to be set on the on the sockets created by
 the server (client sockets), this is critical for a
 good performance of the server (large value) """
 
+REPORT_TIMEOUT = 5.0
+""" The amount of time (in seconds) between each of the
+reports sent by a child process to the parent process
+about its (accept) statistics, a report is only sent in
+case the values have changed since the previous one """
+
 class Server(Base):
 
     def __init__(self, *args, **kwargs):
@@ -68,7 +74,10 @@ class Server(Base):
         self.cer_file = None
         self.ca_file = None
         self.env = False
+        self.reuse_port = False
         self.allowed = []
+        self.children_stats = dict()
+        self._report = None
         self._concrete = True
 
     def welcome(self):
@@ -100,6 +109,9 @@ class Server(Base):
             type = self.type,
             ssl = self.ssl
         )
+        if self.children_stats: info.update(
+            children_stats = self.children_stats
+        )
         return info
 
     def serve(
@@ -119,6 +131,7 @@ class Server(Base):
         ssl_dump = False,
         setuid = None,
         backlog = socket.SOMAXCONN,
+        reuse_port = False,
         load = True,
         start = True,
         env = False
@@ -145,6 +158,7 @@ class Server(Base):
         ca_file = self.get_env("CA_DATA", ca_file, expand = True) if env else ca_file
         setuid = self.get_env("SETUID", setuid, cast = int) if env else setuid
         backlog = self.get_env("BACKLOG", backlog, cast = int) if env else backlog
+        reuse_port = self.get_env("REUSE_PORT", reuse_port, cast = bool) if env else reuse_port
 
         # runs the various extra variable initialization taking into
         # account if the environment variable is currently set or not
@@ -154,6 +168,7 @@ class Server(Base):
         if env: self.middleware = self.get_env("MIDDLEWARE", self.middleware, cast = list)
         if env: self.children = self.get_env("CHILD", self.children, cast = int)
         if env: self.children = self.get_env("CHILDREN", self.children, cast = int)
+        if env: self.affinity = self.get_env("AFFINITY", self.affinity, cast = bool)
         if env: self.logging = self.get_env("LOGGING", self.logging)
         if env: self.poll_name = self.get_env("POLL", self.poll_name)
         if env: self.poll_timeout = self.get_env(
@@ -161,6 +176,21 @@ class Server(Base):
             self.poll_timeout,
             cast = float
         )
+        if env: self.poll_adaptive = self.get_env(
+            "POLL_ADAPTIVE",
+            self.poll_adaptive,
+            cast = bool
+        )
+        if env: self.poll_dispatch = self.get_env(
+            "POLL_DISPATCH",
+            self.poll_dispatch,
+            cast = bool
+        )
+        if env: self.read_budget = self.get_env(
+            "READ_BUDGET",
+            self.read_budget,
+            cast = int
+        )
         if env: self.keepalive_timeout = self.get_env(
             "KEEPALIVE_TIMEOUT",
             self.keepalive_timeout,
@@ -209,6 +239,7 @@ class Server(Base):
         self.ssl_fingerprint = ssl_fingerprint
         self.ssl_dump = ssl_dump
         self.env = env
+        self.reuse_port = reuse_port
 
         # populates the key, certificate and certificate authority file
         # information with the values that have just been resolved, these
@@ -227,6 +258,17 @@ class Server(Base):
         # to work under the much more latency free unix sockets
         is_unix = host == "unix"
 
+        # determines if the listener should be sharded among the child
+        # processes, meaning that each child has its own listening socket
+        # bound to the same port (SO_REUSEPORT) and the kernel balances
+        # the incoming connections among them, instead of the children
+        # contending for the accept of the same shared socket
+        shard = reuse_port and type == TCP_TYPE and not is_unix and\
+            self.children and hasattr(socket, "SO_REUSEPORT")
+        if reuse_port and not shard: self.warning(
+            "Not possible to shard listener (SO_REUSEPORT) for '%s'" % self.name
+        )
+
         # checks the type of service that is meant to be created and
         # creates a service socket according to the defined service
         family = socket.AF_INET6 if ipv6 else socket.AF_INET
@@ -238,7 +280,8 @@ class Server(Base):
             ca_file = ca_file,
             ca_root = ca_root,
             ssl_verify = ssl_verify,
-            family = family
+            family = family,
+            reuse_port = shard
         )
         elif type == UDP_TYPE: self.socket = self.socket_udp()
         else: raise errors.NetiusError("Invalid server type provided '%d'" % type)
@@ -256,15 +299,35 @@ class Server(Base):
         self.socket.bind(address)
         if type == TCP_TYPE: self.socket.listen(backlog)
 
-        # in case the set user id value the user of the current process should
-        # be changed so that it represents the new (possibly unprivileged user)
-        if setuid: os.setuid(setuid)
-
         # in case the selected port is zero based, meaning that a randomly selected
         # port has been assigned by the bind operation the new port must be retrieved
         # and set for the current server instance as the new port (for future reference)
         if self.port == 0: self.port = self.socket.getsockname()[1]
 
+        # in case the listener is sharded creates the remaining listening sockets
+        # (one per child) bound to the same port, note that this must be done
+        # before the user is changed as binding to a privileged port or joining
+        # the reuse port group of a different user is not allowed
+        shards = [self.socket] if shard else []
+        for _index in range(len(shards), self.children if shard else 0):
+            _socket = self.socket_tcp(
+                ssl,
+                key_file = key_file,
+                cer_file = cer_file,
+                ca_file = ca_file,
+                ca_root = ca_root,
+                ssl_verify = ssl_verify,
+                family = family,
+                reuse_port = True
+            )
+            _socket.bind((host, self.port))
+            _socket.listen(backlog)
+            shards.append(_socket)
+
+        # in case the set user id value the user of the current process should
+        # be changed so that it represents the new (possibly unprivileged user)
+        if setuid: os.setuid(setuid)
+
         # creates the string that identifies it the current service connection
         # is using a secure channel (SSL) and then prints an info message about
         # the service that is going to be started
@@ -279,7 +342,15 @@ class Server(Base):
         # in case the result is not valid an immediate return is performed
         # as this represents a master based process (not meant to serve)
         result = self.fork()
-        if not result: return
+        if not result: self._close_shards(shards, keep = self.socket); return
+
+        # in case the listener is sharded each child process keeps only the
+        # listening socket associated with its index (own accept queue) and
+        # closes the remaining ones, the same happens if no fork was done
+        if shard:
+            index = self._child_index if self._child else 0
+            self.socket = shards[index]
+            self._close_shards(shards, keep = self.socket)
 
         # ensures that the current polling mechanism is correctly open as the
         # service socket is going to be added to it next, this overrides the
@@ -310,7 +381,8 @@ class Server(Base):
         ca_root = True,
         ssl_verify = False,
         family = socket.AF_INET,
-        type = socket.SOCK_STREAM
+        type = socket.SOCK_STREAM,
+        reuse_port = False
     ):
         # verifies if the provided family is of type internet and if that's
         # the case the associated flag is set to valid for usage
@@ -349,6 +421,11 @@ class Server(Base):
         # avoiding the leak of connections (operative system managed)
         _socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         _socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if reuse_port: _socket.setsockopt(
+            socket.SOL_SOCKET,
+            socket.SO_REUSEPORT,
+            1
+        )
         if is_inet: _socket.setsockopt(
             socket.IPPROTO_TCP,
             socket.TCP_NODELAY,
@@ -392,6 +469,50 @@ class Server(Base):
     def on_serve(self):
         pass
 
+    def _close_shards(self, shards, keep = None):
+        for _socket in shards:
+            if _socket == keep: continue
+            try: _socket.close()
+            except Exception: pass
+
+    def on_child(self, pipe = None):
+        Base.on_child(self, pipe = pipe)
+
+        # schedules the periodic reporting of the child statistics
+        # to the parent process (using the provided pipe)
+        if pipe: self.delay(self.report_child, timeout = REPORT_TIMEOUT)
+
+    def on_command(self, command):
+        # tries to handle the command as a child report one, updating
+        # the statistics of the child process, in case that's not
+        # possible the command is handled by the upper layers
+        if command.startswith("report "):
+            _name, pid, info = command.split(" ", 2)
+            self.children_stats[int(pid)] = json.loads(info)
+            return
+        Base.on_command(self, command)
+
+    def report_child(self):
+        """
+        Reports the current statistics of the child process to the
+        parent process, by sending a command through the pipe, so that
+        the parent is able to aggregate the information of each child.
+
+        This method should only be called under a child process.
+        """
+
+        info = self.child_dict()
+        if not info == self._report:
+            message = "report %d %s" % (os.getpid(), json.dumps(info))
+            self._child_pipe(message)
+            self._report = info
+        self.delay(self.report_child, timeout = REPORT_TIMEOUT)
+
+    def child_dict(self):
+        return dict(
+            connections = len(self.connections)
+        )
+
 class DatagramServer(Server):
 
     def __init__(self, *args, **kwargs):
@@ -671,6 +792,14 @@ class DatagramServer(Server):
 
 class StreamServer(Server):
 
+    def __init__(self, *args, **kwargs):
+        Server.__init__(self, *args, **kwargs)
+        self.accepts = 0
+        self.registry.counter(
+            "accepts_total", "Number of connections accepted by the server",
+            getter = lambda: self.accepts
+        )
+
     def reads(self, reads, state = True):
         Server.reads(self, reads, state = state)
         for read in reads:
@@ -689,13 +818,29 @@ class StreamServer(Server):
             if error == self.socket: self.on_error_s(error)
             else: self.on_error(error)
 
+    def info_dict(self, full = False):
+        info = Server.info_dict(self, full = full)
+        info.update(accepts = self.accepts)
+        return info
+
+    def child_dict(self):
+        info = Server.child_dict(self)
+        info.update(accepts = self.accepts)
+        return info
+
     def serve(self, type = TCP_TYPE, *args, **kwargs):
         Server.serve(self, type = type, *args, **kwargs)
 
+    def dispatcher(self, socket):
+        if socket == self.socket:
+            return (socket, self.on_read_s, self.on_write_s, self.on_error_s)
+        return Server.dispatcher(self, socket)
+
     def on_read_s(self, _socket):
         try:
             while True:
                 socket_c, address = _socket.accept()
+                self.accepts += 1
                 try: self.on_socket_c(socket_c, address)
                 except Exception: socket_c.close(); raise
         except ssl.SSLError as error:
@@ -724,6 +869,10 @@ class StreamServer(Server):
         pass
 
     def on_read(self, _socket):
+        # in case the socket is already scheduled in the ready queue
+        # it's going to be read on the next tick (round robin fairness)
+        if _socket in self._ready_s: return
+
         # tries to retrieve the connection from the provided socket
         # object (using the associative map) this connection is going
         # to be used over the method for multiple operations
@@ -757,15 +906,19 @@ class StreamServer(Server):
             if self._pending(connection): return
 
             # iterates continuously trying to read as much data as possible
-            # when there's a failure to read more data it should raise an
-            # exception that should be handled properly
+            # (limited by the read budget) when there's a failure to read
+            # more data it should raise an exception that should be handled
+            count = 0
             while True:
                 data = connection.recv(CHUNK_SIZE)
                 if data: self.on_data(connection, data)
-                else: connection.close(); break
+                else: connection.close(reason = "peer"); break
                 if not connection.status == OPEN: break
                 if not connection.renable == True: break
                 if not connection.socket == _socket: break
+                count += len(data)
+                if self.read_budget and count >= self.read_budget:
+                    self.ready(_socket); break
         except ssl.SSLError as error:
             error_v = error.args[0] if error.args else None
             error_m = error.reason if hasattr(error, "reason") else None
@@ -838,12 +991,12 @@ class StreamServer(Server):
         if not connection: return
         if not connection.status == OPEN: return
 
-        connection.close()
+        connection.close(reason = "error")
 
     def on_exception(self, exception, connection):
         self.warning(exception)
         self.log_stack()
-        connection.close()
+        connection.close(reason = "exception")
 
     def on_exception_s(self, exception):
         self.warning(exception)
@@ -851,7 +1004,7 @@ class StreamServer(Server):
 
     def on_expected(self, exception, connection):
         self.debug(exception)
-        connection.close()
+        connection.close(reason = "expected")
 
     def on_expected_s(self, exception):
         self.debug(exception)
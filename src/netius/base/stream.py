@@ -61,6 +61,13 @@ class Stream(observer.Observable):
     to the one defined by a connection.
     """
 
+    __slots__ = (
+        "status",
+        "owner",
+        "connection"
+    )
+    """ The explicit set of attributes of the stream """
+
     def __init__(self, owner = None):
         observer.Observable.__init__(self)
         self.status = PENDING
@@ -0,0 +1,332 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import heapq
+import collections
+
+TIMER_RESOLUTION = 0.01
+""" The amount of time (in seconds) covered by each of
+the slots of the timing wheel, smaller values imply a
+larger number of slot visits for the same period """
+
+TIMER_SLOTS = 1024
+""" The number of slots in the (hashed) timing wheel, the
+complete revolution of the wheel covers the resolution
+multiplied by this value (in seconds) """
+
+class Timer(object):
+    """
+    Handle that represents a callable that has been scheduled
+    for delayed execution in the event loop.
+
+    The handle may be used to cancel the execution of the callable
+    at any time before it's run, cancellation is an O(1) operation
+    as the entry is only lazily removed from the timer structures.
+    """
+
+    def __init__(self, target = None, did = None, callable = None, lid = None, owner = None):
+        self.target = target
+        self.did = did
+        self.callable = callable
+        self.lid = lid
+        self.owner = owner
+        self.tick = None
+        self.key = None
+        self.run = True
+
+    def cancel(self):
+        if not self.run: return
+        self.run = False
+        if self.key and self.owner: self.owner._discard(self)
+
+        # releases the reference to the callable (and to everything
+        # captured by it) as the handle remains in the wheel slot
+        # until its target is reached (lazy removal)
+        self.callable = None
+
+class TimerWheel(object):
+    """
+    Hashed timing wheel implementation that holds the complete set
+    of delayed callables for an event loop.
+
+    Callables scheduled for immediate execution (target -1) and for
+    the next loop tick (target 0) are kept in simple FIFO queues while
+    timed callables are hashed into the wheel slots by their target
+    tick, making both insertion and cancellation constant time.
+
+    The optional duplicate verification is performed against a set of
+    keys (target and callable) of the entries scheduled with verification
+    avoiding any kind of linear scan of the pending entries.
+
+    The ticks of the non empty slots are kept in a (small) heap so that
+    both the harvest and the timeout operations only visit slots that
+    contain timers, instead of scanning the complete wheel.
+    """
+
+    def __init__(self, resolution = TIMER_RESOLUTION, slots = TIMER_SLOTS):
+        self.resolution = resolution
+        self.slots = slots
+        self.wheel = [[] for _index in range(slots)]
+        self.immediate = collections.deque()
+        self.next = collections.deque()
+        self.expired = collections.deque()
+        self.keys = set()
+        self.ticks = []
+        self.ticks_s = set()
+        self.count = 0
+        self.cursor = self._tick(time.time()) - 1
+        self._did = 0
+
+    def __len__(self):
+        return len(self.immediate) + len(self.next) +\
+            len(self.expired) + self.count
+
+    def __bool__(self):
+        return True if len(self) else False
+
+    def __nonzero__(self):
+        return self.__bool__()
+
+    def schedule(self, callable, target, lid, verify = False, timer = None):
+        """
+        Schedules the provided callable for execution at the provided
+        target, that should be either -1 (immediate), 0 (next tick) or
+        a timestamp for the execution.
+
+        :type callable: Function
+        :param callable: The callable that is going to be scheduled.
+        :type target: float
+        :param target: The target for the execution, -1 for immediate
+        execution, 0 for next tick execution or the timestamp.
+        :type lid: int
+        :param lid: The loop identifier at the time of scheduling.
+        :type verify: bool
+        :param verify: If a duplicate (same target and callable) should
+        be ignored instead of being scheduled.
+        :type timer: Timer
+        :param timer: An already existing (unscheduled) timer handle that
+        should be used instead of creating a new one, useful for handles
+        that are created outside of the event loop thread.
+        :rtype: Timer
+        :return: The timer handle for the scheduled callable or an invalid
+        value in case the callable is considered a duplicate.
+        """
+
+        # in case the verify flag is set builds the key for the entry
+        # and verifies that it's not already present (duplicate) in the
+        # set of keys, returning immediately if that's the case
+        key = (target, callable) if verify else None
+        if verify and key in self.keys: return None
+
+        # creates (or updates) the timer handle for the callable, incrementing
+        # the delay identifier that guarantees a fifo like ordering for the
+        # entries that share the same target value
+        timer = timer or Timer()
+        timer.target = target
+        timer.did = self._did
+        timer.callable = callable
+        timer.lid = lid
+        timer.owner = self
+        self._did += 1
+
+        # registers the key of the timer in the set of keys so that
+        # further duplicate verification may be performed
+        if verify:
+            timer.key = key
+            self.keys.add(key)
+
+        # adds the timer to the proper structure according to the target
+        # values, timestamp based targets are hashed into the wheel slot
+        # taking into account that targets behind the cursor are moved
+        # into the first slot still to be visited
+        if target == -1: self.immediate.append(timer)
+        elif target == 0: self.next.append(timer)
+        else:
+            tick = max(self._tick(target), self.cursor + 1)
+            timer.tick = tick
+            self.wheel[tick % self.slots].append(timer)
+            self.count += 1
+            if not tick in self.ticks_s:
+                heapq.heappush(self.ticks, tick)
+                self.ticks_s.add(tick)
+
+        # returns the timer handle to the caller method so that it may
+        # be used latter for cancellation of the execution
+        return timer
+
+    def harvest(self, current):
+        """
+        Visits the wheel slots between the cursor and the current
+        tick, moving the timers whose target has been reached into
+        the expired queue (by target order).
+
+        :type current: float
+        :param current: The current timestamp that is going to be
+        used in the comparison against the targets of the timers.
+        """
+
+        # calculates the tick for the current timestamp and in case
+        # there are no timed entries in the wheel moves the cursor
+        # directly, nothing to be harvested from the wheel
+        tick = self._tick(current)
+        if not self.count: self.cursor = tick - 1; return
+
+        # iterates over the (non empty) slot ticks that have already been
+        # reached, collecting the timers that have reached the target value
+        # and removing the ones that have been canceled in the meantime
+        expired = []
+        remaining = []
+        while self.ticks and self.ticks[0] <= tick:
+            index = heapq.heappop(self.ticks)
+            self.ticks_s.discard(index)
+            slot = self.wheel[index % self.slots]
+            pending = []
+            for timer in slot:
+                if not timer.tick == index: pending.append(timer)
+                elif not timer.run: self.count -= 1
+                elif timer.target <= current: expired.append(timer); self.count -= 1
+                else: pending.append(timer); remaining.append(index)
+            slot[:] = pending
+
+        # re-registers the ticks that still contain timers that have not
+        # been reached (same tick, later target) so they're visited again
+        for index in set(remaining):
+            heapq.heappush(self.ticks, index)
+            self.ticks_s.add(index)
+
+        # updates the cursor so that the current tick slot is visited
+        # again, as some of its timers may not have been reached yet
+        self.cursor = tick - 1
+
+        # in case no timers have expired there's nothing remaining to
+        # be done, otherwise sorts them by target and identifier and
+        # adds them to the expired queue for execution
+        if not expired: return
+        expired.sort(key = lambda timer: (timer.target, timer.did))
+        self.expired.extend(expired)
+
+    def pop(self, lid):
+        """
+        Retrieves the next timer that is ready to be executed, the
+        order of execution is immediate, next tick and then expired
+        (timed) entries.
+
+        The next tick timers scheduled under the provided loop
+        identifier are not returned (as they belong to the next tick).
+
+        :type lid: int
+        :param lid: The current loop identifier.
+        :rtype: Timer
+        :return: The next timer ready to be executed or an invalid
+        value in case there's none.
+        """
+
+        while True:
+            if self.immediate: timer = self.immediate.popleft()
+            elif self.next and not self.next[0].lid == lid:
+                timer = self.next.popleft()
+            elif self.expired: timer = self.expired.popleft()
+            else: timer = None
+
+            if not timer: break
+            if not timer.run: continue
+
+            timer.run = False
+            if timer.key: self.keys.discard(timer.key)
+            return timer
+
+        if not len(self): self._did = 0
+        return None
+
+    def timeout(self, current):
+        """
+        Determines the amount of time (in seconds) until the next
+        timer becomes ready to be executed, to be used as the timeout
+        of the next poll operation.
+
+        :type current: float
+        :param current: The current timestamp to be used as reference.
+        :rtype: float
+        :return: The number of seconds until the next timer is ready,
+        zero in case there are timers ready for execution or an invalid
+        value in case there are no timers pending.
+        """
+
+        # in case there are timers ready to be executed (immediate, next
+        # tick or already expired) no waiting should occur, otherwise in
+        # case there are no timed entries there's no timeout at all
+        if self.immediate or self.next or self.expired: return 0.0
+        if not self.count: return None
+
+        # uses the smallest of the non empty slot ticks to find the next
+        # deadline, in case all the timers of that tick have been canceled
+        # they're removed and the next smallest tick is used instead
+        while self.ticks:
+            index = self.ticks[0]
+            slot = self.wheel[index % self.slots]
+            targets = [timer.target for timer in slot if timer.run and timer.tick == index]
+            if targets: return max(min(targets) - current, 0.0)
+            heapq.heappop(self.ticks)
+            self.ticks_s.discard(index)
+            pending = [timer for timer in slot if not timer.tick == index]
+            self.count -= len(slot) - len(pending)
+            slot[:] = pending
+
+        # no timed entries remain (all of them have been canceled) so
+        # there's no timeout for the next poll operation
+        return None
+
+    def clear(self):
+        for slot in self.wheel: del slot[:]
+        self.immediate.clear()
+        self.next.clear()
+        self.expired.clear()
+        self.keys.clear()
+        del self.ticks[:]
+        self.ticks_s.clear()
+        self.count = 0
+        self._did = 0
+
+    def _discard(self, timer):
+        if not timer.key: return
+        self.keys.discard(timer.key)
+
+    def _tick(self, value):
+        return int(value / self.resolution)
@@ -121,6 +121,29 @@ class Transport(observer.Observable):
         # behaviour level compatibility with the asyncio library)
         self._connection.send(data, address = addr, delay = False)
 
+    def pause_reading(self):
+        # verifies if the current connection is closing or in the process
+        # of closing and if that's the case returns immediately (graceful)
+        if self.is_closing(): return
+
+        # disables the read operations in the underlying connection so
+        # that no more data is received until the reading is resumed
+        self._connection.disable_read()
+
+    def resume_reading(self):
+        # verifies if the current connection is closing or in the process
+        # of closing and if that's the case returns immediately (graceful)
+        if self.is_closing(): return
+
+        # re-enables the read operations in the underlying connection, the
+        # data pending in the socket is going to be received in the next
+        # poll iteration of the owner event loop
+        self._connection.enable_read()
+
+    def is_reading(self):
+        if self.is_closing(): return False
+        return self._connection.renable
+
     def get_extra_info(self, name, default = None):
         callable = self._extra_dict.get(name, None)
         if callable: return callable()
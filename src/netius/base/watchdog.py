@@ -0,0 +1,176 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import socket
+import functools
+
+from . import conn
+
+SLOW_THRESHOLD = 0.1
+""" The default amount of time (in seconds) above which a
+callback is considered to be slow, blocking the complete
+set of connections handled by the event loop """
+
+LOG_INTERVAL = 1.0
+""" The minimum interval (in seconds) between two log messages
+about slow callbacks, avoids flooding the log when the loop
+is continuously under a slow callback scenario """
+
+TOP_COUNT = 10
+""" The number of slow callbacks (offenders) to be kept in
+the top table exposed by the information dictionary """
+
+class Watchdog(object):
+    """
+    Detector of slow callbacks that times the calls performed
+    by the event loop (delayed calls, read and write handlers
+    and event handlers) and reports the ones that exceed the
+    threshold, as a single slow callback stalls the loop.
+
+    The reporting is rate limited and the offenders are kept
+    in a table indexed by the qualified name of the callable.
+    """
+
+    def __init__(
+        self,
+        owner,
+        threshold = SLOW_THRESHOLD,
+        interval = LOG_INTERVAL,
+        count = TOP_COUNT
+    ):
+        self.owner = owner
+        self.threshold = threshold
+        self.interval = interval
+        self.count = count
+        self.slow = 0
+        self.suppressed = 0
+        self.offenders = dict()
+        self._last = 0.0
+
+    def call(self, callable, *args, **kwargs):
+        start = time.time()
+        try:
+            return callable(*args, **kwargs)
+        finally:
+            duration = time.time() - start
+            if duration >= self.threshold: self.report(callable, duration, args)
+
+    def report(self, callable, duration, args = ()):
+        # resolves the qualified name of the callable and the identifier
+        # of the connection associated with the call (if any), that may be
+        # the instance of the (bound) callable or one of its arguments,
+        # and updates the entry of the offender with the new (slow) call
+        name = self._name(callable)
+        instance = getattr(callable, "__self__", None)
+        connection = self._identify((instance,) + tuple(args))
+        offender = self.offenders.get(name, None)
+        if not offender:
+            offender = dict(name = name, count = 0, total = 0.0, max = 0.0)
+            self.offenders[name] = offender
+        offender["count"] += 1
+        offender["total"] += duration
+        offender["max"] = max(offender["max"], duration)
+        offender["connection"] = connection
+        self.slow += 1
+
+        # verifies if a message has been logged in the current interval
+        # and if that's the case only counts the suppressed message
+        current = time.time()
+        if current - self._last < self.interval:
+            self.suppressed += 1
+            return
+
+        # logs the message about the slow callback including the number
+        # of messages suppressed since the last logged one
+        self.owner.warning(
+            "Slow callback '%s' took %.2fms%s%s" % (
+                name,
+                duration * 1000.0,
+                " for connection '%s'" % connection if connection else "",
+                " (%d suppressed)" % self.suppressed if self.suppressed else ""
+            )
+        )
+        self.suppressed = 0
+        self._last = current
+
+    def top(self, count = None):
+        count = count or self.count
+        offenders = sorted(
+            self.offenders.values(),
+            key = lambda offender: offender["max"],
+            reverse = True
+        )
+        return [dict(offender) for offender in offenders[:count]]
+
+    def reset(self):
+        self.slow = 0
+        self.suppressed = 0
+        self.offenders.clear()
+
+    def info_dict(self):
+        return dict(
+            threshold = self.threshold,
+            slow = self.slow,
+            top = self.top()
+        )
+
+    def _name(self, callable):
+        if isinstance(callable, functools.partial): callable = callable.func
+        function = getattr(callable, "__func__", callable)
+        module = getattr(function, "__module__", None)
+        name = getattr(function, "__qualname__", None)
+        if not name:
+            name = getattr(function, "__name__", None) or repr(callable)
+            instance = getattr(callable, "__self__", None)
+            if instance: name = "%s.%s" % (instance.__class__.__name__, name)
+        return "%s:%s" % (module, name) if module else name
+
+    def _identify(self, args):
+        # tries to find the connection associated with the arguments
+        # of the call, either directly, as the owner of the value (eg:
+        # parser) or through the socket of the connection
+        for value in args:
+            if isinstance(value, conn.BaseConnection): return value.id
+            owner = getattr(value, "owner", None)
+            if isinstance(owner, conn.BaseConnection): return owner.id
+            if not isinstance(value, socket.socket): continue
+            connection = self.owner.connections_m.get(value, None)
+            if connection: return connection.id
+        return None
@@ -0,0 +1,192 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import socket
+
+try: import resource
+except ImportError: resource = None
+
+import netius
+
+IDLE = 10000
+""" The number of idle (registered but silent) connections
+that are going to be present in the loop while measuring """
+
+ACTIVE = 1000
+""" The number of active connections, each of them receives
+a small payload per round, generating one read event """
+
+ROUNDS = 20
+""" The number of rounds (writes and loop iterations) to be
+performed for each of the dispatch modes, the elapsed time
+is reported per received message (one per active socket) """
+
+class BenchBase(netius.Base):
+    """
+    Loop used for the benchmark, able to run either the complete
+    read handling (receive and data callback) or a no operation
+    handling, measuring only the event dispatching overhead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        netius.Base.__init__(self, *args, **kwargs)
+        self.noop = False
+        self.count = 0
+
+    def on_read(self, _socket):
+        if self.noop: self.count += 1
+        else: netius.Base.on_read(self, _socket)
+
+    def on_write(self, _socket):
+        if self.noop: return
+        netius.Base.on_write(self, _socket)
+
+    def on_data_base(self, connection, data):
+        self.count += 1
+
+def limit(idle, active):
+    # tries to raise the limit of open files to the maximum allowed
+    # and then clamps the number of idle connections to that limit
+    # (each connection requires two file descriptors, socket pair)
+    if not resource: return idle
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if not soft == hard and not hard == resource.RLIM_INFINITY:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        soft = hard
+    if soft == resource.RLIM_INFINITY: return idle
+    return max(min(idle, (soft - 256) // 2 - active), 0)
+
+def build(idle = IDLE, active = ACTIVE):
+    # creates the base loop with the epoll based poll (required for
+    # the dispatch mode) and opens it with an immediate timeout
+    base = BenchBase(poll = netius.EpollPoll)
+    base.poll = base.build_poll()
+    base.poll.open(timeout = 0)
+
+    # creates the complete set of socket pairs, registering one of
+    # the sides as a connection in the loop and keeping the other
+    # (remote) side to be used for the sending of data
+    peers = []
+    for index in range(idle + active):
+        local, remote = socket.socketpair()
+        local.setblocking(0)
+        connection = base.build_connection(local, address = ("pair", index))
+        connection.open()
+        peers.append(remote)
+
+    # runs an initial poll so that the (edge triggered) write
+    # events raised by the registration are consumed
+    base.poll.poll(timeout = 0)
+    return base, peers[idle:], peers
+
+def iteration(base, dispatch):
+    if dispatch: return base.poll.dispatch(timeout = 0.1)
+    reads, writes, errors = base.poll.poll(timeout = 0.1)
+    base.reads(reads)
+    base.writes(writes)
+    base.errors(errors)
+    return len(reads) + len(writes) + len(errors)
+
+def run_one(base, active, dispatch, noop = False, rounds = ROUNDS):
+    elapsed = 0.0
+    events = 0
+    base.noop = noop
+    for _index in range(rounds):
+        for peer in active: peer.send(b"x")
+        base.count = 0
+        start = time.time()
+        while base.count < len(active):
+            events += iteration(base, dispatch)
+        elapsed += time.time() - start
+    if noop:
+        for peer in active: peer.send(b"x")
+        base.noop = False
+        base.count = 0
+        while base.count < len(active): iteration(base, dispatch)
+    return elapsed, events
+
+def run_all(idle = IDLE, active = ACTIVE, rounds = ROUNDS):
+    idle = limit(idle, active)
+    base, active_p, peers = build(idle = idle, active = active)
+    try:
+        results = []
+        for handler, noop in (("full", False), ("noop", True)):
+            for name, dispatch in (("classic", False), ("dispatch", True)):
+                elapsed, events = run_one(
+                    base,
+                    active_p,
+                    dispatch,
+                    noop = noop,
+                    rounds = rounds
+                )
+                messages = rounds * len(active_p)
+                results.append(dict(
+                    name = name,
+                    handler = handler,
+                    idle = idle,
+                    active = active,
+                    events = events,
+                    elapsed = elapsed,
+                    per_message = elapsed / float(messages or 1)
+                ))
+        return results
+    finally:
+        for connection in list(base.connections): connection.close()
+        for peer in peers: peer.close()
+        base.poll.close()
+
+def report(results):
+    print("%-10s %-8s %8s %8s %12s %14s" % (
+        "name", "handler", "idle", "active", "elapsed", "per message"
+    ))
+    for result in results:
+        print("%-10s %-8s %8d %8d %10.2fms %12.2fus" % (
+            result["name"],
+            result["handler"],
+            result["idle"],
+            result["active"],
+            result["elapsed"] * 1000.0,
+            result["per_message"] * 1000000.0
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
@@ -0,0 +1,170 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+import time
+import socket
+import threading
+
+import netius.extra
+
+PIPELINE = 16
+""" The number of requests pipelined by the client in each
+of the rounds, the responses are generated in the same tick """
+
+ROUNDS = 500
+""" The number of rounds (pipelined batches of requests) to
+be performed for each of the flushing modes """
+
+REQUEST = b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n"
+""" The request to be pipelined, a simple keep alive request
+to which a small (in memory) response is sent """
+
+class CountSocket(socket.socket):
+    """
+    Socket that counts the number of (write) system calls performed
+    on it, used by the server (patched socket class) so that the
+    number of syscalls per request may be reported.
+    """
+
+    writes = 0
+
+    def send(self, *args, **kwargs):
+        CountSocket.writes += 1
+        return super(CountSocket, self).send(*args, **kwargs)
+
+    def sendmsg(self, *args, **kwargs):
+        CountSocket.writes += 1
+        return super(CountSocket, self).sendmsg(*args, **kwargs)
+
+def build(delayed = False):
+    # creates the server and starts serving it (without the starting
+    # of the event loop) so that the port is bound to the socket
+    server = netius.extra.HelloServer(message = "ok")
+    server.keep_alive = True
+    server.serve(host = "127.0.0.1", port = 0, start = False)
+
+    # wraps the delay operation of the server so that the number of
+    # delayed operations scheduled (timer entries) is counted
+    server.delays = 0
+    delay = server.delay
+    def _delay(*args, **kwargs):
+        server.delays += 1
+        return delay(*args, **kwargs)
+    server.delay = _delay
+
+    # in case the delayed mode is requested the previous strategy is
+    # emulated, where every send on a write ready connection schedules
+    # a (verified) delayed flush operation instead of marking it dirty
+    if delayed: server.dirty = lambda connection: server.delay(
+        connection._flush_write,
+        immediately = True,
+        verify = True
+    )
+
+    thread = threading.Thread(target = server.start)
+    thread.daemon = True
+    thread.start()
+    return server, thread
+
+def run_one(delayed = False, pipeline = PIPELINE, rounds = ROUNDS):
+    # patches the socket class so that the sockets accepted by the server
+    # are counting sockets (accept uses the class defined in the module),
+    # note that only the send operations of the server are counted
+    server, thread = build(delayed = delayed)
+    _socket = socket.socket
+    socket.socket = CountSocket
+    client = socket.create_connection(("127.0.0.1", server.port))
+    try:
+        CountSocket.writes = 0
+        server.delays = 0
+        start = time.time()
+        for _index in range(rounds):
+            client.sendall(REQUEST * pipeline)
+            received = b""
+            while received.count(b"HTTP/1.1 200") < pipeline:
+                received += client.recv(65536)
+        elapsed = time.time() - start
+        writes = CountSocket.writes
+        delays = server.delays
+    finally:
+        socket.socket = _socket
+        client.close()
+        server.delay_s(server.stop)
+        thread.join()
+        server.cleanup()
+    return elapsed, writes, delays
+
+def run_all(pipeline = PIPELINE, rounds = ROUNDS):
+    results = []
+    for name, delayed in (("delayed", True), ("dirty", False)):
+        elapsed, writes, delays = run_one(
+            delayed = delayed,
+            pipeline = pipeline,
+            rounds = rounds
+        )
+        requests = rounds * pipeline
+        results.append(dict(
+            name = name,
+            pipeline = pipeline,
+            requests = requests,
+            elapsed = elapsed,
+            per_request = elapsed / float(requests),
+            writes = writes / float(requests),
+            delays = delays / float(requests)
+        ))
+    return results
+
+def report(results):
+    print("%-8s %8s %10s %12s %14s %10s %10s" % (
+        "name", "pipeline", "requests", "elapsed", "per request", "syscalls", "delays"
+    ))
+    for result in results:
+        print("%-8s %8d %10d %10.2fms %12.2fus %10.3f %10.3f" % (
+            result["name"],
+            result["pipeline"],
+            result["requests"],
+            result["elapsed"] * 1000.0,
+            result["per_request"] * 1000000.0,
+            result["writes"],
+            result["delays"]
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
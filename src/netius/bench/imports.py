@@ -0,0 +1,138 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import sys
+import subprocess
+
+import netius
+
+TARGETS = (
+    "netius",
+    "netius.common",
+    "netius.clients",
+    "netius.servers",
+    "netius.extra",
+    "netius.sh"
+)
+""" The sequence of packages for which the import time is
+going to be measured, each one in a fresh interpreter """
+
+REPEAT = 5
+""" The number of times each of the imports is repeated, the
+minimum of the measured values is the one reported as it's
+the one with the smallest amount of noise """
+
+TOP_COUNT = 5
+""" The number of (self time) heaviest modules that are going
+to be listed for each of the measured packages """
+
+SCRIPT = "import sys, %s; print(len([name for name in sys.modules if name.startswith(\"netius\")]))"
+""" The script executed by the child interpreter, it imports the
+target package and prints the number of loaded netius modules """
+
+def run_one(target, repeat = REPEAT):
+    best = None
+    for _index in range(repeat):
+        result = measure(target)
+        if best and best["total"] <= result["total"]: continue
+        best = result
+    return best
+
+def measure(target):
+    # runs a new interpreter with the import time instrumentation
+    # turned on (Python 3.7+), the report is written to the standard
+    # error stream with one line per module that has been imported
+    process = subprocess.Popen(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT % target],
+        stdout = subprocess.PIPE,
+        stderr = subprocess.PIPE
+    )
+    stdout, stderr = process.communicate()
+    if not process.returncode == 0:
+        raise netius.NetiusError("Failed to import '%s'" % target)
+
+    # parses each of the lines of the report (ignoring the header)
+    # gathering the self time of each of the modules, the cumulative
+    # time is not used as it would count nested imports multiple times
+    modules = []
+    for line in netius.legacy.str(stderr).splitlines():
+        if not line.startswith("import time:"): continue
+        values = line[len("import time:"):].split("|")
+        self_t, name = values[0].strip(), values[2].strip()
+        if not self_t.isdigit(): continue
+        modules.append((int(self_t), name))
+
+    total = sum(module[0] for module in modules)
+    netius_t = sum(module[0] for module in modules if module[1].startswith("netius"))
+    heaviest = sorted(modules, reverse = True)[:TOP_COUNT]
+
+    return dict(
+        target = target,
+        total = total / 1000.0,
+        netius = netius_t / 1000.0,
+        modules = len(modules),
+        count = int(stdout.strip()),
+        heaviest = [(name, self_t / 1000.0) for self_t, name in heaviest]
+    )
+
+def run_all(targets = TARGETS):
+    return [run_one(target) for target in targets]
+
+def report(results):
+    print("%-16s %10s %10s %8s %8s" % (
+        "target", "total", "netius", "modules", "netius"
+    ))
+    for result in results:
+        print("%-16s %8.2fms %8.2fms %8d %8d" % (
+            result["target"],
+            result["total"],
+            result["netius"],
+            result["modules"],
+            result["count"]
+        ))
+    for result in results:
+        print("")
+        print("%s (heaviest modules)" % result["target"])
+        for name, self_t in result["heaviest"]:
+            print("    %-40s %8.2fms" % (name, self_t))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
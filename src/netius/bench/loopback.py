@@ -0,0 +1,643 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import sys
+import json
+import time
+import errno
+import socket
+import struct
+import platform
+import tempfile
+import subprocess
+import collections
+
+import netius
+import netius.common
+import netius.servers
+
+HOST = "127.0.0.1"
+""" The loopback address where the servers are bound and
+to which the load generator connections are established """
+
+DURATION = 5.0
+""" The amount of time (in seconds) during which the load
+is going to be generated against each of the servers """
+
+CONNECTIONS = 16
+""" The number of (concurrent) connections that are going to
+be opened by the load generator against the server """
+
+PIPELINE = 16
+""" The number of requests in flight per connection for the
+pipelined (HTTP/1.1) scenario """
+
+STREAMS = 32
+""" The number of concurrent streams per connection for the
+multiplexed (HTTP/2) scenario """
+
+FILE_SIZE = 65536
+""" The size (in bytes) of the static file that is served
+under the file server scenario """
+
+MESSAGE_SIZE = 128
+""" The size (in bytes) of the messages that are sent and
+echoed back in the WebSockets scenario """
+
+STARTUP_TIMEOUT = 10.0
+""" The maximum amount of time (in seconds) to wait for a
+server process to start accepting connections """
+
+SCENARIOS = (
+    dict(name = "http", server = "hello", driver = "http"),
+    dict(name = "pipeline", server = "hello", driver = "http", depth = PIPELINE),
+    dict(name = "wsgi", server = "wsgi", driver = "http"),
+    dict(name = "http2", server = "http2", driver = "http2", depth = STREAMS),
+    dict(name = "file", server = "file", driver = "http", path = "/bench.bin"),
+    dict(name = "proxy", server = "proxy", driver = "http", backend = "hello"),
+    dict(name = "ws", server = "ws", driver = "ws")
+)
+""" The sequence of scenarios that are going to be run, each of
+them associates a server (started in a sub-process) with the
+protocol driver used by the load generator """
+
+class Driver(object):
+    """
+    Abstract protocol driver, responsible for the writing of the
+    requests and for the processing of the responses of a single
+    connection of the load generator, keeping the number of
+    requests in flight at the requested depth.
+    """
+
+    def __init__(self, generator, connection, depth = 1, path = "/"):
+        self.generator = generator
+        self.connection = connection
+        self.depth = depth
+        self.path = path
+        self.pending = collections.deque()
+
+    def start(self):
+        self.request(self.depth)
+
+    def data(self, data):
+        raise netius.NotImplemented("Missing implementation")
+
+    def request(self, count = 1):
+        if not self.generator.active: return
+        current = time.time()
+        for _index in netius.legacy.xrange(count):
+            self.pending.append(current)
+        self.connection.send(self.build(count))
+
+    def response(self, count = 1):
+        current = time.time()
+        for _index in netius.legacy.xrange(count):
+            self.generator.record(current - self.pending.popleft())
+
+    def build(self, count):
+        raise netius.NotImplemented("Missing implementation")
+
+class HTTPDriver(Driver):
+    """
+    Driver for HTTP/1.1 keep-alive connections, using the netius
+    parser for the responses, multiple requests are pipelined
+    (sent without waiting for the response) for depth above one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        Driver.__init__(self, *args, **kwargs)
+        self.message = netius.legacy.bytes(
+            "GET %s HTTP/1.1\r\nHost: %s\r\nConnection: keep-alive\r\n\r\n" %\
+            (self.path, HOST)
+        )
+        self.parser = netius.common.HTTPParser(self, type = netius.common.RESPONSE)
+        self.parser.bind("on_data", self.on_data)
+        self.count = 0
+
+    def data(self, data):
+        self.parser.parse(data)
+        if not self.count: return
+        count, self.count = self.count, 0
+        self.response(count)
+        self.request(count)
+
+    def build(self, count):
+        return self.message * count
+
+    def on_data(self):
+        self.count += 1
+
+class HTTP2Driver(Driver):
+    """
+    Driver for HTTP/2 connections under prior knowledge (clear
+    text), running multiple concurrent streams per connection,
+    the frames are handled at the lowest possible level so that
+    the load generator overhead is kept to a minimum.
+    """
+
+    WINDOW = 2147483647
+    """ The maximum flow control window, announced by the driver
+    so that the server is never blocked by flow control """
+
+    def __init__(self, *args, **kwargs):
+        import hpack
+        Driver.__init__(self, *args, **kwargs)
+        self.encoder = hpack.Encoder()
+        self.buffer = b""
+        self.stream = 1
+        self.streams = dict()
+        self.received = 0
+
+    def start(self):
+        settings = struct.pack("!HI", 0x04, self.WINDOW)
+        self.connection.send(
+            netius.common.HTTP2_PREFACE +\
+            self.frame(netius.common.SETTINGS, 0x00, 0, settings) +\
+            self.frame(
+                netius.common.WINDOW_UPDATE,
+                0x00,
+                0,
+                struct.pack("!I", self.WINDOW - 65535)
+            )
+        )
+        Driver.start(self)
+
+    def data(self, data):
+        data = self.buffer + data
+        replies = []
+        count = 0
+
+        while len(data) >= 9:
+            length, = struct.unpack("!I", b"\0" + data[:3])
+            if len(data) < 9 + length: break
+            type = netius.legacy.ord(data[3])
+            flags = netius.legacy.ord(data[4])
+            stream, = struct.unpack("!I", data[5:9])
+            stream &= 0x7fffffff
+            payload = data[9:9 + length]
+            data = data[9 + length:]
+
+            if type == netius.common.SETTINGS and not flags & 0x01:
+                replies.append(self.frame(netius.common.SETTINGS, 0x01, 0, b""))
+            elif type == netius.common.PING and not flags & 0x01:
+                replies.append(self.frame(netius.common.PING, 0x01, 0, payload))
+            elif type == netius.common.GOAWAY:
+                self.generator.failure()
+            elif type == netius.common.RST_STREAM:
+                self.streams.pop(stream, None)
+                self.generator.failure()
+
+            if type == netius.common.DATA: self.received += length
+            if type in (netius.common.DATA, netius.common.HEADERS) and flags & 0x01:
+                start = self.streams.pop(stream, None)
+                if start == None: continue
+                self.generator.record(time.time() - start)
+                count += 1
+
+        self.buffer = data
+
+        # in case half of the connection window has been consumed
+        # it's restored so that the server is never blocked
+        if self.received > self.WINDOW // 2:
+            replies.append(self.frame(
+                netius.common.WINDOW_UPDATE,
+                0x00,
+                0,
+                struct.pack("!I", self.received)
+            ))
+            self.received = 0
+
+        if replies: self.connection.send(b"".join(replies))
+        if count: self.request(count)
+
+    def request(self, count = 1):
+        if not self.generator.active: return
+        current = time.time()
+        frames = []
+        for _index in netius.legacy.xrange(count):
+            headers = self.encoder.encode([
+                (":method", "GET"),
+                (":scheme", "http"),
+                (":path", self.path),
+                (":authority", HOST)
+            ])
+            frames.append(self.frame(netius.common.HEADERS, 0x05, self.stream, headers))
+            self.streams[self.stream] = current
+            self.stream += 2
+        self.connection.send(b"".join(frames))
+
+    def frame(self, type, flags, stream, payload):
+        header = struct.pack("!I", len(payload))[1:]
+        return header + struct.pack("!BBI", type, flags, stream) + payload
+
+class WSDriver(Driver):
+    """
+    Driver for WebSockets connections, runs the handshake and
+    then sends (masked) messages that are expected to be echoed
+    back by the server, one response frame per message.
+    """
+
+    def __init__(self, *args, **kwargs):
+        Driver.__init__(self, *args, **kwargs)
+        self.message = netius.common.encode_ws(b"x" * MESSAGE_SIZE)
+        self.handshake = False
+        self.buffer = b""
+
+    def start(self):
+        self.connection.send(netius.legacy.bytes(
+            "GET %s HTTP/1.1\r\n" % self.path +\
+            "Host: %s\r\n" % HOST +\
+            "Upgrade: websocket\r\n" +\
+            "Connection: Upgrade\r\n" +\
+            "Sec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n" +\
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        ))
+
+    def data(self, data):
+        data = self.buffer + data
+
+        if not self.handshake:
+            index = data.find(b"\r\n\r\n")
+            if index == -1: self.buffer = data; return
+            data = data[index + 4:]
+            self.handshake = True
+            self.request(self.depth)
+
+        count = 0
+        while len(data) >= 2:
+            length = netius.legacy.ord(data[1]) & 127
+            offset = 2
+            if length == 126:
+                if len(data) < 4: break
+                length, = struct.unpack("!H", data[2:4])
+                offset = 4
+            elif length == 127:
+                if len(data) < 10: break
+                length, = struct.unpack("!Q", data[2:10])
+                offset = 10
+            if len(data) < offset + length: break
+            data = data[offset + length:]
+            count += 1
+
+        self.buffer = data
+        if not count: return
+        self.response(count)
+        self.request(count)
+
+    def build(self, count):
+        return self.message * count
+
+class Generator(netius.StreamClient):
+    """
+    Load generator built on top of the netius stream client,
+    opens the requested number of connections to the server
+    and drives each of them using a protocol driver, recording
+    the latency of every response received.
+    """
+
+    DRIVERS = dict(
+        http = HTTPDriver,
+        http2 = HTTP2Driver,
+        ws = WSDriver
+    )
+    """ The map associating the name of the driver with the
+    class that implements it """
+
+    def __init__(
+        self,
+        port,
+        driver = "http",
+        connections = CONNECTIONS,
+        duration = DURATION,
+        depth = 1,
+        path = "/",
+        *args,
+        **kwargs
+    ):
+        netius.StreamClient.__init__(self, thread = False, *args, **kwargs)
+        self.port = port
+        self.driver = self.DRIVERS[driver]
+        self.connections_c = connections
+        self.duration = duration
+        self.depth = depth
+        self.path = path
+        self.active = False
+        self.latencies = []
+        self.failures = 0
+        self.start_t = None
+        self.end_t = None
+
+    def run(self):
+        self.delay(self.begin)
+        self.start()
+        return self.result()
+
+    def begin(self):
+        self.active = True
+        self.start_t = time.time()
+        for _index in netius.legacy.xrange(self.connections_c):
+            self.connect(HOST, self.port)
+        self.delay(self.end, timeout = self.duration)
+
+    def end(self):
+        self.active = False
+        self.end_t = time.time()
+        self.stop()
+
+    def record(self, latency):
+        if not self.active: return
+        self.latencies.append(latency)
+
+    def failure(self):
+        if not self.active: return
+        self.failures += 1
+
+    def result(self):
+        duration = (self.end_t or time.time()) - (self.start_t or time.time())
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return dict(
+            requests = count,
+            failures = self.failures,
+            duration = duration,
+            rps = count / duration if duration else 0.0,
+            p50 = percentile(latencies, 0.50),
+            p99 = percentile(latencies, 0.99)
+        )
+
+    def on_connect(self, connection):
+        netius.StreamClient.on_connect(self, connection)
+        connection.driver = self.driver(
+            self,
+            connection,
+            depth = self.depth,
+            path = self.path
+        )
+        connection.driver.start()
+
+    def on_data(self, connection, data):
+        netius.StreamClient.on_data(self, connection, data)
+        connection.driver.data(data)
+
+    def on_connection_d(self, connection):
+        netius.StreamClient.on_connection_d(self, connection)
+        self.failure()
+
+def percentile(values, fraction):
+    if not values: return None
+    index = min(int(len(values) * fraction), len(values) - 1)
+    return values[index]
+
+def serve(name, port, argument = None):
+    """
+    Starts the server with the provided name in the current process,
+    blocking it until the server is stopped, meant to be called from
+    the sub-process created for each of the scenarios.
+
+    :type name: String
+    :param name: The name of the server to be started.
+    :type port: int
+    :param port: The (loopback) port where the server is bound.
+    :type argument: String
+    :param argument: The extra argument for the server, the base
+    path for the file server and the back-end URL for the proxy.
+    """
+
+    import logging
+
+    import netius.extra
+
+    def app(environ, start_response):
+        start_response("200 OK", [
+            ("Content-Type", "text/plain"),
+            ("Content-Length", "11")
+        ])
+        return [b"Hello World"]
+
+    kwargs = dict(level = logging.ERROR)
+    if name == "hello": server = netius.extra.HelloServer(**kwargs)
+    elif name == "http2": server = netius.extra.HelloServer(legacy = False, **kwargs)
+    elif name == "wsgi": server = netius.servers.WSGIServer(app = app, **kwargs)
+    elif name == "file": server = netius.extra.FileServer(base_path = argument, **kwargs)
+    elif name == "proxy": server = netius.extra.ReverseProxyServer(
+        hosts = dict(default = argument), **kwargs
+    )
+    elif name == "ws": server = netius.servers.EchoWSServer(**kwargs)
+    else: raise netius.NetiusError("Invalid server '%s'" % name)
+
+    server.keep_alive = True
+    server.serve(host = HOST, port = port)
+
+def spawn(name, argument = None):
+    # retrieves a free port from the operating system, notice that there's
+    # a small window for a race condition between the close and the bind
+    _socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    _socket.bind((HOST, 0))
+    port = _socket.getsockname()[1]
+    _socket.close()
+
+    # makes sure that the sub-process is able to import the exact same
+    # netius package that is being used by the current process
+    root = os.path.dirname(os.path.dirname(os.path.abspath(netius.__file__)))
+    path = os.environ.get("PYTHONPATH", None)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = root + os.pathsep + path if path else root
+
+    # creates the sub-process running the server, its error stream is
+    # redirected to a temporary file so that it may be used for reporting
+    script = "import netius.bench.loopback as loopback; loopback.serve(%r, %d, %r)" %\
+        (name, port, argument)
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        [sys.executable, "-c", script],
+        env = env,
+        stdout = stderr,
+        stderr = stderr
+    )
+    process.port = port
+    process.log = stderr
+
+    # waits until the server is accepting connections or until the
+    # process exits (failure), raising the exception in such case
+    timeout = time.time() + STARTUP_TIMEOUT
+    while time.time() < timeout:
+        if not process.poll() == None: break
+        try: socket.create_connection((HOST, port), 1.0).close()
+        except socket.error: time.sleep(0.05)
+        else: return process
+
+    kill(process)
+    raise netius.NetiusError("Failed to start '%s' (%s)" % (name, log_tail(process)))
+
+def log_tail(process):
+    process.log.seek(0)
+    message = netius.legacy.str(process.log.read(), errors = "replace")
+    message = message.strip().splitlines()[-1:] or ["timeout"]
+    return message[0]
+
+def kill(process):
+    if process.poll() == None: process.terminate()
+    try: process.wait()
+    except OSError as exception:
+        if not exception.errno == errno.ECHILD: raise
+
+def usage(process):
+    # tries to retrieve the CPU time (user and system) and the resident
+    # memory of the process from the proc file system, the values are
+    # only available under Linux (unset values returned otherwise)
+    try:
+        with open("/proc/%d/stat" % process.pid, "rb") as file:
+            values = file.read().rsplit(b")", 1)[1].split()
+        with open("/proc/%d/status" % process.pid, "rb") as file:
+            status = file.read()
+    except IOError:
+        return None, None
+
+    ticks = float(os.sysconf("SC_CLK_TCK"))
+    cpu = (int(values[11]) + int(values[12])) / ticks
+    rss = None
+    for line in status.splitlines():
+        if not line.startswith(b"VmRSS:"): continue
+        rss = int(line.split()[1]) * 1024
+    return cpu, rss
+
+def run_one(scenario, duration = DURATION, connections = CONNECTIONS):
+    name = scenario["name"]
+    processes = []
+    directory = None
+
+    result = dict(name = name, server = scenario["server"])
+
+    # in case the HTTP/2 scenario is requested and there's no support
+    # for it (missing hpack dependency) the scenario is skipped
+    if scenario["driver"] == "http2" and not netius.servers.HTTP2Server._has_hpack():
+        result.update(status = "skipped", message = "Missing hpack")
+        return result
+
+    try:
+        argument = None
+
+        # creates the extra resources required by the scenario, either
+        # the static file to be served or the back-end server process
+        if scenario["server"] == "file":
+            directory = tempfile.mkdtemp()
+            with open(os.path.join(directory, "bench.bin"), "wb") as file:
+                file.write(os.urandom(FILE_SIZE))
+            argument = directory
+        if "backend" in scenario:
+            backend = spawn(scenario["backend"])
+            processes.append(backend)
+            argument = "http://%s:%d" % (HOST, backend.port)
+
+        process = spawn(scenario["server"], argument = argument)
+        processes.append(process)
+
+        before = [usage(process)[0] or 0.0 for process in processes]
+
+        generator = Generator(
+            process.port,
+            driver = scenario["driver"],
+            connections = connections,
+            duration = duration,
+            depth = scenario.get("depth", 1),
+            path = scenario.get("path", "/")
+        )
+        result.update(generator.run())
+
+        # verifies that none of the server processes has exited during
+        # the run, as that would invalidate the complete set of results
+        for process in processes:
+            if process.poll() == None: continue
+            raise netius.NetiusError("Server exited (%s)" % log_tail(process))
+
+        # gathers the CPU time and the resident memory of the server
+        # processes (including the back-end ones), the CPU is reported
+        # as the fraction of one core used during the run
+        after = [usage(process) for process in processes]
+        if all(not rss == None for _cpu, rss in after):
+            cpu = sum(cpu for cpu, _rss in after) - sum(before)
+            result.update(
+                cpu = cpu / result["duration"],
+                rss = sum(rss for _cpu, rss in after)
+            )
+        else:
+            result.update(cpu = None, rss = None)
+        result.update(status = "ok")
+    except Exception as exception:
+        result.update(status = "error", message = str(exception))
+    finally:
+        for process in processes: kill(process)
+        if directory:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+    return result
+
+def run_all(scenarios = SCENARIOS):
+    duration = netius.conf("BENCH_DURATION", DURATION, cast = float)
+    connections = netius.conf("BENCH_CONNECTIONS", CONNECTIONS, cast = int)
+    names = netius.conf("BENCH_SCENARIOS", None, cast = list)
+
+    if names: scenarios = [scenario for scenario in scenarios if scenario["name"] in names]
+
+    return dict(
+        netius = netius.VERSION,
+        python = platform.python_version(),
+        platform = platform.platform(),
+        timestamp = time.time(),
+        duration = duration,
+        connections = connections,
+        scenarios = [
+            run_one(scenario, duration = duration, connections = connections)\
+            for scenario in scenarios
+        ]
+    )
+
+def report(results):
+    output = netius.conf("BENCH_OUTPUT", None)
+    data = json.dumps(results, indent = 4, sort_keys = True)
+    if not output: print(data); return
+    with open(output, "w") as file: file.write(data)
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
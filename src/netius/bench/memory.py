@@ -0,0 +1,107 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import gc
+import socket
+
+try: import tracemalloc
+except ImportError: tracemalloc = None
+
+import netius.servers
+
+CONNECTIONS = 2000
+""" The number of idle connections that are going to be opened
+for each of the protocol versions, the memory used by them is
+divided by this number to obtain the per connection value """
+
+def run_one(version, count = CONNECTIONS):
+    # creates the server (not serving) and its poll so that the
+    # connections may be opened as if they had been accepted
+    server = netius.servers.HTTP2Server(legacy = version == "http1")
+    server.encoding = netius.servers.http.PLAIN_ENCODING
+    server.poll = server.build_poll()
+    server.poll.open(timeout = 0)
+
+    # creates the pairs of sockets before tracing the memory as the
+    # (operating system) socket objects are not part of the measure
+    pairs = [socket.socketpair() for _index in range(count)]
+    connections = []
+    try:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            for local, _remote in pairs:
+                connection = server.build_connection(local, ("127.0.0.1", 0))
+                connection.open()
+                connections.append(connection)
+            gc.collect()
+            end = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+    finally:
+        for connection in connections: connection.close()
+        for local, remote in pairs: local.close(); remote.close()
+        server.cleanup()
+
+    return dict(
+        name = version,
+        count = count,
+        total = end - start,
+        per_connection = (end - start) // count
+    )
+
+def run_all(count = CONNECTIONS):
+    if not tracemalloc: return []
+    return [run_one(version, count = count) for version in ("http1", "http2")]
+
+def report(results):
+    print("%-8s %8s %12s %16s" % ("name", "count", "total", "per connection"))
+    for result in results:
+        print("%-8s %8d %10dKB %14dB" % (
+            result["name"],
+            result["count"],
+            result["total"] // 1024,
+            result["per_connection"]
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
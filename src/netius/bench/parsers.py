@@ -0,0 +1,416 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import gc
+import time
+import struct
+
+try: import tracemalloc
+except ImportError: tracemalloc = None
+
+import netius
+import netius.common
+import netius.clients
+import netius.servers
+
+TARGET = 0.25
+""" The minimum amount of time (in seconds) that each of the
+cases is going to be run for, the number of iterations is
+doubled until this value is reached """
+
+SPLITS = (1, 3, 7, 17, 61, 509)
+""" The sequence of (awkward) chunk sizes used to split the
+data of the split cases, cycled until the data is consumed,
+simulating the fragmentation of the network reads """
+
+BROWSER_REQUEST = b"GET /assets/app.js?v=1.17.58 HTTP/1.1\r\n\
+Host: www.example.com\r\n\
+Connection: keep-alive\r\n\
+sec-ch-ua: \"Chromium\";v=\"122\", \"Not(A:Brand\";v=\"24\", \"Google Chrome\";v=\"122\"\r\n\
+sec-ch-ua-mobile: ?0\r\n\
+User-Agent: Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36\r\n\
+sec-ch-ua-platform: \"Linux\"\r\n\
+Accept: */*\r\n\
+Sec-Fetch-Site: same-origin\r\n\
+Sec-Fetch-Mode: no-cors\r\n\
+Sec-Fetch-Dest: script\r\n\
+Referer: https://www.example.com/dashboard\r\n\
+Accept-Encoding: gzip, deflate, br\r\n\
+Accept-Language: en-US,en;q=0.9,pt;q=0.8\r\n\
+Cookie: session=6f1d3c9a8b7e4f2a9c1d0e5b7a3f8c2d; theme=dark; _ga=GA1.2.1234567890.1700000000\r\n\
+If-None-Match: \"5d8c72a5edda8d6a\"\r\n\
+\r\n"
+""" A realistic set of request headers as sent by a browser
+for the retrieval of a static (script) resource """
+
+RFC822_MESSAGE = b"Return-Path: <sender@example.com>\r\n\
+Received: from mail.example.com (mail.example.com [192.0.2.10])\r\n\
+\tby mx.example.org with ESMTPS id 5a3f8c2d\r\n\
+\tfor <receiver@example.org>; Wed, 1 Jan 2014 00:00:00 +0000\r\n\
+DKIM-Signature: v=1; a=rsa-sha256; c=simple/simple; d=example.com; s=default;\r\n\
+\th=from:to:subject:date; bh=Lc+kSvUk2dTm3zTXEjmUqTNhnT6EM3Lzx0Cw6fo0VvM=;\r\n\
+\tb=VGhpcyBpcyBub3QgYSByZWFsIHNpZ25hdHVyZSBqdXN0IGEgYmVuY2htYXJr\r\n\
+From: Sender <sender@example.com>\r\n\
+To: Receiver <receiver@example.org>\r\n\
+Subject: Benchmark message for the rfc822 parser\r\n\
+Date: Wed, 1 Jan 2014 00:00:00 +0000\r\n\
+Message-ID: <5a3f8c2d@example.com>\r\n\
+MIME-Version: 1.0\r\n\
+Content-Type: text/plain; charset=utf-8\r\n\
+\r\n" + b"Hello World, this is the body of the message.\r\n" * 16
+""" An email message with continuation (folded) headers as
+parsed by the SMTP related infra-structure """
+
+def http_request(data, splits = None):
+    messages = []
+    parser = netius.common.HTTPParser(None, type = netius.common.REQUEST)
+    parser.bind("on_data", lambda: messages.append(True))
+    for chunk in split(data, splits): parser.parse(chunk)
+    parser.destroy()
+    return len(messages)
+
+def http_split(data):
+    return http_request(data, splits = SPLITS)
+
+def http_proxy(data, lazy = False):
+    # emulates the handling of the headers of the requests by the
+    # reverse proxy, reading the routing ones, setting the forwarding
+    # ones and serializing all of them for the upstream request
+    buffers = []
+    parser = netius.common.HTTPParser(
+        None,
+        type = netius.common.REQUEST,
+        lazy = lazy
+    )
+
+    def on_headers():
+        headers = parser.headers
+        host = headers.get("host", "127.0.0.1")
+        address = headers.get("x-forwarded-for", "127.0.0.1")
+        headers["x-real-ip"] = address
+        headers["x-client-ip"] = address
+        headers["x-forwarded-for"] = address
+        headers["x-forwarded-proto"] = "http"
+        headers["x-forwarded-port"] = "8080"
+        headers["x-forwarded-host"] = host
+        buffer = ["%s %s %s\r\n" % (parser.method_s, parser.path_s, parser.version_s)]
+        for key, value in netius.legacy.iteritems(dict(headers)):
+            key = netius.common.header_up(key)
+            if not isinstance(value, list): value = (value,)
+            for _value in value:
+                _value = netius.legacy.ascii(_value)
+                buffer.append("%s: %s\r\n" % (key, _value))
+        buffer.append("\r\n")
+        buffers.append("".join(buffer))
+
+    parser.bind("on_headers", on_headers)
+    parser.parse(data)
+    parser.destroy()
+    return len(buffers)
+
+def http_proxy_lazy(data):
+    return http_proxy(data, lazy = True)
+
+def http_route(data, lazy = False):
+    # emulates the routing of the requests (eg: by host) where only
+    # a small set of the headers is read and no forwarding occurs
+    routes = []
+    parser = netius.common.HTTPParser(
+        None,
+        type = netius.common.REQUEST,
+        lazy = lazy
+    )
+    parser.bind("on_headers", lambda: routes.append(parser.headers.get("host", None)))
+    parser.parse(data)
+    parser.destroy()
+    return len(routes)
+
+def http_route_lazy(data):
+    return http_route(data, lazy = True)
+
+def http2_frames(data, splits = SPLITS):
+    frames = []
+    parser = netius.common.HTTP2Parser(HTTP2Owner())
+    parser.bind("on_frame", lambda: frames.append(True))
+    for chunk in split(data, splits): parser.parse(chunk)
+    parser.destroy()
+    return len(frames)
+
+def ws_decode(data):
+    count = 0
+    while data:
+        _decoded, data = netius.common.decode_ws(data)
+        count += 1
+    return count
+
+def ws_encode(data):
+    netius.common.encode_ws(data, mask = True)
+    return 1
+
+def rfc822(data):
+    netius.common.rfc822_parse(data)
+    return 1
+
+def bdecode(data):
+    netius.common.bdecode(data)
+    return 1
+
+def dns(data):
+    response = netius.clients.DNSResponse(data)
+    response.parse()
+    return 1
+
+def dhcp(data):
+    request = netius.servers.DHCPRequest(data)
+    request.parse()
+    return 1
+
+def tftp(data):
+    request = netius.servers.TFTPRequest(data, netius.servers.tftp.TFTPSession(None))
+    request.parse()
+    return 1
+
+class HTTP2Owner(object):
+    """
+    Minimal connection like object that provides the values
+    required by the HTTP/2 parser for the control frames.
+    """
+
+    def __init__(self):
+        self.settings = dict(netius.common.HTTP2_SETTINGS_OPTIMAL)
+        self.window = netius.common.HTTP2_WINDOW
+
+def split(data, splits = None):
+    if not splits: return [data]
+    chunks = []
+    index = 0
+    offset = 0
+    while offset < len(data):
+        size = splits[index % len(splits)]
+        chunks.append(data[offset:offset + size])
+        offset += size
+        index += 1
+    return chunks
+
+def frame(type, flags, payload, stream = 0x00):
+    header = struct.pack("!I", len(payload))[1:]
+    return header + struct.pack("!BBI", type, flags, stream) + payload
+
+def build_chunked(count = 64, size = 1024):
+    buffer = [b"POST /upload HTTP/1.1\r\nHost: www.example.com\r\n\
+Content-Type: application/octet-stream\r\nTransfer-Encoding: chunked\r\n\r\n"]
+    for _index in netius.legacy.xrange(count):
+        buffer.append(netius.legacy.bytes("%x\r\n" % size))
+        buffer.append(b"x" * size + b"\r\n")
+    buffer.append(b"0\r\n\r\n")
+    return b"".join(buffer)
+
+def build_pipelined(size = 65536):
+    # builds a buffer with as many (pipelined) requests as the ones
+    # that fit in the provided size, simulating a single socket read
+    # from a client that pipelines its requests, half of them with
+    # a small payload (to be parsed as the message state)
+    buffer = []
+    length = 0
+    post = b"POST /api/events HTTP/1.1\r\nHost: www.example.com\r\n\
+Content-Type: application/json\r\nContent-Length: 27\r\n\r\n{\"event\":\"click\",\"id\":42}"
+    while True:
+        request = post if len(buffer) % 2 else BROWSER_REQUEST
+        if length + len(request) > size: break
+        buffer.append(request)
+        length += len(request)
+    return b"".join(buffer)
+
+def build_frames(count = 16):
+    buffer = []
+    for index in netius.legacy.xrange(count):
+        buffer.append(frame(netius.common.SETTINGS, 0x00, struct.pack("!HI", 0x03, 100) * 3))
+        buffer.append(frame(netius.common.PING, 0x00, struct.pack("!Q", index)))
+        buffer.append(frame(netius.common.WINDOW_UPDATE, 0x00, struct.pack("!I", 1024)))
+        buffer.append(frame(netius.common.SETTINGS, 0x01, b""))
+    return b"".join(buffer)
+
+def build_ws(count = 4, size = 65536):
+    payload = b"x" * size
+    return b"".join(netius.common.encode_ws(payload, mask = True) for _index in range(count))
+
+def build_torrent(files = 32, pieces = 256):
+    return netius.common.bencode({
+        "announce" : "http://tracker.example.com:6969/announce",
+        "created by" : "netius",
+        "creation date" : 1388534400,
+        "info" : {
+            "name" : "benchmark",
+            "piece length" : 262144,
+            "pieces" : "\x12\x34\x56\x78\x9a" * 4 * pieces,
+            "files" : [
+                dict(length = 1048576 * index, path = ["directory", "file%d.bin" % index])\
+                for index in netius.legacy.xrange(files)
+            ]
+        }
+    })
+
+def build_dns(count = 8):
+    # builds the header and the query section of the response, the
+    # name of the query is the target for the compression pointers
+    # of the answers (offset twelve, right after the header)
+    buffer = [struct.pack("!HBBHHHH", 0x1234, 0x81, 0x80, 1, count + 1, 0, 0)]
+    buffer.append(b"\x03www\x07example\x03com\x00" + struct.pack("!HH", 0x01, 0x01))
+
+    # adds a canonical name answer whose value is compressed using
+    # a pointer to the domain part of the query name, followed by
+    # the address answers pointing (compression) to the query name
+    cname = b"\x03cdn\xc0\x10"
+    buffer.append(b"\xc0\x0c" + struct.pack("!HHIH", 0x05, 0x01, 300, len(cname)) + cname)
+    for index in netius.legacy.xrange(count):
+        address = struct.pack("!BBBB", 192, 0, 2, index + 1)
+        buffer.append(b"\xc0\x0c" + struct.pack("!HHIH", 0x01, 0x01, 300, 4) + address)
+    return b"".join(buffer)
+
+def build_dhcp():
+    header = struct.pack(
+        "!BBBBIHHIIII2Q64s128s",
+        1, 1, 6, 0, 0x3903f326, 0, 0x8000, 0, 0, 0, 0,
+        0x00163e5a3f8c << 16, 0, b"", b""
+    )
+    options = b"\x35\x01\x01" +\
+        b"\x32\x04\xc0\x00\x02\x64" +\
+        b"\x37\x07\x01\x03\x06\x0c\x0f\x1c\x2a" +\
+        b"\x3d\x07\x01\x00\x16\x3e\x5a\x3f\x8c" +\
+        b"\x0c\x09benchmark" +\
+        b"\xff"
+    return header + b"\x63\x82\x53\x63" + options
+
+def build_tftp():
+    return b"\x00\x01" + b"pxelinux.0\x00octet\x00blksize\x001468\x00tsize\x000\x00"
+
+def cases():
+    pipelined = BROWSER_REQUEST * 16
+    return (
+        ("http.browser", http_request, BROWSER_REQUEST),
+        ("http.chunked", http_request, build_chunked()),
+        ("http.pipelined", http_split, pipelined),
+        ("http.read64k", http_request, build_pipelined()),
+        ("http.proxy", http_proxy, pipelined),
+        ("http.proxy.lazy", http_proxy_lazy, pipelined),
+        ("http.route", http_route, pipelined),
+        ("http.route.lazy", http_route_lazy, pipelined),
+        ("http2.frames", http2_frames, build_frames()),
+        ("ws.decode", ws_decode, build_ws()),
+        ("ws.encode", ws_encode, b"x" * 65536),
+        ("rfc822", rfc822, RFC822_MESSAGE),
+        ("bdecode", bdecode, build_torrent()),
+        ("dns", dns, build_dns()),
+        ("dhcp", dhcp, build_dhcp()),
+        ("tftp", tftp, build_tftp())
+    )
+
+def measure(callable, data, target = TARGET):
+    # runs the callable an increasing number of times until the
+    # target time is reached, the garbage collector is disabled so
+    # that its (unrelated) pauses do not pollute the results
+    iterations = 1
+    gc.collect()
+    gc.disable()
+    try:
+        while True:
+            start = time.time()
+            for _index in netius.legacy.xrange(iterations):
+                messages = callable(data)
+            elapsed = time.time() - start
+            if elapsed >= target: break
+            iterations *= 2
+    finally:
+        gc.enable()
+    return elapsed, iterations, messages
+
+def allocations(callable, data):
+    # measures the peak of memory allocated during the parsing of
+    # the data (transient) and the memory that remains allocated
+    # after it, even after a collection (retained), both values
+    # are only available when the tracemalloc module is present
+    if not tracemalloc: return None, None
+    callable(data)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        callable(data)
+        _current, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        retained, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+def run_one(name, callable, data, target = TARGET):
+    elapsed, iterations, messages = measure(callable, data, target = target)
+    peak, retained = allocations(callable, data)
+    size = len(data)
+    return dict(
+        name = name,
+        size = size,
+        messages = messages,
+        ns_byte = elapsed * 1e9 / (iterations * size),
+        us_message = elapsed * 1e6 / (iterations * messages),
+        peak = peak // messages if not peak == None else None,
+        retained = retained // messages if not retained == None else None
+    )
+
+def run_all(target = TARGET):
+    return [run_one(name, callable, data, target = target) for name, callable, data in cases()]
+
+def report(results):
+    print("%-16s %8s %6s %10s %12s %10s %10s" % (
+        "name", "size", "msgs", "ns/byte", "us/message", "peak", "retained"
+    ))
+    for result in results:
+        print("%-16s %8d %6d %10.2f %12.2f %10s %10s" % (
+            result["name"],
+            result["size"],
+            result["messages"],
+            result["ns_byte"],
+            result["us_message"],
+            "-" if result["peak"] == None else "%dB" % result["peak"],
+            "-" if result["retained"] == None else "%dB" % result["retained"]
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
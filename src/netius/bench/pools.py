@@ -0,0 +1,165 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import io
+import time
+
+import netius
+
+COUNT = 20000
+""" The number of work items submitted to each of the pools,
+each of them resulting in a callback in the event loop thread """
+
+def run_task(count = COUNT, eager = False):
+    # creates the event loop and the state that is going to be
+    # shared between the worker threads and the event loop, the
+    # callbacks are counted on the event loop thread (no locking)
+    loop = netius.Base()
+    state = dict(done = 0, wakeups = 0, ticks = 0)
+
+    def on_done():
+        state["done"] += 1
+        if not state["done"] == count: return
+        state["ticks"] = loop._lid - state["ticks"]
+        loop.stop()
+
+    # the result callback is called from the worker thread, so the
+    # completion is scheduled in the event loop using the safe delay,
+    # under the eager mode the legacy behaviour is emulated, where
+    # every safe delay operation awakes the event loop
+    def on_result(result):
+        if eager:
+            loop.delay_s(on_done, wakeup = False)
+            loop.wakeup()
+        else:
+            loop.delay_s(on_done)
+
+    def submit():
+        wrap(loop.npool, state)
+        state["ticks"] = loop._lid
+        for _index in range(count):
+            loop.texecute(int, callback = on_result)
+
+    return run(loop, submit, state, count)
+
+def run_file(count = COUNT, eager = False):
+    # creates the event loop and an in memory file from which the
+    # chunks are going to be read by the file pool threads, the read
+    # callbacks are called by the event loop (files operation)
+    loop = netius.Base()
+    state = dict(done = 0, wakeups = 0, ticks = 0)
+    file = io.BytesIO(b"x" * count * 16)
+
+    def on_read(data):
+        state["done"] += 1
+        if not state["done"] == count: return
+        state["ticks"] = loop._lid - state["ticks"]
+        loop.stop()
+
+    def submit():
+        loop.fensure()
+        if eager: eagerize(loop.fpool)
+        wrap(loop.fpool, state)
+        state["ticks"] = loop._lid
+        for _index in range(count):
+            loop.fread(file, 16, data = on_read)
+
+    return run(loop, submit, state, count)
+
+def run(loop, submit, state, count):
+    loop.delay(submit)
+    start = time.time()
+    try: loop.start()
+    finally: loop.close()
+    elapsed = time.time() - start
+    return dict(
+        callbacks = state["done"],
+        elapsed = elapsed,
+        rate = state["done"] / elapsed,
+        wakeups = state["wakeups"],
+        ticks = state["ticks"]
+    )
+
+def wrap(pool, state):
+    # wraps the notify operation of the pool so that the number of
+    # wakeups (event fd writes) performed by the threads is counted
+    notify = pool.notify
+    def _notify():
+        state["wakeups"] += 1
+        notify()
+    pool.notify = _notify
+
+def eagerize(pool):
+    # replaces the push event operation of the pool with the legacy
+    # one, where the event fd is notified for every single event
+    def push_event(event):
+        pool.event_lock.acquire()
+        try: pool.events.append(event)
+        finally: pool.event_lock.release()
+        pool.notify()
+    pool.push_event = push_event
+
+def run_all(count = COUNT):
+    results = []
+    for name, method in (("task", run_task), ("file", run_file)):
+        for mode, eager in (("eager", True), ("pending", False)):
+            result = method(count = count, eager = eager)
+            result.update(name = name, mode = mode)
+            results.append(result)
+    return results
+
+def report(results):
+    print("%-6s %-8s %10s %10s %14s %10s %10s" % (
+        "name", "mode", "callbacks", "elapsed", "callbacks/s", "wakeups", "ticks"
+    ))
+    for result in results:
+        print("%-6s %-8s %10d %8.2fms %14.0f %10d %10d" % (
+            result["name"],
+            result["mode"],
+            result["callbacks"],
+            result["elapsed"] * 1000.0,
+            result["rate"],
+            result["wakeups"],
+            result["ticks"]
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
@@ -0,0 +1,188 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import gc
+import time
+import heapq
+import random
+
+import netius
+
+SIZES = (10000, 100000)
+""" The various numbers of pending timers under which
+the timer structures are going to be benchmarked """
+
+VERIFY_COUNT = 1000
+""" The number of verified (duplicate checked) insertions
+to be performed on top of the pending timers, should
+be small as the heap version is linear per insertion """
+
+class HeapTimers(object):
+    """
+    Reference implementation of the (legacy) heap based delayed
+    structures, using two parallel heaps where the duplicate
+    verification is performed with a linear scan.
+    """
+
+    def __init__(self):
+        self.delayed = []
+        self.delayed_o = []
+        self.did = 0
+
+    def schedule(self, callable, target, lid, verify = False):
+        callable_o = netius.legacy.orderable((target, callable))
+        if verify and callable_o in self.delayed_o: return None
+        options = [True]
+        callable_t = (target, self.did, callable, lid, options)
+        callable_t = netius.legacy.orderable(callable_t)
+        heapq.heappush(self.delayed, callable_t)
+        heapq.heappush(self.delayed_o, callable_o)
+        self.did += 1
+        return callable_t
+
+    def cancel(self, callable_t):
+        callable_t[4][0] = False
+
+    def run(self, current):
+        count = 0
+        while self.delayed:
+            callable_t = heapq.heappop(self.delayed)
+            heapq.heappop(self.delayed_o)
+            target, _did, method, _lid, options = callable_t
+            if target > current:
+                heapq.heappush(self.delayed, callable_t)
+                heapq.heappush(self.delayed_o, (target, method))
+                break
+            if not options[0]: continue
+            method()
+            count += 1
+        return count
+
+class WheelTimers(object):
+    """
+    Adapter around the timing wheel so that it exposes the same
+    interface as the reference heap implementation.
+    """
+
+    def __init__(self):
+        self.wheel = netius.TimerWheel()
+
+    def schedule(self, callable, target, lid, verify = False):
+        return self.wheel.schedule(callable, target, lid, verify = verify)
+
+    def cancel(self, timer):
+        timer.cancel()
+
+    def run(self, current):
+        count = 0
+        self.wheel.harvest(current)
+        while True:
+            timer = self.wheel.pop(-1)
+            if not timer: break
+            timer.callable()
+            count += 1
+        return count
+
+def measure(callable, *args):
+    gc.collect()
+    start = time.time()
+    result = callable(*args)
+    return time.time() - start, result
+
+def run_one(factory, size, seed = 0):
+    random.seed(seed)
+    current = time.time()
+    callable = lambda: None
+    timers = factory()
+    targets = [current + random.random() * 300.0 for _index in range(size)]
+
+    def schedule():
+        return [timers.schedule(callable, target, 0) for target in targets]
+
+    def verify():
+        for _index in range(VERIFY_COUNT):
+            flush = lambda: None
+            timers.schedule(flush, -1, 0, verify = True)
+
+    def cancel(handles):
+        for handle in handles[::2]: timers.cancel(handle)
+
+    def run():
+        return timers.run(current + 300.0)
+
+    schedule_t, handles = measure(schedule)
+    verify_t, _result = measure(verify)
+    cancel_t, _result = measure(cancel, handles)
+    run_t, count = measure(run)
+
+    return dict(
+        schedule = schedule_t,
+        verify = verify_t,
+        cancel = cancel_t,
+        run = run_t,
+        count = count
+    )
+
+def run_all(sizes = SIZES):
+    results = []
+    for size in sizes:
+        for name, factory in (("heap", HeapTimers), ("wheel", WheelTimers)):
+            result = run_one(factory, size)
+            result.update(name = name, size = size)
+            results.append(result)
+    return results
+
+def report(results):
+    print("%-6s %8s %10s %10s %10s %10s" % (
+        "name", "size", "schedule", "verify", "cancel", "run"
+    ))
+    for result in results:
+        print("%-6s %8d %9.2fms %9.2fms %9.2fms %9.2fms" % (
+            result["name"],
+            result["size"],
+            result["schedule"] * 1000.0,
+            result["verify"] * 1000.0,
+            result["cancel"] * 1000.0,
+            result["run"] * 1000.0
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+
+try: import tracemalloc
+except ImportError: tracemalloc = None
+
+import netius.common
+
+REQUEST = b"GET /hello HTTP/1.1\r\n\
+Host: localhost\r\n\
+User-Agent: netius-bench/1.0\r\n\
+Accept: */*\r\n\
+Connection: keep-alive\r\n\
+\r\n"
+""" The (simple) request that is going to be pipelined multiple
+times into a single receive buffer for the parsing """
+
+PIPELINE = 16
+""" The number of requests pipelined in each receive buffer,
+the buffer is parsed at once (single parse call) """
+
+ROUNDS = 2000
+""" The number of receive buffers that are going to be parsed
+for each of the data modes (bytes and memoryview) """
+
+def build(pipeline = PIPELINE):
+    buffer = bytearray(REQUEST * pipeline)
+    return dict(
+        bytes = lambda: bytes(buffer),
+        views = lambda: memoryview(buffer)
+    )
+
+def run_one(factory, rounds = ROUNDS):
+    parser = netius.common.HTTPParser(
+        None,
+        type = netius.common.REQUEST,
+        store = True
+    )
+    try:
+        start = time.time()
+        for _index in range(rounds): parser.parse(factory())
+        elapsed = time.time() - start
+    finally:
+        parser.clear()
+    return elapsed
+
+def allocated(factory, rounds = ROUNDS):
+    # measures the peak of memory allocated while running the parse
+    # operations, this is relevant as the copies of the data are
+    # temporary (not retained) and so would not be visible otherwise
+    if not tracemalloc: return -1
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        parser = netius.common.HTTPParser(
+            None,
+            type = netius.common.REQUEST,
+            store = True
+        )
+        data = factory()
+        current = tracemalloc.get_traced_memory()[0]
+        parser.parse(data)
+        peak = tracemalloc.get_traced_memory()[1]
+        parser.clear()
+    finally:
+        tracemalloc.stop()
+    return peak - current
+
+def run_all(pipeline = PIPELINE, rounds = ROUNDS):
+    factories = build(pipeline = pipeline)
+    results = []
+    for name in ("bytes", "views"):
+        factory = factories[name]
+        elapsed = run_one(factory, rounds = rounds)
+        requests = rounds * pipeline
+        results.append(dict(
+            name = name,
+            pipeline = pipeline,
+            elapsed = elapsed,
+            per_request = elapsed / float(requests),
+            peak = allocated(factory)
+        ))
+    return results
+
+def report(results):
+    print("%-8s %8s %12s %14s %12s" % (
+        "name", "pipeline", "elapsed", "per request", "peak"
+    ))
+    for result in results:
+        print("%-8s %8d %10.2fms %12.2fus %10dB" % (
+            result["name"],
+            result["pipeline"],
+            result["elapsed"] * 1000.0,
+            result["per_request"] * 1000000.0,
+            result["peak"]
+        ))
+
+if __name__ == "__main__":
+    report(run_all())
+else:
+    __path__ = []
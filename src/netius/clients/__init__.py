@@ -34,24 +34,17 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
-from . import apn
-from . import dht
-from . import dns
-from . import http
-from . import mjpg
-from . import raw
-from . import smtp
-from . import ssdp
-from . import torrent
-from . import ws
-
-from .apn import APNProtocol, APNClient
-from .dht import DHTRequest, DHTResponse, DHTClient
-from .dns import DNSRequest, DNSResponse, DNSProtocol, DNSClient
-from .http import HTTPProtocol, HTTPClient
-from .mjpg import MJPGProtocol, MJPGClient
-from .raw import RawProtocol, RawClient
-from .smtp import SMTPConnection, SMTPClient
-from .ssdp import SSDPProtocol, SSDPClient
-from .torrent import CHOKED, UNCHOKED, TorrentConnection, TorrentClient
-from .ws import WSProtocol, WSClient
+from ..base import legacy
+
+legacy.lazy(globals(), (
+    ("apn", ("APNProtocol", "APNClient")),
+    ("dht", ("DHTRequest", "DHTResponse", "DHTClient")),
+    ("dns", ("DNSRequest", "DNSResponse", "DNSProtocol", "DNSClient")),
+    ("http", ("HTTPProtocol", "HTTPClient")),
+    ("mjpg", ("MJPGProtocol", "MJPGClient")),
+    ("raw", ("RawProtocol", "RawClient")),
+    ("smtp", ("SMTPConnection", "SMTPClient")),
+    ("ssdp", ("SSDPProtocol", "SSDPClient")),
+    ("torrent", ("CHOKED", "UNCHOKED", "TorrentConnection", "TorrentClient")),
+    ("ws", ("WSProtocol", "WSClient"))
+))
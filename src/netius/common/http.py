@@ -38,6 +38,7 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import re
+import sys
 import tempfile
 
 import netius
@@ -53,6 +54,13 @@ possible to avoid memory starvation problems, this is a
 default value for the parser and may be overriden using
 the dedicated parameter value in the constructor """
 
+HEADERS_LIMIT = 65536
+""" The maximum size (in bytes) of the block of headers
+of a message, in case this value is exceeded before the
+end of the headers is found the message is considered
+invalid, avoiding unbounded memory usage from clients
+that keep sending headers (eg: slowloris attacks) """
+
 REQUEST = 1
 """ The HTTP request message indicator, should be
 used when identifying the HTTP request messages """
@@ -173,6 +181,186 @@ HEADER_NAME_REGEX = re.compile(r"^[\!\#\$\%\&'\*\+\-\.\^\_\`\~0-9a-zA-Z]+$")
 header naming tokens, so that only the valid names are captured
 avoiding possible security issues, should be compliant with RFC 7230 """
 
+TOKEN_REGEX = {
+    b"\n" : re.compile(b"\n"),
+    b"\r\n\r\n" : re.compile(b"\r\n\r\n")
+}
+""" The map associating the tokens searched by the parser with
+the pre-compiled regular expressions used for their search in
+memoryview based data (that has no find operation) """
+
+HEADER_NAMES = (
+    "accept",
+    "accept-charset",
+    "accept-encoding",
+    "accept-language",
+    "accept-ranges",
+    "age",
+    "authorization",
+    "cache-control",
+    "connection",
+    "content-disposition",
+    "content-encoding",
+    "content-language",
+    "content-length",
+    "content-range",
+    "content-type",
+    "cookie",
+    "date",
+    "dnt",
+    "etag",
+    "expect",
+    "expires",
+    "host",
+    "if-match",
+    "if-modified-since",
+    "if-none-match",
+    "if-range",
+    "if-unmodified-since",
+    "keep-alive",
+    "last-modified",
+    "location",
+    "origin",
+    "pragma",
+    "proxy-authorization",
+    "proxy-connection",
+    "range",
+    "referer",
+    "sec-ch-ua",
+    "sec-ch-ua-mobile",
+    "sec-ch-ua-platform",
+    "sec-fetch-dest",
+    "sec-fetch-mode",
+    "sec-fetch-site",
+    "sec-fetch-user",
+    "sec-websocket-accept",
+    "sec-websocket-extensions",
+    "sec-websocket-key",
+    "sec-websocket-protocol",
+    "sec-websocket-version",
+    "server",
+    "set-cookie",
+    "te",
+    "transfer-encoding",
+    "upgrade",
+    "upgrade-insecure-requests",
+    "user-agent",
+    "vary",
+    "via",
+    "x-client-ip",
+    "x-forwarded-for",
+    "x-forwarded-host",
+    "x-forwarded-port",
+    "x-forwarded-proto",
+    "x-real-ip",
+    "x-requested-with"
+)
+""" The sequence of the most common header names (in lower
+case), these are the ones that are resolved directly from
+the table of names, avoiding their normalization """
+
+intern = getattr(sys, "intern", None) or intern
+
+HEADER_TABLE = dict(
+    [(netius.legacy.bytes(name), intern(name)) for name in HEADER_NAMES] +\
+    [(netius.legacy.bytes(util.header_up(name)), intern(name)) for name in HEADER_NAMES]
+)
+""" The table associating the raw (bytes) common header names,
+both in lower and in canonical case, with their pre-interned
+(and already validated) lower cased string representation """
+
+HEADER_SPACES = frozenset(bytearray(b"\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f\x85\xa0"))
+""" The set of (byte) values that are considered spaces for
+the validation of a (decoded) header value, apart from the
+simple space, notice that this set is the one of the strip
+operation for a (latin-1 decoded) string value """
+
+class HeadersView(dict):
+    """
+    Dictionary compatible view over the raw (bytes) block of
+    headers of an HTTP message, the values of the headers are
+    kept as offsets (slices) into the raw block and are only
+    decoded (and cached) on their first access.
+
+    This avoids the decoding of the headers that are never
+    accessed, eg: a reverse proxy that only reads a couple of
+    headers from the request, forwarding the remaining ones.
+    """
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw = b""):
+        dict.__init__(self)
+        self.raw = raw
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) == str: return value
+        return self._decode(key, value)
+
+    def __iter__(self):
+        # overrides the iteration so that the dictionary merge
+        # operations (eg: dict(headers)) use the item access and
+        # not the (raw) internal values of the dictionary
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self.decode_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.decode_all()
+        return dict.__repr__(self)
+
+    def get(self, key, default = None):
+        value = dict.get(self, key, default)
+        return self._decode(key, value)
+
+    def pop(self, key, *args):
+        value = dict.pop(self, key, *args)
+        return self._decode(None, value)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        return key, self._decode(None, value)
+
+    def setdefault(self, key, default = None):
+        if key in self: return self[key]
+        self[key] = default
+        return default
+
+    def items(self):
+        self.decode_all()
+        return dict.items(self)
+
+    def values(self):
+        self.decode_all()
+        return dict.values(self)
+
+    def copy(self):
+        self.decode_all()
+        return dict.copy(self)
+
+    def decode_all(self):
+        for key, value in dict.items(self): self._decode(key, value)
+
+    def _decode(self, key, value):
+        # decodes the provided value in case it's a slice (offset) or
+        # a sequence of slices (multiple headers), caching the decoded
+        # value in the dictionary for the next accesses
+        if type(value) == slice: value = self._str(value)
+        elif type(value) == list and slice in [type(item) for item in value]:
+            value = [self._str(item) if type(item) == slice else item for item in value]
+        else: return value
+        if not key == None: dict.__setitem__(self, key, value)
+        return value
+
+    def _str(self, offset):
+        return self.raw[offset].decode("latin-1", "replace")
+
 class HTTPParser(parser.Parser):
     """
     Parser object for the HTTP format, should be able to
@@ -188,6 +376,9 @@ class HTTPParser(parser.Parser):
         "type",
         "store",
         "file_limit",
+        "headers_limit",
+        "lazy",
+        "streaming",
         "state",
         "buffer",
         "headers",
@@ -198,6 +389,8 @@ class HTTPParser(parser.Parser):
         "keep_alive",
         "line_s",
         "headers_s",
+        "headers_b",
+        "headers_o",
         "method_s",
         "path_s",
         "version_s",
@@ -217,17 +410,71 @@ class HTTPParser(parser.Parser):
         "chunk_e"
     )
 
+    VIEWS = netius.legacy.PYTHON_3
+
+    __slots__ = (
+        "type",
+        "store",
+        "file_limit",
+        "headers_limit",
+        "lazy",
+        "streaming",
+        "state",
+        "states",
+        "state_l",
+        "buffer",
+        "headers",
+        "message",
+        "method",
+        "version",
+        "code",
+        "keep_alive",
+        "line_s",
+        "headers_s",
+        "headers_b",
+        "headers_o",
+        "method_s",
+        "path_s",
+        "version_s",
+        "code_s",
+        "status_s",
+        "connection_s",
+        "message_s",
+        "message_f",
+        "content_l",
+        "message_l",
+        "transfer_e",
+        "encodings",
+        "chunked",
+        "chunk_d",
+        "chunk_l",
+        "chunk_s",
+        "chunk_e",
+        "status",
+        "connection"
+    )
+    """ The explicit set of attributes of the parser, avoids a
+    dictionary per parser (one per connection) """
+
     def __init__(
         self,
         owner,
         type = REQUEST,
         store = False,
-        file_limit = FILE_LIMIT
+        file_limit = FILE_LIMIT,
+        headers_limit = HEADERS_LIMIT,
+        lazy = False
     ):
         parser.Parser.__init__(self, owner)
 
         self.build()
-        self.reset(type = type, store = store, file_limit = file_limit)
+        self.reset(
+            type = type,
+            store = store,
+            file_limit = file_limit,
+            headers_limit = headers_limit,
+            lazy = lazy
+        )
 
     def build(self):
         """
@@ -263,7 +510,14 @@ class HTTPParser(parser.Parser):
         self.states = ()
         self.state_l = 0
 
-    def reset(self, type = REQUEST, store = False, file_limit = FILE_LIMIT):
+    def reset(
+        self,
+        type = REQUEST,
+        store = False,
+        file_limit = FILE_LIMIT,
+        headers_limit = HEADERS_LIMIT,
+        lazy = False
+    ):
         """
         Initializes the state of the parser setting the values
         for the various internal structures to the original value.
@@ -280,12 +534,22 @@ class HTTPParser(parser.Parser):
         :param file_limit: The maximum content for the payload message
         from which a in file buffer will be used instead of the one that
         is stored in memory (avoid memory starvation).
+        :type headers_limit: int
+        :param headers_limit: The maximum size (in bytes) of the headers
+        block of the message, a parser error is raised if exceeded.
+        :type lazy: bool
+        :param lazy: If the values of the headers should only be decoded
+        on their first access (headers view), only available for Python 3
+        as the dictionary merge operations bypass the view in Python 2.
         """
 
         self.close()
         self.type = type
         self.store = store
         self.file_limit = file_limit
+        self.headers_limit = headers_limit
+        self.lazy = lazy and netius.legacy.PYTHON_3
+        self.streaming = False
         self.state = LINE_STATE
         self.buffer = []
         self.headers = {}
@@ -296,6 +560,9 @@ class HTTPParser(parser.Parser):
         self.keep_alive = False
         self.line_s = None
         self.headers_s = None
+        self.headers_b = bytearray()
+        self.headers_o = 0
+        if self.lazy: self.headers = HeadersView(self.headers_b)
         self.method_s = None
         self.path_s = None
         self.version_s = None
@@ -319,7 +586,9 @@ class HTTPParser(parser.Parser):
         self.reset(
             type = self.type,
             store = self.store,
-            file_limit = self.file_limit
+            file_limit = self.file_limit,
+            headers_limit = self.headers_limit,
+            lazy = self.lazy
         )
 
     def close(self):
@@ -469,6 +738,20 @@ class HTTPParser(parser.Parser):
         self.encodings = [value.strip() for value in accept_encoding_s.split(",")]
         return self.encodings
 
+    def stream(self):
+        """
+        Enables the streaming mode for the message currently in
+        parsing, meaning that its body is not going to be stored
+        (in memory or file) and is only handed to the partial event
+        listeners as it arrives, allowing large bodies to be handled
+        in constant memory.
+
+        This method should be called by the listeners of the on headers
+        event, the mode is reset once the message has been parsed.
+        """
+
+        self.streaming = True
+
     def parse(self, data):
         """
         Parses the provided data chunk, changing the current
@@ -491,9 +774,16 @@ class HTTPParser(parser.Parser):
         if self.state == FINISH_STATE: self.clear()
 
         # retrieves the size of the data that has been sent for parsing
-        # and saves it under the size original variable
+        # and saves it under the size original variable, then starts the
+        # offset in the data from which the parsing is going to resume
         size = len(data)
         size_o = size
+        offset = 0
+
+        # determines if the data is provided as a memoryview (zero copy
+        # receive), in such case the slicing of the data is free and only
+        # the parts that are retained by the parser methods are copied
+        is_view = type(data) == memoryview
 
         # iterates continuously to try to process all that
         # data that has been sent for processing
@@ -505,18 +795,20 @@ class HTTPParser(parser.Parser):
             if self.state <= self.state_l:
 
                 # retrieves the parsing method for the current
-                # state and then runs it retrieving the number
-                # of valid parsed bytes in case this value is
-                # zero the parsing iteration is broken
+                # state and then runs it (from the current offset)
+                # retrieving the number of valid parsed bytes in case
+                # this value is zero the parsing iteration is broken
                 method = self.states[self.state - 1]
-                count = method(data)
+                count = method(data, offset)
                 if count == 0: break
 
                 # decrements the size of the data buffer by the
-                # size of the parsed bytes and then retrieves the
-                # sub part of the data buffer as the new data buffer
+                # size of the parsed bytes and advances the offset,
+                # notice that the data is never sliced so that the
+                # remaining part of it is not copied for each of the
+                # messages (eg: multiple pipelined requests)
                 size -= count
-                data = data[count:]
+                offset += count
 
                 # continues the loop as there should be still some
                 # data remaining to be parsed in the current buffer
@@ -536,18 +828,21 @@ class HTTPParser(parser.Parser):
 
         # in case not all of the data has been processed
         # must add it to the buffer so that it may be used
-        # latter in the next parsing of the message
-        if size > 0: self.buffer.append(data)
+        # latter in the next parsing of the message, note that a view
+        # is copied as its underlying buffer is going to be re-used
+        if size > 0:
+            data = data[offset:]
+            self.buffer.append(data.tobytes() if is_view else data)
 
         # returns the number of read (processed) bytes of the
         # data that has been sent to the parser
         return size_o - size
 
-    def _parse_line(self, data):
+    def _parse_line(self, data, offset):
         # tries to find the final newline value in the provided
         # data in case there's one it's considered that the the
         # initial line must have been found
-        index = data.find(b"\n")
+        index = self._find(data, b"\n", offset)
         if index == -1: return 0
 
         # adds the partial data (until line ending) to the buffer
@@ -555,15 +850,15 @@ class HTTPParser(parser.Parser):
         # should not include the final newline characters, after that
         # the buffer is cleared as new data is going to be stored for
         # (remaining part of the request or response)
-        self.buffer.append(data[:index])
+        self.buffer.append(data[offset:index])
         self.line_s = b"".join(self.buffer).rstrip()
         self.line_s = netius.legacy.str(self.line_s)
         del self.buffer[:]
 
-        # restores the final end of line sequence to the buffer, this
-        # allows "simple requests" to be parsed properly in under the
+        # restores the final end of line sequence to the headers buffer,
+        # this allows "simple requests" to be parsed properly in under the
         # next section of parsing headers (required for compliance)
-        self.buffer.append(b"\r\n")
+        self.headers_b += b"\r\n"
 
         # splits the line around its various components, verifying than
         # that the number of provided items is the expected one, notice
@@ -597,88 +892,56 @@ class HTTPParser(parser.Parser):
         # triggers the on line event so that the listeners are notified
         # about the end of the parsing of the status line and then
         # returns the count of the parsed bytes of the message
-        self.trigger("on_line")
-        return index + 1
-
-    def _parse_headers(self, data):
-        # creates a temporary buffer with the contents of
-        # the current buffer plus the current data and then
-        # joins it to retrieve the current complete buffer
-        # string to be used in the finding of the end of
-        # header sequence (required for complete parsing)
-        buffer_t = self.buffer + [data]
-        buffer_s = b"".join(buffer_t)
-
-        # tries to find the end of headers sequence in case
-        # it's not found returns the zero value meaning that
-        # the no bytes have been processed (delays parsing)
-        index = buffer_s.find(b"\r\n\r\n")
-        if index == -1: return 0
-
-        # retrieves the partial headers string from the buffer
-        # string and then deletes the current buffer so that
-        # it may be reused for other partial parsings
-        self.headers_s = buffer_s[:index]
-        del self.buffer[:]
-
-        # calculates the base length as the difference between
-        # the buffer string and the length of the currently
-        # provided data value and then uses this value to calculate
-        # the base index for the process data count value
-        base_length = len(buffer_s) - len(data)
-        base_index = index - base_length
-
-        # splits the complete set of lines that compromise
-        # the headers and then iterates over each of them
-        # to set the key and value in the headers map
-        lines = self.headers_s.split(b"\r\n")
-        for line in lines:
-            # verifies if the line contains any information if
-            # that's not the case the current cycle must be
-            # skipped as this may be an extra empty line
-            if not line: continue
-
-            # tries to split the line around the key to value
-            # separator in case there's no valid split (two
-            # values were not found) an exception must be raised
-            values = line.split(b":", 1)
-            if not len(values) == 2:
-                raise netius.ParserError("Invalid header line")
-
-            # unpacks both the key and the value and runs some
-            # parsing validation to ensure proper HTTP compliance
-            key, value = values
-
-            # normalizes the header key and converts it into a string
-            # then validates its conformance according to the RFC 7230
-            # so that their components have verified compliance
-            key = key.lower()
-            key = netius.legacy.str(key)
-            if not HEADER_NAME_REGEX.match(key):
-                raise netius.ParserError("Invalid header key")
-
-            # obtains the value and removes any extra space value from
-            # both the beginning and the end of it, then makes sure that
-            # no extra "space like" character exist in it
-            value = value.strip(b" ")
-            value = netius.legacy.str(value, errors = "replace")
-            if not value == value.strip():
-                raise netius.ParserError("Invalid header value")
-
-            # in case the header already exists this indicates that
-            # there are multiple definitions of the header and a sequence
-            # must be used in order to store the various headers
-            exists = key in self.headers
-            if exists:
-                sequence = self.headers[key]
-                is_list = type(sequence) == list
-                if not is_list: sequence = [sequence]
-                sequence.append(value)
-                value = sequence
-
-            # sets the final header value into the headers map so that
-            # it may be used latter for the serialization process
-            self.headers[key] = value
+        self.fire("on_line")
+        return index - offset + 1
+
+    def _parse_headers(self, data, offset):
+        # retrieves the buffer that accumulates the headers block and
+        # that is going to be incrementally filled as data is received
+        buffer = self.headers_b
+
+        # tries to find the end of headers sequence, first at the
+        # edge between the buffer and the data (resuming from the last
+        # three bytes of the buffer) and then in the data itself, so
+        # that each byte of the headers is only searched once
+        edge = bytes(buffer[-3:])
+        index = (edge + bytes(data[offset:offset + 3])).find(b"\r\n\r\n") if edge else -1
+        if index == -1:
+            index = self._find(data, b"\r\n\r\n", offset)
+            count = len(data) - offset if index == -1 else index - offset + 4
+        else:
+            count = index + 4 - len(edge)
+        finished = not index == -1
+
+        # adds the (headers) part of the data to the buffer, verifying
+        # that the maximum size of the headers block is not exceeded
+        buffer += data[offset:offset + count]
+        if len(buffer) > self.headers_limit:
+            raise netius.ParserError("Headers too large")
+
+        # iterates over the complete lines that are available in the
+        # buffer (starting at the resume offset) parsing each of them,
+        # so that the headers are processed as they arrive and not
+        # only after the complete headers block has been received
+        offset = self.headers_o
+        while True:
+            index = buffer.find(b"\r\n", offset)
+            if index == -1: break
+            if index > offset: self._parse_header(buffer, offset, index)
+            offset = index + 2
+        self.headers_o = offset
+
+        # in case the end of the headers has not been reached the
+        # complete data has been consumed (stored in the buffer) and
+        # the control flow is returned waiting for more data
+        if not finished: return count
+
+        # sets the headers string as the buffer contents without the
+        # final end of headers sequence and then releases the buffer
+        self.headers_s = bytes(buffer[:-4])
+        self.headers_b = bytearray()
+        self.headers_o = 0
+        if self.lazy: self.headers.raw = self.headers_s
 
         # retrieves the size of the contents from the populated
         # headers, this is not required by the specification and
@@ -686,12 +949,6 @@ class HTTPParser(parser.Parser):
         self.content_l = self.headers.get("content-length", -1)
         self.content_l = self.content_l and int(self.content_l)
 
-        # verifies if a back-end file object should be used to store
-        # the file contents, this is done by checking the store flag
-        # and verifying that the file limit value has been reached
-        use_file = self.store and self.content_l >= self.file_limit
-        if use_file: self.message_f = tempfile.NamedTemporaryFile(mode = "w+b")
-
         # retrieves the type of transfer encoding that is going to be
         # used in the processing of this request in case it's of type
         # chunked sets the current chunked flag indicating that the
@@ -742,23 +999,115 @@ class HTTPParser(parser.Parser):
         else: self.state = MESSAGE_STATE
 
         # triggers the on headers event so that the listener object
-        # is notified about the parsing of the headers and than returns
-        # the parsed amount of information (bytes) to the caller
-        self.trigger("on_headers")
-        if has_finished: self.trigger("on_data")
-        return base_index + 4
+        # is notified about the parsing of the headers, notice that the
+        # listener may request the streaming of the message body
+        self.fire("on_headers")
 
-    def _parse_message(self, data):
-        if self.chunked: return self._parse_chunked(data)
-        else: return self._parse_normal(data)
+        # verifies if a back-end file object should be used to store
+        # the file contents, this is done by checking the store flag
+        # and verifying that the file limit value has been reached,
+        # no file is used for the streaming mode (body not stored)
+        # or in case the parser has been reset by the listener
+        use_file = self.store and not self.streaming and\
+            self.state == MESSAGE_STATE and self.content_l >= self.file_limit
+        if use_file: self.message_f = tempfile.NamedTemporaryFile(mode = "w+b")
+
+        # in case the message has no payload triggers the on data event
+        # and then returns the parsed amount of information (bytes)
+        if has_finished: self.fire("on_data")
+        return count
+
+    def _parse_header(self, buffer, start, end):
+        # tries to find the key to value separator in the line
+        # in case there's no valid separator (two values were
+        # not found) an exception must be raised
+        index = buffer.find(b":", start, end)
+        if index == -1: raise netius.ParserError("Invalid header line")
+
+        # tries to resolve the header key using the table of the
+        # common header names, falling back to the normalization
+        # of the key into a (lower cased) string and validation of
+        # its conformance according to the RFC 7230
+        key = bytes(buffer[start:index])
+        name = HEADER_TABLE.get(key, None)
+        if name == None:
+            key = key.lower()
+            key = netius.legacy.str(key)
+            if not HEADER_NAME_REGEX.match(key):
+                raise netius.ParserError("Invalid header key")
+        else:
+            key = name
+
+        # in case the lazy mode is enabled only the offsets of the value
+        # are stored, otherwise it's decoded, in both cases the value is
+        # stripped from the spaces and must not contain other "space like"
+        # characters at both of its ends (same validation for both modes)
+        if self.lazy: value = self._offset_value(buffer, index + 1, end)
+        else: value = self._decode_value(bytes(buffer[index + 1:end]))
+
+        # in case the header already exists this indicates that
+        # there are multiple definitions of the header and a sequence
+        # must be used in order to store the various headers
+        exists = key in self.headers
+        if exists:
+            sequence = self.headers[key]
+            is_list = type(sequence) == list
+            if not is_list: sequence = [sequence]
+            sequence.append(value)
+            value = sequence
+
+        # sets the final header value into the headers map so that
+        # it may be used latter for the serialization process
+        self.headers[key] = value
+
+    def _decode_value(self, value):
+        # obtains the value and removes any extra space value from
+        # both the beginning and the end of it, then makes sure that
+        # no extra "space like" character exist in it
+        value = value.strip(b" ")
+        value = netius.legacy.str(value, errors = "replace")
+        if not value == value.strip():
+            raise netius.ParserError("Invalid header value")
+        return value
+
+    def _offset_value(self, buffer, start, end):
+        # skips the extra space values from both the beginning and
+        # the end of the value and then verifies that the remaining
+        # ends are not "space like" characters, note that this is the
+        # bytes equivalent of the validation of the decoded value
+        while start < end and buffer[start] == 32: start += 1
+        while end > start and buffer[end - 1] == 32: end -= 1
+        if start < end and (buffer[start] in HEADER_SPACES or\
+            buffer[end - 1] in HEADER_SPACES):
+            raise netius.ParserError("Invalid header value")
+        return slice(start, end)
+
+    def _parse_message(self, data, offset):
+        if self.chunked: return self._parse_chunked(data, offset)
+        else: return self._parse_normal(data, offset)
+
+    def _parse_normal(self, data, offset):
+        # in case the content length is defined the data is limited
+        # to the remaining part of the message, as the rest of it
+        # belongs to the next (pipelined) message in the stream, the
+        # slice is avoided when the complete data is to be used
+        end = len(data)
+        if not self.content_l == -1:
+            end = min(end, offset + self.content_l - self.message_l)
+        if offset or end < len(data): data = data[offset:end]
+
+        # in case the data is a memoryview and it's going to be
+        # retained (memory store or partial listeners) a copy of it
+        # is created, otherwise it's used directly (eg: file write)
+        if type(data) == memoryview and (self.store and not self.message_f or\
+            self.events.get("on_partial", None)): data = data.tobytes()
 
-    def _parse_normal(self, data):
         # retrieves the size of the data that has just been
         # received and then in case the store flag is set
         # stores the data in the proper buffer and increments
         # the message length counter with the size of the data
         data_l = len(data)
-        if self.store: self._store_data(data)
+        if self.store and not self.streaming: self._store_data(data)
         self.message_l += data_l
 
         # verifies if the complete message has already been
@@ -771,20 +1120,20 @@ class HTTPParser(parser.Parser):
         # triggers the partial data received event and then
         # in case the complete message has not been received
         # returns immediately the length of processed data
-        self.trigger("on_partial", data)
+        self.fire("on_partial", data)
         if not has_finished: return data_l
 
         # updates the current state to the finish state and then
         # triggers the on data event (indicating the end of the
         # parsing of the message)
         self.state = FINISH_STATE
-        self.trigger("on_data")
+        self.fire("on_data")
 
         # returns the length of the processed data as the amount
         # of processed bytes by the current method
         return data_l
 
-    def _parse_chunked(self, data):
+    def _parse_chunked(self, data, offset):
         # starts the parsed byte counter with the initial zero
         # value this will be increment as bytes are parsed
         count = 0
@@ -797,7 +1146,7 @@ class HTTPParser(parser.Parser):
             # calculates the size of the data that is going
             # to be parsed as that's required to check if
             # the end chunk state has been reached
-            data_l = len(data)
+            data_l = len(data) - offset
 
             # in case the required amount of data has not
             # been received returns the parsed bytes amount
@@ -819,20 +1168,20 @@ class HTTPParser(parser.Parser):
             # must be triggered to indicate the end of message
             if self.chunk_d == 0:
                 self.state = FINISH_STATE
-                self.trigger("on_data")
+                self.fire("on_data")
 
             # otherwise this is the end of a "normal" chunk and
             # and so the end of chunk index must be calculated
             # and the chunk event must be triggered
             else:
                 self.chunk_e = len(self.message)
-                self.trigger("on_chunk", (self.chunk_s, self.chunk_e))
+                self.fire("on_chunk", (self.chunk_s, self.chunk_e))
 
             # in case the message is not meant to be stored or in
             # case the file storage mode is active (spares memory),
             # deletes the contents of the message buffer as they're
             # not going to be used to access request's data as a whole
-            if not self.store or self.message_f: del self.message[:]
+            if not self.store or self.streaming or self.message_f: del self.message[:]
 
             # returns the number of bytes that have been parsed by
             # the current end of chunk operation to the caller method
@@ -845,20 +1194,16 @@ class HTTPParser(parser.Parser):
         if is_start:
             # tries to find the separator of the initial value for
             # the chunk in case it's not found returns immediately
-            index = data.find(b"\n")
+            index = self._find(data, b"\n", offset)
             if index == -1: return 0
 
             # some of the current data to the buffer and then re-joins
             # it as the header value, then removes the complete set of
             # contents from the buffer so that it may be re-used
-            self.buffer.append(data[:index])
+            self.buffer.append(data[offset:index])
             header = b"".join(self.buffer)[:-1]
             del self.buffer[:]
 
-            # sets the new data buffer as the partial buffer of the data
-            # except the extra newline character (not required)
-            data = data[index + 1:]
-
             # splits the header value so that additional chunk information
             # is removed and then parsed the value as the original chunk
             # size (dimension) adding the two extra bytes to the length
@@ -870,15 +1215,21 @@ class HTTPParser(parser.Parser):
 
             # increments the counter of the parsed number of bytes from the
             # provided data by the index of the newline character position
-            # plus one byte respecting to the newline character
-            count += index + 1
+            # plus one byte respecting to the newline character and moves
+            # the offset to the start of the chunk data (after the newline)
+            count += index - offset + 1
+            offset = index + 1
 
         # retrieves the partial data that is valid according to the
         # calculated chunk length and then calculates the size of
         # "that" partial data string value
-        data = data[:self.chunk_l - 2]
+        data = data[offset:offset + self.chunk_l - 2]
         data_s = len(data)
 
+        # in case the data is a memoryview a copy of the (chunk) data
+        # is created as it's going to be retained in the message buffer
+        if type(data) == memoryview: data = data.tobytes()
+
         # adds the partial data to the message list and runs the store operation
         # just in case the storage of the data in file is required, then decrements
         # the (remaining) chunk length by the size of the read data, note that
@@ -886,18 +1237,27 @@ class HTTPParser(parser.Parser):
         # it's possible to refer the chunk as a tuple of start and end indexes when
         # triggering the chunk parsed (on chunk) event (performance gains)
         if data: self.message.append(data)
-        if data and self.store: self._store_data(data, memory = False)
+        if data and self.store and not self.streaming: self._store_data(data, memory = False)
         self.chunk_l -= data_s
 
         # in case there's data parsed the partial data event
         # is triggered to notify handlers about the new data
-        if data: self.trigger("on_partial", data)
+        if data: self.fire("on_partial", data)
 
         # increments the byte counter value by the size of the data
         # and then returns the same counter to the caller method
         count += data_s
         return count
 
+    def _find(self, data, token, offset = 0):
+        # in case the data is not a memoryview the find operation
+        # is used directly, otherwise the pre-compiled regular
+        # expression for the token is used instead as the regex
+        # engine is able to search buffers (avoids a copy)
+        if not type(data) == memoryview: return data.find(token, offset)
+        match = TOKEN_REGEX[token].search(data, offset)
+        return match.start() if match else -1
+
     def _store_data(self, data, memory = True):
         if not self.store: raise netius.ParserError("Store is not possible")
         if self.message_f: self.message_f.write(data)
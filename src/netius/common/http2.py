@@ -37,6 +37,7 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import struct
 import tempfile
 import contextlib
@@ -186,6 +187,34 @@ class HTTP2Parser(parser.Parser):
         "last_end_headers"
     )
 
+    __slots__ = (
+        "store",
+        "file_limit",
+        "state",
+        "states",
+        "state_l",
+        "keep_alive",
+        "buffer",
+        "length",
+        "type",
+        "flags",
+        "stream",
+        "end_headers",
+        "last_type",
+        "last_stream",
+        "last_end_headers",
+        "payload",
+        "stream_o",
+        "streams",
+        "parsers",
+        "connection",
+        "_encoder",
+        "_decoder",
+        "_max_stream"
+    )
+    """ The explicit set of attributes of the parser, avoids a
+    dictionary per parser (one per connection) """
+
     def __init__(
         self,
         owner,
@@ -341,8 +370,10 @@ class HTTP2Parser(parser.Parser):
         size_o = size
 
         # iterates continuously to try to process all that
-        # data that has been sent for processing
-        while size > 0:
+        # data that has been sent for processing, note that a
+        # frame with an empty payload must still be processed
+        # even if no more data is available (eg: settings ack)
+        while size > 0 or self.state == PAYLOAD_STATE and not self.length:
 
             if self.state <= self.state_l:
                 method = self.states[self.state - 1]
@@ -597,7 +628,7 @@ class HTTP2Parser(parser.Parser):
         self.assert_header()
 
         self.state = PAYLOAD_STATE
-        self.trigger("on_header", header)
+        self.fire("on_header", header)
 
         return size
 
@@ -611,13 +642,13 @@ class HTTP2Parser(parser.Parser):
         if not valid_type: self._invalid_type()
 
         self.payload = data
-        self.trigger("on_payload")
+        self.fire("on_payload")
 
         parse_method = self.parsers[self.type]
         parse_method(data)
 
         self.state = FINISH_STATE
-        self.trigger("on_frame")
+        self.fire("on_frame")
 
         return size
 
@@ -642,10 +673,10 @@ class HTTP2Parser(parser.Parser):
         stream.extend_data(contents)
         stream.end_stream = end_stream
 
-        self.trigger("on_data_h2", stream, contents)
+        self.fire("on_data_h2", stream, contents)
 
-        self.trigger("on_partial", contents)
-        if stream.is_ready: self.trigger("on_data")
+        self.fire("on_partial", contents)
+        if stream.is_ready: self.fire("on_data")
 
     def _parse_headers(self, data):
         data_l = len(data)
@@ -733,11 +764,11 @@ class HTTP2Parser(parser.Parser):
         # be latter retrieved for proper event propagation
         self._set_stream(stream)
 
-        self.trigger("on_headers_h2", stream)
+        self.fire("on_headers_h2", stream)
 
         if stream.end_headers: stream._calculate()
-        if stream.end_headers: self.trigger("on_headers")
-        if stream.is_ready: self.trigger("on_data")
+        if stream.end_headers: self.fire("on_headers")
+        if stream.is_ready: self.fire("on_data")
 
     def _parse_priority(self, data):
         dependency, weight = struct.unpack("!IB", data)
@@ -825,12 +856,12 @@ class HTTP2Parser(parser.Parser):
 
         stream.decode_headers()
 
-        self.trigger("on_continuation", stream)
+        self.fire("on_continuation", stream)
 
         if stream.end_headers: stream._calculate()
-        if stream.end_headers: self.trigger("on_headers")
+        if stream.end_headers: self.fire("on_headers")
         if stream.end_headers and stream.end_stream:
-            self.trigger("on_data")
+            self.fire("on_data")
 
     def _has_stream(self, stream):
         return stream in self.streams
@@ -922,6 +953,55 @@ class HTTP2Stream(netius.Stream):
     :see: https://tools.ietf.org/html/rfc7540
     """
 
+    __slots__ = (
+        "identifier",
+        "header_b",
+        "dependency",
+        "weight",
+        "exclusive",
+        "end_headers",
+        "end_stream",
+        "end_stream_l",
+        "store",
+        "file_limit",
+        "window",
+        "window_o",
+        "window_l",
+        "window_t",
+        "window_m",
+        "pending_s",
+        "headers",
+        "headers_l",
+        "method",
+        "path_s",
+        "version",
+        "version_s",
+        "encodings",
+        "chunked",
+        "content_l",
+        "frames",
+        "current",
+        "keep_alive",
+        "_available",
+        "_data_b",
+        "_data_l",
+        "file",
+        "range",
+        "bytes_p",
+        "queue",
+        "iterator",
+        "environ",
+        "future",
+        "proxy_c",
+        "tunnel_c",
+        "prefix",
+        "state",
+        "index"
+    )
+    """ The attributes of the stream, including the optional ones
+    set by the concrete servers, note that unset attributes are
+    still resolved from the connection (attribute delegation) """
+
     def __init__(
         self,
         identifier = None,
@@ -1371,6 +1451,22 @@ class HTTP2Stream(netius.Stream):
         with self.ctx_request(args, kwargs):
             return self.connection.send_part(*args, **kwargs)
 
+    def send_file(self, file, offset = 0, count = None, delay = True, callback = None):
+        if not self.is_open(): return 0
+        if count == None: count = os.fstat(file.fileno()).st_size - offset
+        return self.connection._send_file_buffered(
+            file,
+            offset,
+            count,
+            lambda data, callback: self.send_part(
+                data,
+                final = False,
+                delay = delay,
+                callback = callback
+            ),
+            callback = callback
+        )
+
     def send_reset(self, *args, **kwargs):
         if not self.is_open(): return 0
         with self.ctx_request(args, kwargs):
@@ -41,8 +41,20 @@ import netius
 
 class Parser(netius.Observable):
 
+    __slots__ = (
+        "owner",
+        "_pid"
+    )
+    """ The explicit set of attributes of the parser, the concrete
+    parsers should define the slots for their own attributes """
+
     FIELDS = ("_pid",)
 
+    VIEWS = False
+    """ If the parser is able to handle memoryview based data
+    (zero copy receive), meaning that it never retains the data
+    provided to the parse operation (copies are made instead) """
+
     def __init__(self, owner):
         netius.Observable.__init__(self)
         self.owner = owner
@@ -34,23 +34,17 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
-from . import desktop
-from . import dhcp_s
-from . import file
-from . import filea
-from . import hello_w
-from . import hello
-from . import proxy_d
-from . import proxy_f
-from . import proxy_r
-from . import smtp_r
-
-from .desktop import DesktopServer
-from .dhcp_s import DHCPServerS
-from .file import FileServer
-from .filea import FileAsyncServer
-from .hello import HelloServer
-from .proxy_d import DockerProxyServer
-from .proxy_f import ForwardProxyServer
-from .proxy_r import ReverseProxyServer
-from .smtp_r import RelaySMTPServer
+from ..base import legacy
+
+legacy.lazy(globals(), (
+    ("desktop", ("DesktopServer",)),
+    ("dhcp_s", ("DHCPServerS",)),
+    ("file", ("FileServer",)),
+    ("filea", ("FileAsyncServer",)),
+    ("hello_w", ()),
+    ("hello", ("HelloServer",)),
+    ("proxy_d", ("DockerProxyServer",)),
+    ("proxy_f", ("ForwardProxyServer",)),
+    ("proxy_r", ("ReverseProxyServer",)),
+    ("smtp_r", ("RelaySMTPServer",))
+))
@@ -39,8 +39,10 @@ __license__ = "Apache License, Version 2.0"
 
 import os
 import re
+import zlib
 import datetime
 import mimetypes
+import collections
 
 import netius.common
 import netius.servers
@@ -58,6 +60,36 @@ FILE_SVG = "<svg aria-hidden=\"true\" class=\"octicon octicon-file-text\" height
 """ The vector code to be used for the icon that represents
 a plain file under the directory listing """
 
+VARIANTS_SIZE = 67108864
+""" The default maximum amount of memory (in bytes) to be used
+by the cache of compressed variants of the files, created on the
+fly for the compressible files that have no compressed sibling """
+
+VARIANTS_COUNT = 4096
+""" The default maximum number of entries in the cache of compressed
+variants, bounds the cache for the files that are not worth being
+compressed (as these entries have no size) """
+
+COMPRESS_MIN = 1024
+""" The minimum size (in bytes) of a file for a compressed variant
+of it to be created, smaller files have nothing to gain from it """
+
+COMPRESS_LEVEL = 6
+""" The compression level to be used in the creation of the gzip
+compressed variants, as they're created once a higher level than
+the one used in live compression could be used """
+
+COMPRESS_TYPES = (
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "application/x-javascript",
+    "image/svg+xml"
+)
+""" The sequence of mime types (besides the text ones) that are
+considered to be compressible, for which a compressed variant of
+the file may be created and cached """
+
 EMPTY_GIF = "data:image/gif;base64,R0lGODlhAQABAAAAACH5BAEKAAEALAAAAAABAAEAAAICTAEAOw=="
 """ Simple base 64 encoded empty gif to avoid possible image
 corruption while rendering empty images on browser """
@@ -72,6 +104,11 @@ class FileServer(netius.servers.HTTP2Server):
 
     Current implementation supports byte ranges so that partial retrieval
     of a file is possible.
+
+    For gzip negotiated connections the compressed variant of the file
+    is served (either a ``.gz`` sibling file or a variant compressed once
+    in a worker thread and cached), avoiding the live compression of the
+    file for every request.
     """
 
     def __init__(
@@ -84,6 +121,8 @@ class FileServer(netius.servers.HTTP2Server):
         list_engine = "base",
         cors = False,
         cache = 0,
+        variants = VARIANTS_SIZE,
+        variants_count = VARIANTS_COUNT,
         *args,
         **kwargs
     ):
@@ -96,6 +135,11 @@ class FileServer(netius.servers.HTTP2Server):
         self.list_engine = list_engine
         self.cors = cors
         self.cache = cache
+        self.variants = variants
+        self.variants_count = variants_count
+        self._variants = collections.OrderedDict()
+        self._variants_s = 0
+        self._variants_p = set()
 
     @classmethod
     def _sorter_build(cls, name = None):
@@ -436,6 +480,12 @@ class FileServer(netius.servers.HTTP2Server):
 
         for value in cls._gen_footer(): yield value
 
+    def cleanup(self):
+        netius.servers.HTTP2Server.cleanup(self)
+        self._variants.clear()
+        self._variants_s = 0
+        self._variants_p.clear()
+
     def on_connection_d(self, connection):
         netius.servers.HTTP2Server.on_connection_d(self, connection)
 
@@ -468,6 +518,12 @@ class FileServer(netius.servers.HTTP2Server):
         if self.env: self.list_engine = self.get_env("LIST_ENGINE", self.list_engine)
         if self.env: self.cors = self.get_env("CORS", self.cors, cast = bool)
         if self.env: self.cache = self.get_env("CACHE", self.cache, cast = int)
+        if self.env: self.variants = self.get_env("VARIANTS", self.variants, cast = int)
+        if self.env: self.variants_count = self.get_env(
+            "VARIANTS_COUNT",
+            self.variants_count,
+            cast = int
+        )
         self._build_regex()
         self.base_path = os.path.abspath(self.base_path)
         self.cache_d = datetime.timedelta(seconds = self.cache)
@@ -605,9 +661,10 @@ class FileServer(netius.servers.HTTP2Server):
 
         # retrieves the header that describes the previous version in the
         # client side (client side ETag) and compares both of the ETags to
-        # verify if the file changed meanwhile or not
+        # verify if the file changed meanwhile or not (the ETag of the
+        # compressed variant refers the same version of the file)
         _etag = parser.headers.get("if-none-match", None)
-        not_modified = etag == _etag
+        not_modified = _etag in (etag, etag + "-gzip")
 
         # in case the file did not change in the mean time the not modified
         # callback must be called to correctly handled the file no change
@@ -620,11 +677,26 @@ class FileServer(netius.servers.HTTP2Server):
         type, _encoding = mimetypes.guess_type(path, strict = True)
         type = type or "application/octet-stream"
 
+        # in case the connection is set to (live) compress the response
+        # with gzip tries to resolve a compressed variant of the file, a
+        # sibling file or cached data, notice that range requests are not
+        # compressed (ranges refer the uncompressed file), the response is
+        # sent as plain as the size of the variant is known in advance
+        if is_partial: connection.set_uncompressed()
+        if connection.is_gzip():
+            path_v, data_v = self._resolve_variant(connection, path, modified, type)
+        else: path_v, data_v = None, None
+        is_variant = True if path_v or data_v else False
+        is_vary = self.encoding > netius.common.CHUNKED_ENCODING
+        if is_variant: connection.set_plain()
+        if is_variant: etag += "-gzip"
+        if path_v: path = path_v
+
         # retrieves the size of the file that has just be resolved using
         # the currently provided path value and then associates the file
-        # with the current connection
-        file_size = os.path.getsize(path)
-        file = open(path, "rb")
+        # with the current connection (not required for cached data)
+        file_size = len(data_v) if data_v else os.path.getsize(path)
+        file = None if data_v else open(path, "rb")
         connection.file = file
 
         # convert the current string based representation of the range
@@ -649,7 +721,7 @@ class FileServer(netius.servers.HTTP2Server):
 
         # seeks the current file to the initial position where it's going
         # to start it's reading processing as according to the range
-        file.seek(range[0])
+        if file: file.seek(range[0])
 
         # creates the string that will represent the content range that is
         # going to be returned to the client in the current request
@@ -664,7 +736,9 @@ class FileServer(netius.servers.HTTP2Server):
         if self.cors: headers["access-control-allow-origin"] = "*"
         if type: headers["content-type"] = type
         if is_partial: headers["content-range"] = content_range_s
-        if not is_partial: headers["accept-ranges"] = "bytes"
+        if not is_partial and not is_variant: headers["accept-ranges"] = "bytes"
+        if is_variant: headers["content-encoding"] = "gzip"
+        if is_vary: headers["vary"] = "Accept-Encoding"
 
         # in case there's a valid cache defined must populate the proper header
         # fields so that cache is applied to the request
@@ -680,6 +754,20 @@ class FileServer(netius.servers.HTTP2Server):
         # current data to be sent is partial or not
         code = 206 if is_partial else 200
 
+        # in case the compressed variant is cached (in memory) it's sent
+        # directly in the response, as no file has to be read
+        if data_v:
+            connection.range = None
+            connection.bytes_p = None
+            connection.send_response(
+                data = data_v,
+                headers = headers,
+                code = code,
+                apply = True,
+                callback = self._file_check_close
+            )
+            return
+
         # sends the initial part of the file response containing the headers
         # and the description of the file (includes size) the callback to this
         # operation is the initial sending of the file contents so that the
@@ -751,17 +839,11 @@ class FileServer(netius.servers.HTTP2Server):
     def _file_send(self, connection):
         file = connection.file
         range = connection.range
-        is_larger = BUFFER_SIZE > connection.bytes_p
-        buffer_s = connection.bytes_p if is_larger else BUFFER_SIZE
-        data = file.read(buffer_s)
-        data_l = len(data) if data else 0
-        connection.bytes_p -= data_l
-        is_final = not data or connection.bytes_p == 0
-        callback = self._file_finish if is_final else self._file_send
-        connection.send_part(
-            data,
-            final = False,
-            callback = callback
+        connection.send_file(
+            file,
+            offset = range[0],
+            count = connection.bytes_p,
+            callback = self._file_finish
         )
 
     def _file_finish(self, connection):
@@ -781,6 +863,81 @@ class FileServer(netius.servers.HTTP2Server):
         if connection.parser.keep_alive: return
         connection.close(flush = True)
 
+    def _resolve_variant(self, connection, path, modified, type):
+        # in case there's a pre-compressed sibling file (that is not
+        # older than the file itself) it's used as the variant
+        path_gz = path + ".gz"
+        if os.path.exists(path_gz) and os.path.getmtime(path_gz) >= modified:
+            return path_gz, None
+
+        # verifies if the file is eligible for a compressed variant to
+        # be created, only compressible types within limits are allowed
+        if not self.variants: return None, None
+        if not self._is_compressible(type): return None, None
+        size = os.path.getsize(path)
+        if size < COMPRESS_MIN or size > self.variants: return None, None
+
+        # in case the variant is already cached it's moved to the end
+        # of the cache (most recently used) and returned, notice that
+        # a cached invalid value means that the file is not worth being
+        # compressed and so it must be sent uncompressed
+        key = (path, modified, size)
+        if key in self._variants:
+            data = self._variants.pop(key)
+            self._variants[key] = data
+            if not data: connection.set_uncompressed()
+            return None, data
+
+        # schedules the creation of the compressed variant in a worker
+        # thread (once) and returns an invalid variant, so that the file
+        # is live compressed for the requests until the variant is ready
+        if key in self._variants_p: return None, None
+        self._variants_p.add(key)
+        self.texecute(
+            self._compress_variant,
+            args = [key],
+            callback = lambda data: self.delay_s(
+                lambda: self._store_variant(key, data)
+            )
+        )
+        return None, None
+
+    def _compress_variant(self, key):
+        path, _modified, size = key
+        try:
+            file = open(path, "rb")
+            try: data = file.read()
+            finally: file.close()
+            compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+            data = compressor.compress(data) + compressor.flush()
+        except Exception as exception:
+            self.warning("Problem compressing '%s' - %s" % (path, str(exception)))
+            return False
+        return data if len(data) < size else None
+
+    def _store_variant(self, key, data):
+        # in case the compression failed (eg: file removed or unreadable)
+        # nothing is cached so that a later request retries the creation
+        self._variants_p.discard(key)
+        if data is False: return
+
+        # adds the variant to the cache and then evicts the least recently
+        # used variants until the cache is within both the size and the
+        # count limits, notice that an invalid variant (not worth being
+        # compressed) is also cached but only counts for the entry limit
+        size = len(data) if data else 0
+        if size > self.variants: return
+        self._variants[key] = data
+        self._variants_s += size
+        while self._variants_s > self.variants or\
+            len(self._variants) > self.variants_count:
+            _key, _data = self._variants.popitem(last = False)
+            self._variants_s -= len(_data) if _data else 0
+
+    def _is_compressible(self, type):
+        if type.startswith("text/"): return True
+        return type in COMPRESS_TYPES
+
     def _resolve(self, path):
         path, result = self._resolve_regex(path)
         if result: return path
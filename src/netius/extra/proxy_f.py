@@ -38,6 +38,7 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import re
+import time
 
 import netius.common
 import netius.servers
@@ -98,7 +99,7 @@ class ForwardProxyServer(netius.servers.ProxyServer):
             encoding = netius.common.CHUNKED_ENCODING if is_chunked else\
                 netius.common.PLAIN_ENCODING
 
-            _connection = self.http_client.method(
+            _connection = self._prx_method(
                 method,
                 path,
                 headers = headers,
@@ -111,6 +112,7 @@ class ForwardProxyServer(netius.servers.ProxyServer):
             self.debug("Setting connection as waiting, proxy connection loading ...")
 
             _connection.waiting = True
+            _connection.requested = time.time()
             _connection.max_pending = self.max_pending
             _connection.min_pending = self.min_pending
             connection.proxy_c = _connection
@@ -83,6 +83,8 @@ class ReverseProxyServer(netius.servers.ProxyServer):
         resolve_t = 120.0,
         host_f = False,
         echo = False,
+        x_forwarded_port = None,
+        x_forwarded_proto = None,
         *args,
         **kwargs
     ):
@@ -107,6 +109,8 @@ class ReverseProxyServer(netius.servers.ProxyServer):
             resolve_t = resolve_t,
             host_f = host_f,
             echo = echo,
+            x_forwarded_port = x_forwarded_port,
+            x_forwarded_proto = x_forwarded_proto,
             robin = dict(),
             smart = netius.common.PriorityDict()
         )
@@ -145,8 +149,8 @@ class ReverseProxyServer(netius.servers.ProxyServer):
         if self.env: self.host_f = self.get_env("HOST_FORWARD", self.host_f, cast = float)
         if self.env: self.reuse = self.get_env("REUSE", self.reuse, cast = bool)
         if self.env: self.strategy = self.get_env("STRATEGY", self.strategy)
-        if self.env: self.x_forwarded_port = self.get_env("X_FORWARDED_PORT", None)
-        if self.env: self.x_forwarded_proto = self.get_env("X_FORWARDED_PROTO", None)
+        if self.env: self.x_forwarded_port = self.get_env("X_FORWARDED_PORT", self.x_forwarded_port)
+        if self.env: self.x_forwarded_proto = self.get_env("X_FORWARDED_PROTO", self.x_forwarded_proto)
         if self.sts: self.info("Strict transport security set to %d seconds" % self.sts)
         if self.resolve: self.info("DNS based resolution enabled in proxy with %.2fs timeout" % self.resolve_t)
         if self.strategy: self.info("Using '%s' as load balancing strategy" % self.strategy)
@@ -394,7 +398,7 @@ class ReverseProxyServer(netius.servers.ProxyServer):
         # calls the proper (HTTP) method in the client this should acquire
         # a new connection and start the process of sending the request
         # to the associated HTTP server (request handling)
-        _connection = self.http_client.method(
+        _connection = self._prx_method(
             method,
             url,
             headers = headers,
@@ -429,6 +433,7 @@ class ReverseProxyServer(netius.servers.ProxyServer):
         # maps it as the proxy connection in the connection and also creates
         # the reverse mapping using the connection map of the current server
         _connection.waiting = True
+        _connection.requested = time.time()
         _connection.max_pending = self.max_pending
         _connection.min_pending = self.min_pending
         connection.proxy_c = _connection
@@ -684,7 +689,7 @@ class ReverseProxyServer(netius.servers.ProxyServer):
         # that is going to be called upon DNS resolution
         return callback
 
-    def _on_prx_message(self, client, parser, message):
+    def _on_prx_message(self, protocol, parser, message):
         _connection = parser.owner
         busy = _connection.busy if hasattr(_connection, "busy") else 0
         state = _connection.state if hasattr(_connection, "state") else None
@@ -692,16 +697,16 @@ class ReverseProxyServer(netius.servers.ProxyServer):
         if busy: self.busy_conn -= 1; _connection.busy -= 1
         if state: self.releaser(state); _connection.state = None
         if error_url: _connection.error_url = None
-        netius.servers.ProxyServer._on_prx_message(self, client, parser, message)
+        netius.servers.ProxyServer._on_prx_message(self, protocol, parser, message)
 
-    def _on_prx_close(self, client, _connection):
+    def _on_prx_close(self, _connection):
         busy = _connection.busy if hasattr(_connection, "busy") else 0
         state = _connection.state if hasattr(_connection, "state") else None
         error_url = _connection.state if hasattr(_connection, "error_url") else None
         if busy: self.busy_conn -= busy; _connection.busy -= busy
         if state: self.releaser(state); _connection.state = None
         if error_url: _connection.error_url = None
-        netius.servers.ProxyServer._on_prx_close(self, client, _connection)
+        netius.servers.ProxyServer._on_prx_close(self, _connection)
 
     def _apply_all(
         self,
@@ -150,10 +150,16 @@ class EventPool(ThreadPool):
         self._eventfd = None
 
     def push_event(self, event):
+        # adds the event to the list of pending events and notifies the
+        # event fd only if the list was empty (first event after a pop),
+        # as the consumer drains all the events on a single notification
         self.event_lock.acquire()
-        try: self.events.append(event)
-        finally: self.event_lock.release()
-        self.notify()
+        try:
+            pending = bool(self.events)
+            self.events.append(event)
+        finally:
+            self.event_lock.release()
+        if not pending: self.notify()
 
     def pop_event(self):
         self.event_lock.acquire()
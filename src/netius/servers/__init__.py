@@ -34,34 +34,22 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
-from . import dhcp
-from . import echo_ws
-from . import echo
-from . import ftp
-from . import http
-from . import http2
-from . import mjpg
-from . import pop
-from . import proxy
-from . import smtp
-from . import socks
-from . import tftp
-from . import torrent
-from . import ws
-from . import wsgi
-
-from .dhcp import DHCPRequest, DHCPServer
-from .echo_ws import EchoWSServer
-from .echo import EchoServer
-from .ftp import FTPConnection, FTPServer
-from .http import HTTPConnection, HTTPServer
-from .http2 import HTTP2Server
-from .mjpg import MJPGServer
-from .pop import POPConnection, POPServer
-from .proxy import ProxyConnection, ProxyServer
-from .smtp import TERMINATION_SIZE, SMTPConnection, SMTPServer
-from .socks import SOCKSConnection, SOCKSServer
-from .tftp import TFTPRequest, TFTPServer
-from .torrent import Pieces, TorrentTask, TorrentServer
-from .ws import WSConnection, WSServer
-from .wsgi import WSGIServer
+from ..base import legacy
+
+legacy.lazy(globals(), (
+    ("dhcp", ("DHCPRequest", "DHCPServer")),
+    ("echo_ws", ("EchoWSServer",)),
+    ("echo", ("EchoServer",)),
+    ("ftp", ("FTPConnection", "FTPServer")),
+    ("http", ("BODY_LIMIT", "HTTPBody", "HTTPConnection", "HTTPServer")),
+    ("http2", ("HTTP2Server",)),
+    ("mjpg", ("MJPGServer",)),
+    ("pop", ("POPConnection", "POPServer")),
+    ("proxy", ("ProxyProtocol", "ProxyClient", "ProxyConnection", "ProxyServer")),
+    ("smtp", ("TERMINATION_SIZE", "SMTPConnection", "SMTPServer")),
+    ("socks", ("SOCKSConnection", "SOCKSServer")),
+    ("tftp", ("TFTPRequest", "TFTPServer")),
+    ("torrent", ("Pieces", "TorrentTask", "TorrentServer")),
+    ("ws", ("WSConnection", "WSServer")),
+    ("wsgi", ("WSGIServer",))
+))
@@ -37,11 +37,15 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
+import time
 import zlib
 import base64
 import datetime
+import threading
 import traceback
 import contextlib
+import collections
 
 import netius.common
 
@@ -63,8 +67,154 @@ ENCODING_MAP = dict(
 the corresponding integer value for each of them this is used
 in the initial construction of the server """
 
+BODY_LIMIT = 1048576
+""" The default maximum amount of (request) body data (in bytes)
+that may be buffered in a body stream before the reading of the
+connection is disabled (until the consumer catches up) """
+
+NAMES_LIMIT = 1024
+""" The maximum number of (canonical) header names that are
+going to be cached by the server, avoiding unbounded growth
+of the cache for names that come from the remote peers """
+
+class HTTPBody(netius.Observable):
+    """
+    Readable stream object for the body of an HTTP request, the
+    chunks of the body are buffered as they arrive and handed to
+    the consumer through the read operation (may be used from a
+    different thread).
+
+    The "chunk" event is triggered for every chunk that arrives
+    and the "finish" event once the complete body has arrived.
+
+    In case the consumer falls behind (buffered data above limit)
+    the reading from the connection is disabled, being re-enabled
+    once the consumer drains half of the buffered data.
+    """
+
+    def __init__(self, connection, limit = BODY_LIMIT):
+        netius.Observable.__init__(self)
+        self.connection = connection
+        self.limit = limit
+        self.chunks = collections.deque()
+        self.size = 0
+        self.received = 0
+        self.finished = False
+        self.closed = False
+        self.paused = False
+        self.lock = threading.RLock()
+
+    def read(self, size = -1):
+        """
+        Reads up to the provided number of bytes from the body
+        data that is currently buffered, this operation never
+        blocks, returning an empty value if there's no data.
+
+        :type size: int
+        :param size: The maximum number of bytes to be read, in
+        case it's negative all of the buffered data is read.
+        :rtype: String
+        :return: The (buffered) body data that has been read.
+        """
+
+        self.lock.acquire()
+        try:
+            if size < 0 or size >= self.size:
+                data = b"".join(self.chunks)
+                self.chunks.clear()
+            else:
+                data = self._take(size)
+            self.size -= len(data)
+            resume = self.paused and self.size <= self.limit // 2
+            if resume: self.paused = False
+        finally:
+            self.lock.release()
+        if resume: self._resume()
+        return data
+
+    def is_finished(self):
+        return self.finished
+
+    def is_closed(self):
+        return self.closed
+
+    def push(self, data):
+        # adds the chunk to the buffer and in case the limit of the
+        # buffer has been reached disables the reading from the
+        # connection (back-pressure) until the consumer catches up
+        self.lock.acquire()
+        try:
+            self.chunks.append(data)
+            self.size += len(data)
+            self.received += len(data)
+            pause = not self.paused and self.size >= self.limit
+            if pause: self.paused = True
+        finally:
+            self.lock.release()
+        if pause: self.connection.disable_read()
+        self.fire("chunk", self)
+
+    def finish(self):
+        # marks the body as finished and re-enables the reading from
+        # the connection as there's no more body data to be received
+        # (the buffered data is already bounded by the limit)
+        self.finished = True
+        resume = self.paused
+        self.paused = False
+        if resume: self._resume()
+        self.fire("finish", self)
+
+    def close(self):
+        if self.closed: return
+        self.closed = True
+        self.fire("close", self)
+        self.unbind_all()
+
+    def _take(self, size):
+        buffer = []
+        while size > 0:
+            chunk = self.chunks.popleft()
+            if len(chunk) > size:
+                self.chunks.appendleft(chunk[size:])
+                chunk = chunk[:size]
+            buffer.append(chunk)
+            size -= len(chunk)
+        return b"".join(buffer)
+
+    def _resume(self):
+        # re-enables the reading from the connection, in case this is
+        # called from a different thread the operation is delayed into
+        # the event loop thread (the poll is not thread safe)
+        owner = self.connection.owner
+        if owner.is_main(): self.connection.enable_read()
+        else: owner.delay_s(self.connection.enable_read)
+
 class HTTPConnection(netius.Connection):
 
+    __slots__ = (
+        "encoding",
+        "current",
+        "parser",
+        "legacy",
+        "gzip_m",
+        "file",
+        "range",
+        "bytes_p",
+        "queue",
+        "iterator",
+        "environ",
+        "future",
+        "proxy_c",
+        "tunnel_c",
+        "prefix",
+        "state",
+        "index",
+        "body"
+    )
+    """ The attributes of the HTTP connection, including the optional
+    ones set by the concrete servers (eg: file, WSGI and proxy), that
+    are left unset until used (unset slots are not allocated) """
+
     def __init__(self, encoding = PLAIN_ENCODING, *args, **kwargs):
         netius.Connection.__init__(self, *args, **kwargs)
         self.encoding = encoding
@@ -72,6 +222,7 @@ class HTTPConnection(netius.Connection):
         self.parser = None
         self.legacy = True
         self.gzip_m = dict()
+        self.body = None
 
     def open(self, *args, **kwargs):
         netius.Connection.open(self, *args, **kwargs)
@@ -79,13 +230,17 @@ class HTTPConnection(netius.Connection):
         self.parser = netius.common.HTTPParser(
             self,
             type = netius.common.REQUEST,
-            store = True
+            store = True,
+            lazy = self.owner.lazy_headers
         )
+        self.parser.bind("on_headers", self.on_headers)
         self.parser.bind("on_data", self.on_data)
+        self.views = self.parser.VIEWS and self.owner.views
 
     def close(self, *args, **kwargs):
         netius.Connection.close(self, *args, **kwargs)
         if not self.is_closed(): return
+        if self.body: self.body.close(); self.body = None
         if self.parser: self.parser.destroy()
         if self.gzip_m: self._close_gzip(safe = True)
 
@@ -346,19 +501,26 @@ class HTTPConnection(netius.Connection):
         # the relevant information of the data to be sent to client
         headers = headers or dict()
         version = version or "HTTP/1.1"
+        status = self.owner._status_line(version, code, code_s)
         code_s = code_s or netius.common.CODE_STRINGS.get(code, None)
 
         # creates the buffer list that is going to hold the complete set of
-        # lines for the headers and then appends the complete set of headers
-        # according to the previous construction
-        buffer = []
-        buffer.append("%s %d %s\r\n" % (version, code, code_s))
+        # (encoded) lines for the headers, the lines of the static headers
+        # (eg: server, connection and date) are pre-encoded by the owner so
+        # they are just joined, the remaining ones are serialized here
+        fragments = self.owner._fragments
+        buffer = [status]
         for key, value in netius.legacy.iteritems(headers):
-            key = netius.common.header_up(key)
-            if not isinstance(value, list): value = (value,)
-            for _value in value: buffer.append("%s: %s\r\n" % (key, _value))
-        buffer.append("\r\n")
-        buffer_data = "".join(buffer)
+            if isinstance(value, list): values = value
+            else:
+                fragment = fragments.get((key, value), None)
+                if fragment: buffer.append(fragment); continue
+                values = (value,)
+            key = self.owner._header_name(key)
+            for _value in values:
+                buffer.append(netius.legacy.bytes("%s: %s\r\n" % (key, _value)))
+        buffer.append(b"\r\n")
+        buffer_data = b"".join(buffer)
 
         # sends the buffer data to the connection peer so that it gets notified
         # about the headers for the current communication/message
@@ -397,10 +559,48 @@ class HTTPConnection(netius.Connection):
         else: count = self.send_base(data, delay = delay, callback = callback)
         return count
 
+    def send_file(
+        self,
+        file,
+        offset = 0,
+        count = None,
+        stream = None,
+        delay = True,
+        callback = None
+    ):
+        encoding = min(self.current, CHUNKED_ENCODING) if\
+            self.owner.dynamic else self.current
+
+        if encoding == PLAIN_ENCODING: return netius.Connection.send_file(
+            self,
+            file,
+            offset = offset,
+            count = count,
+            delay = delay,
+            callback = callback
+        )
+
+        if count == None: count = os.fstat(file.fileno()).st_size - offset
+
+        return self._send_file_buffered(
+            file,
+            offset,
+            count,
+            lambda data, callback: self.send_part(
+                data,
+                stream = stream,
+                final = False,
+                delay = delay,
+                callback = callback
+            ),
+            callback = callback
+        )
+
     def parse(self, data):
         try:
             return self.parser.parse(data)
         except netius.ParserError as error:
+            self.owner._parser_errors.inc()
             self.send_response(
                 code = error.code,
                 apply = True
@@ -490,7 +690,33 @@ class HTTPConnection(netius.Connection):
         if strict and self.is_chunked(): return False
         return True
 
+    def stream_body(self, limit = BODY_LIMIT):
+        """
+        Enables the streaming of the body of the request currently
+        in parsing, the body is not stored by the parser and is handed
+        to the returned (readable) body stream as it arrives.
+
+        This method should be called under the on headers handler of
+        the server, so that the body has not yet been received.
+
+        :type limit: int
+        :param limit: The maximum amount of body data (in bytes) that
+        may be buffered before the reading from the connection is
+        disabled, waiting for the consumer to read the buffered data.
+        :rtype: HTTPBody
+        :return: The readable body stream for the request.
+        """
+
+        self.body = HTTPBody(self, limit = limit)
+        self.parser.stream()
+        self.parser.bind("on_partial", self.body.push)
+        return self.body
+
+    def on_headers(self):
+        self.owner.on_headers_http(self.connection_ctx, self.parser_ctx)
+
     def on_data(self):
+        if self.body: self._finish_body()
         self.owner.on_data_http(self.connection_ctx, self.parser_ctx)
 
     @contextlib.contextmanager
@@ -505,6 +731,14 @@ class HTTPConnection(netius.Connection):
     def parser_ctx(self):
         return self.parser
 
+    def _finish_body(self):
+        # unbinds the body stream from the parser (the next request in
+        # the connection is stored as usual) and marks it as finished
+        # so that the consumer knows that no more data is coming
+        body, self.body = self.body, None
+        self.parser.unbind("on_partial", body.push)
+        body.finish()
+
     def _flush_plain(self, stream = None, callback = None):
         if not callback: return
         self.send_plain(b"", stream = stream, callback = callback)
@@ -602,12 +836,34 @@ class HTTPServer(netius.StreamServer):
     """ The map containing the complete set of headers
     that are meant to be applied to all the responses """
 
-    def __init__(self, encoding = "plain", common_log = None, *args, **kwargs):
+    def __init__(
+        self,
+        encoding = "plain",
+        common_log = None,
+        views = True,
+        lazy_headers = False,
+        *args,
+        **kwargs
+    ):
         netius.StreamServer.__init__(self, *args, **kwargs)
         self.encoding_s = encoding
         self.common_log = common_log
+        self.views = views
+        self.lazy_headers = lazy_headers
         self.dynamic = False
         self.common_file = None
+        self._date = None
+        self._date_timer = None
+        self._names = dict()
+        self._status = dict()
+        self._fragments = dict()
+        self._build_fragments()
+        self._parser_errors = self.registry.counter(
+            "parser_errors_total", "Number of requests that failed parsing"
+        )
+        self._responses = self.registry.counter(
+            "http_responses_total", "Number of HTTP responses by status code", label = "code"
+        )
 
     @classmethod
     def build_data(
@@ -744,6 +1000,9 @@ class HTTPServer(netius.StreamServer):
         netius.StreamServer.cleanup(self)
 
         if self.common_file: self.common_file.close()
+        if self._date_timer: self._date_timer.cancel()
+        self._date_timer = None
+        self._set_date(None)
 
     def info_dict(self, full = False):
         info = netius.StreamServer.info_dict(self, full = full)
@@ -758,8 +1017,11 @@ class HTTPServer(netius.StreamServer):
         netius.StreamServer.on_serve(self)
         if self.env: self.encoding_s = self.get_env("ENCODING", self.encoding_s)
         if self.env: self.common_log = self.get_env("COMMON_LOG", self.common_log)
+        if self.env: self.views = self.get_env("VIEWS", self.views, cast = bool)
+        if self.env: self.lazy_headers = self.get_env("LAZY_HEADERS", self.lazy_headers, cast = bool)
         if self.common_log: self.common_file = open(self.common_log, "wb+")
         self.encoding = ENCODING_MAP.get(self.encoding_s, PLAIN_ENCODING)
+        self._update_date()
         self.info("Starting HTTP server with '%s' encoding ..." % self.encoding_s)
         if self.common_log: self.info("Logging with Common Log Format to '%s' ..." % self.common_log)
 
@@ -772,6 +1034,9 @@ class HTTPServer(netius.StreamServer):
             encoding = self.encoding
         )
 
+    def on_headers_http(self, connection, parser):
+        pass
+
     def on_data_http(self, connection, parser):
         is_debug = self.is_debug()
         is_debug and self._log_request(connection, parser)
@@ -786,6 +1051,7 @@ class HTTPServer(netius.StreamServer):
         code = 200,
         code_s = None
     ):
+        self._responses.inc(key = code)
         self.common_file and self._log_request(
             connection,
             parser,
@@ -859,6 +1125,8 @@ class HTTPServer(netius.StreamServer):
         for key, value in netius.legacy.iteritems(cls.BASE_HEADERS):
             if not replace and key in headers: continue
             headers[key] = value
+        if "Date" in headers: return
+        headers["Date"] = self._date or self._format_date()
 
     def _apply_parser(self, parser, headers, replace = False):
         if not replace and "Connection" in headers: return
@@ -881,9 +1149,67 @@ class HTTPServer(netius.StreamServer):
         if not is_measurable and has_length: del headers["Content-Length"]
         if is_compressed and has_ranges: del headers["Accept-Ranges"]
 
+    def _build_fragments(self):
+        # pre-encodes the header lines for the static headers (base and
+        # connection ones) so that they don't have to be serialized for
+        # each of the responses, they're indexed by their name and value
+        cls = self.__class__
+        headers = list(netius.legacy.iteritems(cls.BASE_HEADERS))
+        headers.append(("Connection", "keep-alive"))
+        headers.append(("Connection", "close"))
+        for key, value in headers:
+            if isinstance(value, list): continue
+            self._fragments[(key, value)] = netius.legacy.bytes(
+                "%s: %s\r\n" % (key, value)
+            )
+
+    def _header_name(self, name):
+        # the canonical (upper cased) header names are cached as the
+        # set of names used in responses is usually small, the cache
+        # is bounded as the names may come from remote peers (proxy)
+        name_u = self._names.get(name, None)
+        if name_u: return name_u
+        name_u = netius.common.header_up(name)
+        if len(self._names) < NAMES_LIMIT: self._names[name] = name_u
+        return name_u
+
+    def _status_line(self, version, code, code_s):
+        # the status lines are cached by version and code, only
+        # for the default code strings to keep the cache bounded
+        # (custom code strings may have any value)
+        if code_s: return netius.legacy.bytes("%s %d %s\r\n" % (version, code, code_s))
+        line = self._status.get((version, code), None)
+        if line: return line
+        code_s = netius.common.CODE_STRINGS.get(code, None)
+        line = netius.legacy.bytes("%s %d %s\r\n" % (version, code, code_s))
+        self._status[(version, code)] = line
+        return line
+
+    def _update_date(self):
+        # formats the date for the current second (once for all of the
+        # responses in the second) and schedules the next update to the
+        # start of the next second, so that the value is never stale
+        current = time.time()
+        self._set_date(self._format_date(current))
+        self._date_timer = self.delay(
+            self._update_date,
+            timeout = 1.0 - current % 1.0
+        )
+
+    def _set_date(self, date):
+        # replaces the (pre-encoded) date fragment, removing the one
+        # of the previous date so that the map of fragments is bounded
+        if self._date: self._fragments.pop(("Date", self._date), None)
+        self._date = date
+        if not date: return
+        self._fragments[("Date", date)] = netius.legacy.bytes("Date: %s\r\n" % date)
+
+    def _format_date(self, current = None):
+        return time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(current))
+
     def _headers_upper(self, headers):
         for key, value in netius.legacy.items(headers):
-            key_u = netius.common.header_up(key)
+            key_u = self._header_name(key)
             del headers[key]
             headers[key_u] = value
 
@@ -46,6 +46,21 @@ from . import http
 
 class HTTP2Connection(http.HTTPConnection):
 
+    __slots__ = (
+        "window",
+        "window_o",
+        "window_l",
+        "window_t",
+        "settings",
+        "settings_r",
+        "preface",
+        "preface_b",
+        "frames",
+        "unavailable"
+    )
+    """ The attributes of the HTTP 2 connection, the ones shared
+    with the HTTP connection are defined in the parent class """
+
     def __init__(
         self,
         legacy = True,
@@ -98,6 +113,7 @@ class HTTP2Connection(http.HTTPConnection):
         self.legacy = False
         if self.parser: self.parser.destroy()
         self.parser = netius.common.HTTP2Parser(self, store = True)
+        self.views = self.parser.VIEWS and self.owner.views
         self.parser.bind("on_data", self.on_data)
         self.parser.bind("on_header", self.on_header)
         self.parser.bind("on_payload", self.on_payload)
@@ -118,6 +134,7 @@ class HTTP2Connection(http.HTTPConnection):
         try:
             return self.parser.parse(data)
         except netius.ParserError as error:
+            self.owner._parser_errors.inc()
             if not self.legacy: raise
             self.send_response(
                 code = error.code,
@@ -485,6 +502,34 @@ class HTTP2Connection(http.HTTPConnection):
             )
         return count
 
+    def send_file(
+        self,
+        file,
+        offset = 0,
+        count = None,
+        stream = None,
+        delay = True,
+        callback = None
+    ):
+        if self.legacy: return http.HTTPConnection.send_file(
+            self,
+            file,
+            offset = offset,
+            count = count,
+            stream = stream,
+            delay = delay,
+            callback = callback
+        )
+
+        stream = self.parser._get_stream(stream)
+        return stream.send_file(
+            file,
+            offset = offset,
+            count = count,
+            delay = delay,
+            callback = callback
+        )
+
     def send_frame(
         self,
         type = 0x01,
@@ -37,6 +37,8 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import time
+
 import netius.common
 import netius.clients
 
@@ -58,13 +60,93 @@ allowed in the sending buffer, this maximum value
 avoids the starvation of the producer to consumer
 relation that could cause memory problems """
 
+class ProxyProtocol(netius.clients.HTTPProtocol):
+    """
+    Back-end HTTP protocol used by the proxy server, runs under
+    the event loop of the proxy and exposes the flow control
+    operations of the underlying transport so that both ends of
+    the proxy relation may be throttled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        netius.clients.HTTPProtocol.__init__(self, *args, **kwargs)
+        self.max_pending = MAX_PENDING
+        self.min_pending = int(MAX_PENDING * MIN_RATIO)
+
+    def connection_made(self, transport):
+        # in case the protocol has been closed while the connection
+        # was still being established (eg: front-end disconnected)
+        # the new transport is discarded as it's no longer required
+        if self.is_closed_or_closing(): transport.abort(); return
+
+        # sets the write buffer limits of the transport according to
+        # the pending values of the proxy and runs the request, flushing
+        # then the data that was sent before the connection was made
+        transport.set_write_buffer_limits(
+            high = self.max_pending,
+            low = self.min_pending
+        )
+        netius.clients.HTTPProtocol.connection_made(self, transport)
+        self._flush_send()
+
+    def send(self, data, delay = True, force = False, callback = None):
+        # in case there's no transport available, the connection is still
+        # being established, the data is delayed so that it's sent after
+        # the request headers (request body received from the front-end)
+        if not self._transport:
+            data = netius.legacy.bytes(data)
+            return self._delay_send(data, callback = callback)
+
+        return netius.clients.HTTPProtocol.send(
+            self,
+            data,
+            delay = delay,
+            force = force,
+            callback = callback
+        )
+
+    def enable_read(self):
+        if not self._transport: return
+        self._transport.resume_reading()
+
+    def disable_read(self):
+        if not self._transport: return
+        self._transport.pause_reading()
+
+    def get_socket(self):
+        if not self._transport or self._transport.is_closing(): return None
+        return self._transport.get_extra_info("socket")
+
+    def is_paused(self):
+        if not self._transport or self._transport.is_closing(): return False
+        return not self._transport.is_reading()
+
+    def is_throttleable(self):
+        return True
+
+    def is_exhausted(self):
+        if not self._transport or self._transport.is_closing(): return False
+        return self._transport.get_write_buffer_size() > self.max_pending
+
+    def is_restored(self):
+        if not self._transport or self._transport.is_closing(): return True
+        return self._transport.get_write_buffer_size() <= self.min_pending
+
+class ProxyClient(netius.clients.HTTPClient):
+    """
+    Specialized HTTP client that creates the proxy protocol
+    for the back-end requests, ensuring that the requests are
+    handled under the event loop of the proxy server.
+    """
+
+    protocol = ProxyProtocol
+
 class ProxyConnection(http2.HTTP2Connection):
 
     def open(self, *args, **kwargs):
         http2.HTTP2Connection.open(self, *args, **kwargs)
         if not self.is_open(): return
         self.parser.store = False
-        self.parser.bind("on_headers", self.on_headers)
         self.parser.bind("on_partial", self.on_partial)
         self.parser.bind("on_available", self.on_available)
         self.parser.bind("on_unavailable", self.on_unavailable)
@@ -115,22 +197,23 @@ class ProxyServer(http2.HTTP2Server):
         self.max_pending = max_pending
         self.min_pending = int(max_pending * MIN_RATIO)
         self.conn_map = {}
+        self._upstream = self.registry.histogram(
+            "proxy_upstream_seconds", "Time until the upstream response headers"
+        )
 
-        self.http_client = netius.clients.HTTPClient(
+        # disables the zero copy (memoryview) receive as the data
+        # received may be forwarded (retained) to the tunnel connection
+        self.views = False
+
+        # creates the (protocol based) HTTP client that is going to be used
+        # for the back-end requests, notice that the handlers for the events
+        # are bound per protocol (on each request) as the client has no loop
+        self.http_client = ProxyClient(
             thread = False,
             auto_release = False,
-            receive_buffer = max_pending,
-            send_buffer = max_pending,
             *args,
             **kwargs
         )
-        self.http_client.bind("headers", self._on_prx_headers)
-        self.http_client.bind("message", self._on_prx_message)
-        self.http_client.bind("partial", self._on_prx_partial)
-        self.http_client.bind("connect", self._on_prx_connect)
-        self.http_client.bind("acquire", self._on_prx_acquire)
-        self.http_client.bind("close", self._on_prx_close)
-        self.http_client.bind("error", self._on_prx_error)
 
         self.raw_client = netius.clients.RawClient(
             thread = False,
@@ -189,8 +272,7 @@ class ProxyServer(http2.HTTP2Server):
             throttle = self.throttle,
             max_pending = self.max_pending,
             min_pending = self.min_pending,
-            http_client = self.http_client.info_dict(full = full),
-            raw_client = self.raw_client.info_dict(full = full)
+            available = len(self.http_client.available)
         )
         return info
 
@@ -267,7 +349,7 @@ class ProxyServer(http2.HTTP2Server):
         should_throttle = self.throttle and connection.is_throttleable()
         should_disable = should_throttle and proxy_c.is_exhausted()
         if should_disable: connection.disable_read()
-        proxy_c.flush(force = True, callback = self._throttle)
+        proxy_c.flush(force = True, callback = self._prx_restore)
 
     def on_headers(self, connection, parser):
         pass
@@ -280,18 +362,18 @@ class ProxyServer(http2.HTTP2Server):
         should_throttle = self.throttle and connection.is_throttleable()
         should_disable = should_throttle and proxy_c.is_exhausted()
         if should_disable: connection.disable_read()
-        proxy_c.send_base(data, force = True, callback = self._throttle)
+        proxy_c.send_base(data, force = True, callback = self._prx_restore)
 
     def on_available(self, connection, parser):
         proxy_c = connection.proxy_c
-        if not proxy_c.renable == False: return
+        if not proxy_c.is_paused(): return
         if not connection.is_restored(): return
         proxy_c.enable_read()
-        self.reads((proxy_c.socket,), state = False)
+        self.reads((proxy_c.get_socket(),), state = False)
 
     def on_unavailable(self, connection, parser):
         proxy_c = connection.proxy_c
-        if proxy_c.renable == False: return
+        if proxy_c.is_paused(): return
         should_throttle = self.throttle and proxy_c.is_throttleable()
         should_disable = should_throttle and connection.is_exhausted()
         if not should_disable: return
@@ -310,11 +392,39 @@ class ProxyServer(http2.HTTP2Server):
 
     def _throttle(self, _connection):
         if not _connection.is_restored(): return
-        connection = self.conn_map[_connection]
+        connection = self.conn_map.get(_connection, None)
+        if not connection: return
         if not connection.renable == False: return
         connection.enable_read()
         self.reads((connection.socket,), state = False)
 
+    def _prx_method(self, method, url, connection = None, **kwargs):
+        # in case there's a back-end protocol from a previous request
+        # that is still open and that targets the same end-point, it's
+        # made available to the HTTP client so that it's re-used (keep
+        # alive) otherwise it's closed as it's no longer going to be used
+        key = self.http_client.protocol.key_g(url)
+        if connection and connection.is_open() and connection.key == key:
+            self.http_client.available[key] = connection
+        elif connection: connection.close()
+
+        # runs the request using the current server as the event loop, so
+        # that the back-end connections are handled by the same poll as the
+        # front-end ones, and then binds the proxy handlers to the protocol
+        # (they must be re-bound per request as the client unbinds them)
+        _loop, protocol = self.http_client.method(method, url, loop = self, **kwargs)
+        protocol.bind("open", self._on_prx_connect)
+        protocol.bind("headers", self._on_prx_headers)
+        protocol.bind("partial", self._on_prx_partial)
+        protocol.bind("message", self._on_prx_message)
+        protocol.bind("close", self._on_prx_close)
+        return protocol
+
+    def _prx_restore(self, transport):
+        _connection = transport.get_protocol() if transport else None
+        if not _connection: return
+        self._throttle(_connection)
+
     def _prx_close(self, connection):
         connection.close(flush = True)
 
@@ -326,10 +436,10 @@ class ProxyServer(http2.HTTP2Server):
 
         proxy_c = hasattr(connection, "proxy_c") and connection.proxy_c
         if not proxy_c: return
-        if not proxy_c.renable == False: return
+        if not proxy_c.is_paused(): return
 
         proxy_c.enable_read()
-        self.http_client.reads((proxy_c.socket,), state = False)
+        self.reads((proxy_c.get_socket(),), state = False)
 
     def _raw_throttle(self, connection):
         if not connection.is_restored(): return
@@ -341,7 +451,7 @@ class ProxyServer(http2.HTTP2Server):
         tunnel_c.enable_read()
         self.raw_client.reads((tunnel_c.socket,), state = False)
 
-    def _on_prx_headers(self, client, parser, headers):
+    def _on_prx_headers(self, protocol, parser):
         # retrieves the owner of the parser as the client connection
         # and then retrieves all the other HTTP specific values
         _connection = parser.owner
@@ -349,18 +459,25 @@ class ProxyServer(http2.HTTP2Server):
         status_s = parser.status_s
         version_s = parser.version_s
 
-        # creates a new dictionary from the provided one, so that no overlap
+        # creates a new dictionary from the parser's one, so that no overlap
         # in values occurs (would destroy the original data)
-        headers = dict(headers)
+        headers = dict(parser.headers)
 
         # resolves the client connection into the proper proxy connection
         # to be used to send the headers (and status line) to the client
         # and then retrieves the origin content and transfer encoding values
         # that are going to be used to determine some heuristics for the data
-        connection = self.conn_map[_connection]
+        connection = self.conn_map.get(_connection, None)
+        if not connection: return
         content_encoding = headers.pop("content-encoding", None)
         transfer_encoding = headers.pop("transfer-encoding", None)
 
+        # in case the time of the request issuing is known observes the
+        # upstream latency (until the headers are received) for the request
+        requested = getattr(_connection, "requested", None)
+        if requested: self._upstream.observe(time.time() - requested)
+        _connection.requested = None
+
         # if either the proxy connection or the back-end one is compressed
         # the length values of the connection are considered unreliable and
         # some extra operation must be defined, note that in case the dynamic
@@ -414,7 +531,7 @@ class ProxyServer(http2.HTTP2Server):
             code_s = status_s
         )
 
-    def _on_prx_message(self, client, parser, message):
+    def _on_prx_message(self, protocol, parser, message):
         # retrieves the back-end connection from the provided parser this
         # is going to be used for the reverse connection resolution process
         _connection = parser.owner
@@ -423,7 +540,8 @@ class ProxyServer(http2.HTTP2Server):
         # the requester connection associated with the client (back-end)
         # connection in order to be used in the current processing
         _connection.waiting = False
-        connection = self.conn_map[_connection]
+        connection = self.conn_map.get(_connection, None)
+        if not connection: return
 
         # creates the clojure function that will be used to close the
         # current client connection and that may or may not close the
@@ -446,7 +564,7 @@ class ProxyServer(http2.HTTP2Server):
         # important for chunked or compressed connections
         connection.flush_s(callback = callback)
 
-    def _on_prx_partial(self, client, parser, data):
+    def _on_prx_partial(self, protocol, parser, data):
         # retrieves the owner of the proxy parser as the proxy connection
         # and then uses the connection to decode the data to obtain the raw
         # value of it, this is required as gzip compression may exist
@@ -456,19 +574,17 @@ class ProxyServer(http2.HTTP2Server):
         # retrieves the peer connection and tries to send the new data chunk
         # back to it using the currently defined encoding (as expected), note
         # that additional throttling operations may apply
-        connection = self.conn_map[_connection]
+        connection = self.conn_map.get(_connection, None)
+        if not connection: return
         should_throttle = self.throttle and _connection.is_throttleable()
         should_disable = should_throttle and connection.is_exhausted()
         if should_disable: _connection.disable_read()
         connection.send_part(data, final = False, callback = self._prx_throttle)
 
-    def _on_prx_connect(self, client, _connection):
+    def _on_prx_connect(self, _connection):
         _connection.waiting = False
 
-    def _on_prx_acquire(self, client, _connection):
-        _connection.waiting = False
-
-    def _on_prx_close(self, client, _connection):
+    def _on_prx_close(self, _connection):
         # retrieves the reference to the parent class value
         # so that it can be used for class level operations
         cls = self.__class__
@@ -505,40 +621,6 @@ class ProxyServer(http2.HTTP2Server):
         _connection.waiting = False
         del self.conn_map[_connection]
 
-    def _on_prx_error(self, client, _connection, error):
-        # retrieves the reference to the parent class value
-        # so that it can be used for class level operations
-        cls = self.__class__
-
-        # retrieves the front-end connection associated with
-        # the proxy connection, this value is going to be
-        # if sending the message to the final client
-        connection = self.conn_map.get(_connection, None)
-        if not connection: return
-
-        # constructs the message string that is going to be
-        # sent as part of the response from the proxy indicating
-        # the unexpected error, then in case the connection is
-        # still under the (initial) waiting state sends the same
-        # message to the final client connection (indicating error)
-        # note that the recovery from the error (disconnect should
-        # be handled by the error manager, and that should imply
-        # a closing operation on the original/proxy connection)
-        error_m = str(error) or "Unknown proxy relay error"
-        if _connection.waiting: connection.send_response(
-            data = cls.build_text(error_m),
-            headers = dict(
-                connection = "close"
-            ),
-            code = 500,
-            code_s = "Internal Error",
-            apply = True
-        )
-
-        # sets the connection as not waiting, so that no more
-        # messages are sent as part of the closing chain
-        _connection.waiting = False
-
     def _on_raw_connect(self, client, _connection):
         connection = self.conn_map[_connection]
         connection.send_response(
@@ -572,9 +654,9 @@ class ProxyServer(http2.HTTP2Server):
         version_s = parser_prx.version_s
         version_s = version_s.split("/", 1)[1]
 
-        # unpacks the current connectiont's address so that the host
-        # value is possible to be retrieved (as expected)
-        host, _port = connection.address
+        # retrieves the host of the back-end protocol so that it may
+        # be used to identify the proxy relation (as expected)
+        host = connection.host
 
         # retrieves the server value from the current headers, as it
         # is going to be used for the creation of the partial via
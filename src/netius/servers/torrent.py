@@ -300,6 +300,7 @@ class TorrentTask(netius.Observable):
         self.connections = []
         self.peers = []
         self.peers_m = {}
+        self._timer = None
 
     def load(self):
         if self.torrent_path: self.info = self.load_info(self.torrent_path)
@@ -313,7 +314,11 @@ class TorrentTask(netius.Observable):
         self.load_file()
         self.load_pieces()
 
+        self.schedule_refresh()
+
     def unload(self):
+        if self._timer: self._timer.cancel()
+        self._timer = None
         self.owner = None
         self.unload_file()
         self.unload_pieces()
@@ -328,6 +333,23 @@ class TorrentTask(netius.Observable):
         if time.time() < self.next_refresh: return
         self.refresh()
 
+    def schedule_refresh(self):
+        """
+        Schedules the (periodic) refresh operation of the task as
+        a timer in the owner's event loop, so that no polling of
+        the refresh time is required on every loop tick.
+        """
+
+        if not self.owner: return
+        timeout = max(self.next_refresh - time.time(), 0)
+        self._timer = self.owner.delay(self._on_refresh, timeout = timeout)
+
+    def _on_refresh(self):
+        self._timer = None
+        if not self.owner: return
+        self.ticks()
+        self.schedule_refresh()
+
     def refresh(self):
         self.peers_dht()
         self.peers_tracker()
@@ -796,10 +818,6 @@ class TorrentServer(netius.ContainerServer):
         self.cleanup_tasks()
         self.client.destroy()
 
-    def ticks(self):
-        netius.ContainerServer.ticks(self)
-        for task in self.tasks: task.ticks()
-
     def download(self, target_path, torrent_path = None, info_hash = None, close = False):
         """
         Starts the "downloading" process of a torrent associated file
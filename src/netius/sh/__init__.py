@@ -34,7 +34,11 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
-from . import base
-from . import dkim
-from . import rsa
-from . import smtp
+from ..base import legacy
+
+legacy.lazy(globals(), (
+    ("base", ()),
+    ("dkim", ()),
+    ("rsa", ()),
+    ("smtp", ())
+))
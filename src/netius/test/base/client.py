@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+
+import socket
+import unittest
+import threading
+
+import netius
+
+class StreamClientTest(unittest.TestCase):
+
+    def test_read_budget(self):
+        client = netius.StreamClient(thread = False)
+        size = client.read_budget * 4
+        service = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        service.bind(("127.0.0.1", 0))
+        service.listen(1)
+        port = service.getsockname()[1]
+
+        def serve():
+            _socket, _address = service.accept()
+            try: _socket.sendall(b"x" * size)
+            finally: _socket.close()
+
+        thread = threading.Thread(target = serve)
+        thread.daemon = True
+        thread.start()
+
+        received = []
+
+        def on_data(connection, data):
+            received.append(len(data))
+            if sum(received) < size: return
+            client.stop()
+
+        client.on_data = on_data
+        try:
+            client.connect("127.0.0.1", port)
+            client.delay(client.stop, timeout = 10.0)
+            client.start()
+        finally:
+            client.cleanup()
+            service.close()
+            thread.join()
+
+        self.assertEqual(sum(received), size)
@@ -51,3 +51,49 @@ class BaseTest(unittest.TestCase):
 
         self.assertNotEqual(result, None)
         self.assertEqual(isinstance(result, str), True)
+
+    def test_instrument(self):
+        loop = netius.Base(instrument = True)
+        loop.delay(lambda: None)
+        loop.delay(loop.stop, timeout = 0.02)
+        try: loop.start()
+        finally: loop.close()
+
+        info = loop.loop_dict()
+        self.assertEqual(info["instrument"], True)
+        self.assertEqual(info["phases"]["ticks"]["count"] > 0, True)
+        self.assertEqual(info["phases"]["poll"]["count"] > 0, True)
+        self.assertEqual(info["phases"]["delays"]["count"] > 0, True)
+        self.assertEqual(info["callbacks"]["sum"], 2)
+        self.assertEqual(info["lag"]["count"], 1)
+        self.assertEqual(info["events"]["count"], info["phases"]["poll"]["count"])
+
+        loop.loop_reset()
+        info = loop.loop_dict()
+        self.assertEqual(info["phases"]["ticks"]["count"], 0)
+        self.assertEqual(info["lag"]["count"], 0)
+
+    def test_delay_s(self):
+        wakeups = []
+        loop = netius.Base()
+        loop.wakeup = lambda force = False: wakeups.append(force)
+        try:
+            loop.delay_s(lambda: None)
+            loop.delay_s(lambda: None)
+            loop.delay_s(lambda: None, wakeup = False)
+
+            self.assertEqual(len(wakeups), 1)
+            self.assertEqual(len(loop._delayed_n), 3)
+
+            loop.delay_m()
+
+            self.assertEqual(loop._delayed_n, [])
+            self.assertEqual(len(loop._delayed), 3)
+
+            loop.delay_s(lambda: None, wakeup = False)
+            loop.delay_s(lambda: None)
+            loop.delay_s(lambda: None)
+
+            self.assertEqual(len(wakeups), 2)
+        finally:
+            loop.close()
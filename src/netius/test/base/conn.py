@@ -0,0 +1,229 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import socket
+import unittest
+import tempfile
+import threading
+
+import netius
+
+from netius.base import conn
+
+class ConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = netius.StreamServer()
+        self.server.poll = self.server.build_poll()
+        self.server.poll.open(timeout = 0)
+        self.local, self.remote = socket.socketpair()
+        self.local.setblocking(0)
+        self.connection = self.server.build_connection(self.local)
+        self.connection.open()
+
+    def tearDown(self):
+        self.server.cleanup()
+        self.local.close()
+        self.remote.close()
+
+    def test_send_vector(self):
+        if not conn.SENDMSG:
+            self.skipTest("No sendmsg support available")
+
+        values = []
+
+        self.connection.pend((b"header", None, lambda c: values.append(1)))
+        self.connection.pend((b"", None, lambda c: values.append(2)))
+        self.connection.pend((b"body", None, lambda c: values.append(3)))
+        self.connection._send()
+
+        self.assertEqual(self.remote.recv(1024), b"headerbody")
+        self.assertEqual(values, [1, 2, 3])
+        self.assertEqual(len(self.connection.pending), 0)
+        self.assertEqual(self.connection.pending_s, 0)
+
+    def test_send_vector_partial(self):
+        if not conn.SENDMSG:
+            self.skipTest("No sendmsg support available")
+
+        values = []
+        chunks = [bytes(bytearray([index])) * 65536 for index in range(8)]
+
+        for index, chunk in enumerate(chunks):
+            callback = lambda c, index = index: values.append(index)
+            self.connection.pend((chunk, None, callback))
+
+        received = []
+        while True:
+            try: self.connection._send()
+            except socket.error: pass
+            if not self.connection.pending: break
+            self.assertEqual(
+                self.connection.pending_s,
+                sum(len(item[0]) for item in self.connection.pending)
+            )
+            received.append(self.remote.recv(1048576))
+
+        self.remote.setblocking(0)
+        try:
+            while True: received.append(self.remote.recv(1048576))
+        except socket.error:
+            pass
+
+        self.assertEqual(b"".join(received), b"".join(chunks))
+        self.assertEqual(values, list(range(8)))
+        self.assertEqual(self.connection.pending_s, 0)
+
+    def test_send_close(self):
+        values = []
+
+        self.connection.pend((b"first", None, lambda c: values.append(1)))
+        self.connection.pend((b"second", None, lambda c: values.append(2)))
+        self.connection.pend((None, None, lambda c: values.append(3)))
+        self.connection._send()
+
+        self.assertEqual(self.remote.recv(1024), b"firstsecond")
+        self.assertEqual(values, [1, 2, 3])
+
+    def test_send_dirty(self):
+        values = []
+
+        self.server.tid = threading.current_thread().ident
+        self.connection.wready = True
+        self.connection.send(b"first", callback = lambda c: values.append(1))
+        self.connection.send(b"second", callback = lambda c: values.append(2))
+        self.connection.send(b"third", callback = lambda c: values.append(3))
+
+        self.assertEqual(len(self.server._dirty), 1)
+        self.assertEqual(len(self.connection.pending), 3)
+        self.assertEqual(self.server.get_timeout(), 0.0)
+        self.assertEqual(values, [])
+
+        self.server._flushes()
+
+        self.assertEqual(self.remote.recv(1024), b"firstsecondthird")
+        self.assertEqual(values, [1, 2, 3])
+        self.assertEqual(len(self.server._dirty), 0)
+        self.assertEqual(len(self.connection.pending), 0)
+
+    def test_send_file(self):
+        if not conn.SENDFILE:
+            self.skipTest("No sendfile support available")
+
+        data = bytes(bytearray(range(256))) * 4096
+        values = []
+
+        file = tempfile.TemporaryFile()
+        try:
+            file.write(data)
+            file.flush()
+
+            self.connection.send(b"header")
+            self.connection.send_file(
+                file,
+                offset = 1000,
+                count = 600000,
+                callback = lambda c: values.append(1)
+            )
+            received = self._receive(6 + 600000)
+        finally:
+            file.close()
+
+        self.assertEqual(received, b"header" + data[1000:601000])
+        self.assertEqual(values, [1])
+        self.assertEqual(self.connection.pending_s, 0)
+
+    def test_send_file_buffered(self):
+        data = bytes(bytearray(range(256))) * 4096
+        values = []
+
+        file = tempfile.TemporaryFile()
+        try:
+            file.write(data)
+            file.flush()
+
+            self.connection.ssl = True
+            self.connection.send_file(
+                file,
+                offset = 1000,
+                callback = lambda c: values.append(1)
+            )
+            received = self._receive(len(data) - 1000)
+        finally:
+            self.connection.ssl = False
+            file.close()
+
+        self.assertEqual(received, data[1000:])
+        self.assertEqual(values, [1])
+        self.assertEqual(self.connection.pending_s, 0)
+
+    def test_metrics(self):
+        self.connection.pend((b"hello", None, None))
+        self.connection._send()
+        self.remote.sendall(b"world")
+        self.remote.settimeout(1.0)
+
+        self.assertEqual(self.remote.recv(1024), b"hello")
+        self.assertEqual(self.connection.recv(1024), b"world")
+        self.assertEqual(self.server._bytes_out.get(), 5)
+        self.assertEqual(self.server._bytes_in.get(), 5)
+        self.assertEqual(self.server.registry.get("connections").get(), 1)
+
+        self.connection.close(reason = "peer")
+
+        self.assertEqual(self.server._closes.get(key = "peer"), 1)
+        self.assertEqual(self.server.registry.get("connections").get(), 0)
+
+        metrics = self.server.metrics()
+
+        self.assertIn("netius_bytes_out_total 5\n", metrics)
+        self.assertIn("netius_closes_total{reason=\"peer\"} 1\n", metrics)
+        self.assertIn("netius_accepts_total 0\n", metrics)
+
+    def _receive(self, size):
+        received = []
+        received_l = 0
+        self.remote.settimeout(1.0)
+        while received_l < size:
+            try: self.connection._send()
+            except socket.error: pass
+            data = self.remote.recv(1048576)
+            received.append(data)
+            received_l += len(data)
+        return b"".join(received)
@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import sys
+import unittest
+import subprocess
+
+import netius
+
+class LegacyTest(unittest.TestCase):
+
+    def test_lazy(self):
+        scope = dict(__name__ = "netius.common")
+        netius.legacy.lazy(scope, (
+            ("util", ("cstring", "header_down")),
+            ("style", ())
+        ))
+
+        self.assertEqual(scope["__all__"], ["util", "style", "cstring", "header_down"])
+
+        if not netius.legacy.PYTHON_37:
+            self.assertEqual(scope["cstring"], netius.common.util.cstring)
+            return
+
+        self.assertEqual("cstring" in scope, False)
+        self.assertEqual("cstring" in scope["__dir__"](), True)
+        self.assertEqual(scope["__getattr__"]("cstring"), netius.common.util.cstring)
+        self.assertEqual(scope["__getattr__"]("style"), netius.common.style)
+        self.assertEqual(scope["cstring"], netius.common.util.cstring)
+        self.assertRaises(AttributeError, lambda: scope["__getattr__"]("unknown"))
+
+    def test_import(self):
+        # runs the import in a fresh interpreter (for all the supported
+        # versions, including Python 2) as the package level initialization
+        # is already done for the current one
+        script = "import netius; print(netius.SimpleAuth.__name__)"
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout = subprocess.PIPE
+        )
+        stdout, _stderr = process.communicate()
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(netius.legacy.str(stdout).strip(), "SimpleAuth")
+
+    def test_imports(self):
+        if not netius.legacy.PYTHON_37: return
+
+        script = "import sys, netius.servers; print(\" \".join(sorted(sys.modules)))"
+        process = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout = subprocess.PIPE
+        )
+        stdout, _stderr = process.communicate()
+        modules = netius.legacy.str(stdout).split()
+
+        self.assertEqual("netius.servers" in modules, True)
+        self.assertEqual("netius.servers.http" in modules, False)
+        self.assertEqual("netius.common.http" in modules, False)
+        self.assertEqual("netius.auth" in modules, False)
+        self.assertEqual("urllib.request" in modules, False)
+
+    def test_names(self):
+        import netius.servers
+
+        self.assertEqual(netius.servers.HTTPServer, netius.servers.http.HTTPServer)
+        self.assertEqual(netius.SimpleAuth, netius.auth.SimpleAuth)
+        self.assertEqual(netius.legacy.HTTPError.__name__, "HTTPError")
+        self.assertRaises(AttributeError, lambda: netius.servers.Unknown)
@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import unittest
+
+from netius.base import metrics
+
+class RegistryTest(unittest.TestCase):
+
+    def test_counter(self):
+        registry = metrics.Registry()
+        counter = registry.counter("requests_total", "Number of requests")
+        counter.inc()
+        counter.inc(2)
+
+        self.assertEqual(counter.name, "netius_requests_total")
+        self.assertEqual(counter.get(), 3)
+        self.assertEqual(registry.get("requests_total"), counter)
+        self.assertEqual(registry.counter("requests_total"), counter)
+        self.assertEqual(
+            registry.render(),
+            "# HELP netius_requests_total Number of requests\n" +\
+            "# TYPE netius_requests_total counter\n" +\
+            "netius_requests_total 3\n"
+        )
+
+    def test_labels(self):
+        registry = metrics.Registry()
+        counter = registry.counter("responses_total", label = "code")
+        counter.inc(key = 200)
+        counter.inc(key = 404)
+        counter.inc(key = 200)
+
+        self.assertEqual(counter.get(key = 200), 2)
+        self.assertEqual(counter.get(key = 500), 0)
+        self.assertEqual(
+            registry.render(),
+            "# TYPE netius_responses_total counter\n" +\
+            "netius_responses_total{code=\"200\"} 2\n" +\
+            "netius_responses_total{code=\"404\"} 1\n"
+        )
+
+    def test_gauge(self):
+        values = [1, 2, 3]
+        registry = metrics.Registry()
+        gauge = registry.gauge("values", getter = lambda: len(values))
+
+        self.assertEqual(gauge.get(), 3)
+        values.pop()
+        self.assertEqual(registry.render().splitlines()[-1], "netius_values 2")
+
+    def test_histogram(self):
+        registry = metrics.Registry()
+        histogram = registry.histogram("latency_seconds", buckets = (0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        self.assertEqual(
+            registry.render(),
+            "# TYPE netius_latency_seconds histogram\n" +\
+            "netius_latency_seconds_bucket{le=\"0.1\"} 1\n" +\
+            "netius_latency_seconds_bucket{le=\"1.0\"} 2\n" +\
+            "netius_latency_seconds_bucket{le=\"+Inf\"} 3\n" +\
+            "netius_latency_seconds_sum 5.55\n" +\
+            "netius_latency_seconds_count 3\n"
+        )
@@ -0,0 +1,129 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import weakref
+import unittest
+
+import netius
+import netius.common
+
+class ObservableTest(unittest.TestCase):
+
+    def test_bind(self):
+        calls = []
+        observable = netius.Observable()
+        handler = lambda *args, **kwargs: calls.append((args, kwargs))
+        observable.bind("event", handler)
+        observable.bind("event", handler)
+
+        self.assertEqual(observable.events["event"], (handler, handler))
+
+        observable.trigger("event", 1, value = 2)
+        observable.fire("event", 3)
+        observable.fire("other", 4)
+
+        self.assertEqual(calls, [
+            ((1,), dict(value = 2)),
+            ((1,), dict(value = 2)),
+            ((3,), dict()),
+            ((3,), dict())
+        ])
+
+        observable.unbind("event", handler)
+        self.assertEqual(observable.events["event"], (handler,))
+
+        observable.unbind("event")
+        self.assertEqual("event" in observable.events, False)
+
+        observable.bind("event", len)
+        self.assertRaises(ValueError, observable.unbind, "event", handler)
+
+    def test_oneshot(self):
+        calls = []
+        observable = netius.Observable()
+        observable.bind("event", lambda value: calls.append(("normal", value)))
+        observable.bind("event", lambda value: calls.append(("oneshot", value)), oneshot = True)
+
+        observable.fire("event", 1)
+        observable.fire("event", 2)
+
+        self.assertEqual(calls, [("normal", 1), ("oneshot", 1), ("normal", 2)])
+        self.assertEqual(len(observable.events["event"]), 1)
+        self.assertEqual(observable.oneshots, None)
+
+    def test_reentrant(self):
+        calls = []
+        observable = netius.Observable()
+
+        def first(value):
+            calls.append(("first", value))
+            observable.unbind("event", second)
+            observable.bind("event", third, oneshot = True)
+
+        def second(value):
+            calls.append(("second", value))
+
+        def third(value):
+            calls.append(("third", value))
+
+        observable.bind("event", first, oneshot = True)
+        observable.bind("event", second)
+
+        observable.fire("event", 1)
+        observable.fire("event", 2)
+        observable.fire("event", 3)
+
+        self.assertEqual(calls, [("first", 1), ("second", 1), ("third", 2)])
+        self.assertEqual("event" in observable.events, False)
+
+    def test_unbind_all(self):
+        observable = netius.Observable()
+        observable.bind("event", len, oneshot = True)
+        observable.bind("other", len)
+        observable.unbind_all()
+
+        self.assertEqual(observable.events, {})
+        self.assertEqual(observable.oneshots, None)
+
+    def test_weakref(self):
+        observable = netius.Observable()
+        parser = netius.common.HTTPParser(None)
+
+        self.assertEqual(weakref.ref(observable)(), observable)
+        self.assertEqual(weakref.ref(parser)(), parser)
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import socket
+import unittest
+
+import netius
+
+class EpollPollTest(unittest.TestCase):
+
+    def setUp(self):
+        if not netius.EpollPoll.test():
+            self.skipTest("No epoll support available")
+
+    def test_dispatch(self):
+        values = []
+
+        class DispatchBase(netius.Base):
+
+            def on_read(self, _socket):
+                values.append(("read", _socket))
+
+            def on_write(self, _socket):
+                values.append(("write", _socket))
+
+        base = DispatchBase(poll = netius.EpollPoll)
+        base.poll = base.build_poll()
+        base.poll.open(timeout = 0)
+
+        local, remote = socket.socketpair()
+        try:
+            base.sub_read(local)
+
+            self.assertEqual(base.poll.is_dispatch(), True)
+            self.assertEqual(base.poll.dispatch(), 1)
+            self.assertEqual(values, [("write", local)])
+
+            del values[:]
+            remote.send(b"x")
+
+            self.assertEqual(base.poll.dispatch(), 1)
+            self.assertEqual(values, [("read", local), ("write", local)])
+
+            base.unsub_read(local)
+            remote.send(b"x")
+
+            self.assertEqual(base.poll.dispatch(), 0)
+            self.assertEqual(base.poll.fd_h, {})
+        finally:
+            local.close()
+            remote.close()
+            base.poll.close()
+
+    def test_dispatch_reuse(self):
+        values = []
+        sockets = []
+
+        class ReuseBase(netius.Base):
+
+            def on_read(self, _socket):
+                values.append(_socket)
+                if sockets: return
+                other = first if _socket == second else second
+                self.unsub_read(other)
+                other.close()
+                local, remote = socket.socketpair()
+                sockets.extend((local, remote))
+                self.sub_read(local)
+
+            def on_error(self, _socket):
+                values.append(_socket)
+
+        base = ReuseBase(poll = netius.EpollPoll)
+        base.poll = base.build_poll()
+        base.poll.open(timeout = 0)
+
+        first, first_r = socket.socketpair()
+        second, second_r = socket.socketpair()
+        try:
+            base.sub_read(first)
+            base.sub_read(second)
+            first_r.send(b"x")
+            second_r.close()
+
+            base.poll.dispatch()
+
+            self.assertEqual(len(sockets), 2)
+            self.assertEqual(sockets[0] in values, False)
+        finally:
+            base.poll.close()
+            for _socket in [first, first_r, second] + sockets: _socket.close()
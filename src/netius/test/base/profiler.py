@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import pstats
+import tempfile
+import threading
+import unittest
+
+import netius
+
+from netius.base import profiler
+
+class ProfilerTest(unittest.TestCase):
+
+    def test_sampler(self):
+        sampler = profiler.Sampler(threading.current_thread().ident)
+
+        # creates the handler under a non netius module so that the time
+        # of the sample is attributed to it (external callback)
+        handler = eval("lambda: sampler.sample()", dict(__name__ = "app", sampler = sampler))
+        base = netius.Base()
+        base.delay(handler, immediately = True)
+        base._delays()
+
+        self.assertEqual(sampler.samples, 1)
+        self.assertEqual(len(sampler.stacks), 1)
+
+        stack = list(sampler.stacks.keys())[0]
+        top = sampler.top()
+
+        self.assertIn("netius.base.common:", stack)
+        self.assertTrue(stack.endswith("app:<lambda>;netius.base.profiler:Sampler.sample"))
+        self.assertEqual(len(top), 1)
+        self.assertEqual(top[0]["name"], "app:<lambda>")
+        self.assertEqual(top[0]["ratio"], 1.0)
+
+    def test_sampler_concurrent(self):
+        running = [True]
+
+        def work(depth = 0):
+            if depth < 32 and running[0]: return work(depth + 1)
+            return depth
+
+        def run():
+            while running[0]: work()
+
+        thread = threading.Thread(target = run)
+        thread.start()
+        sampler = profiler.Sampler(thread.ident, rate = 10000)
+        sampler.start()
+        try:
+            path = os.path.join(tempfile.gettempdir(), "netius-sampler.folded")
+            for _index in range(200):
+                sampler.top()
+                sampler.dump(path)
+            os.remove(path)
+        finally:
+            sampler.stop()
+            running[0] = False
+            thread.join()
+
+        self.assertNotEqual(sampler.samples, 0)
+
+    def test_profile(self):
+        base = netius.Base(profile_path = tempfile.gettempdir())
+        base.profile_start(mode = "cprofile")
+        base.profile_start(mode = "sample")
+
+        self.assertEqual(base.profile_dict()["running"], True)
+        self.assertEqual(base.profile_dict()["profiler"]["type"], "Tracer")
+
+        path = base.profile_stop()
+        try:
+            self.assertTrue(path.endswith(".pstats"))
+            self.assertEqual(base.profile_dict()["running"], False)
+            self.assertEqual(base.profile_dict()["last"], path)
+            self.assertNotEqual(pstats.Stats(path).total_calls, 0)
+        finally:
+            os.remove(path)
+
+        self.assertEqual(base.profile_stop(), None)
+        self.assertRaises(netius.NetiusError, base.profile_start, mode = "invalid")
@@ -0,0 +1,232 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import os
+import socket
+import unittest
+
+import netius
+
+class StreamServerTest(unittest.TestCase):
+
+    def test_reuse_port(self):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            self.skipTest("No SO_REUSEPORT support available")
+
+        server = netius.StreamServer()
+        first = server.socket_tcp(reuse_port = True)
+        second = server.socket_tcp(reuse_port = True)
+        try:
+            first.bind(("127.0.0.1", 0))
+            port = first.getsockname()[1]
+            second.bind(("127.0.0.1", port))
+            first.listen(1)
+            second.listen(1)
+
+            self.assertEqual(second.getsockname()[1], port)
+        finally:
+            first.close()
+            second.close()
+
+    def test_reuse_port_serve(self):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            self.skipTest("No SO_REUSEPORT support available")
+
+        server = netius.StreamServer(children = 2)
+        bound = []
+
+        def fork():
+            server._child = True
+            server._child_index = 1
+            return True
+
+        def setuid(uid):
+            bound.extend(_socket.getsockname()[1] for _socket in sockets)
+
+        sockets = []
+        socket_tcp = server.socket_tcp
+
+        def _socket_tcp(*args, **kwargs):
+            _socket = socket_tcp(*args, **kwargs)
+            sockets.append(_socket)
+            return _socket
+
+        _setuid = os.setuid
+        server.fork = fork
+        server.socket_tcp = _socket_tcp
+        os.setuid = setuid
+        try:
+            server.serve(
+                host = "127.0.0.1",
+                port = 0,
+                reuse_port = True,
+                setuid = 1000,
+                load = False,
+                start = False
+            )
+        finally:
+            os.setuid = _setuid
+
+        try:
+            self.assertEqual(len(sockets), 2)
+            self.assertEqual(bound, [server.port, server.port])
+            self.assertEqual(server.socket, sockets[1])
+            self.assertEqual(server.socket.getsockopt(
+                socket.SOL_SOCKET, socket.SO_REUSEPORT
+            ) > 0, True)
+            self.assertEqual(server.socket.getsockname()[1], server.port)
+            self.assertRaises(socket.error, sockets[0].getsockname)
+
+            client = socket.create_connection(("127.0.0.1", server.port))
+            try:
+                _socket, _address = server.socket.accept()
+                _socket.close()
+            finally:
+                client.close()
+        finally:
+            server.cleanup()
+
+    def test_report(self):
+        server = netius.StreamServer()
+
+        self.assertEqual(server.info_dict()["accepts"], 0)
+        self.assertEqual("children_stats" in server.info_dict(), False)
+
+        server.on_command("report 100 {\"accepts\" : 10}")
+        server.on_command("report 101 {\"accepts\" : 20}")
+        server.on_command("report 100 {\"accepts\" : 15}")
+
+        info = server.info_dict()
+        self.assertEqual(info["children_stats"], {
+            100 : dict(accepts = 15),
+            101 : dict(accepts = 20)
+        })
+
+    def test_report_child(self):
+        messages = []
+
+        server = netius.StreamServer()
+        server.on_child(pipe = messages.append)
+
+        self.assertEqual(len(server._delayed), 1)
+
+        server.accepts = 3
+        server.report_child()
+        server.report_child()
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].startswith("report "), True)
+        self.assertEqual(messages[0].endswith("\"accepts\": 3}"), True)
+
+    def test_read_budget(self):
+        values = []
+
+        class BudgetServer(netius.StreamServer):
+
+            def on_data(self, connection, data):
+                values.append(len(data))
+
+        server = BudgetServer(read_budget = 16384)
+        server.poll = server.build_poll()
+        server.poll.open(timeout = 0)
+
+        local, remote = socket.socketpair()
+        try:
+            local.setblocking(0)
+            connection = server.build_connection(local)
+            connection.open()
+
+            remote.sendall(b"x" * 32768)
+
+            server.on_read(local)
+            self.assertEqual(sum(values), 16384)
+            self.assertEqual(server.budget_c, 1)
+            self.assertEqual(list(server._ready), [local])
+            self.assertEqual(server.get_timeout(), 0.0)
+
+            server.on_read(local)
+            self.assertEqual(sum(values), 16384)
+
+            server._readies()
+            self.assertEqual(sum(values), 32768)
+            self.assertEqual(server.budget_c, 2)
+
+            server._readies()
+            self.assertEqual(len(server._ready), 0)
+        finally:
+            server.cleanup()
+            local.close()
+            remote.close()
+
+    def test_views(self):
+        values = []
+
+        class ViewsServer(netius.StreamServer):
+
+            def on_data(self, connection, data):
+                values.append((type(data), data.tobytes()))
+
+        server = ViewsServer()
+        server.poll = server.build_poll()
+        server.poll.open(timeout = 0)
+
+        local, remote = socket.socketpair()
+        try:
+            local.setblocking(0)
+            connection = server.build_connection(local)
+            connection.views = True
+            connection.open()
+
+            remote.sendall(b"hello")
+            server.on_read(local)
+
+            self.assertEqual(values, [(memoryview, b"hello")])
+            self.assertEqual(connection._buffer, None)
+            self.assertEqual(server._buffers.info_dict()["available"], 1)
+            self.assertEqual(server._buffers.info_dict()["created"], 1)
+
+            remote.sendall(b"world")
+            server.on_read(local)
+
+            self.assertEqual(values[-1], (memoryview, b"world"))
+            self.assertEqual(server._buffers.info_dict()["created"], 1)
+        finally:
+            server.cleanup()
+            local.close()
+            remote.close()
@@ -0,0 +1,209 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import unittest
+
+import netius
+
+class TimerWheelTest(unittest.TestCase):
+
+    def test_order(self):
+        values = []
+        wheel = netius.TimerWheel()
+        current = time.time()
+
+        wheel.schedule(lambda: values.append("timed"), current - 1.0, 0)
+        wheel.schedule(lambda: values.append("next"), 0, 0)
+        wheel.schedule(lambda: values.append("immediate"), -1, 0)
+        wheel.schedule(lambda: values.append("future"), current + 60.0, 0)
+        wheel.harvest(current)
+
+        self.assertEqual(len(wheel), 4)
+
+        while True:
+            timer = wheel.pop(1)
+            if not timer: break
+            timer.callable()
+
+        self.assertEqual(values, ["immediate", "next", "timed"])
+        self.assertEqual(len(wheel), 1)
+
+    def test_next_tick(self):
+        wheel = netius.TimerWheel()
+        wheel.schedule(lambda: None, 0, 1)
+
+        self.assertEqual(wheel.pop(1), None)
+        self.assertNotEqual(wheel.pop(2), None)
+        self.assertEqual(len(wheel), 0)
+
+    def test_verify(self):
+        callable = lambda: None
+        wheel = netius.TimerWheel()
+
+        timer = wheel.schedule(callable, -1, 0, verify = True)
+        duplicate = wheel.schedule(callable, -1, 0, verify = True)
+
+        self.assertNotEqual(timer, None)
+        self.assertEqual(duplicate, None)
+        self.assertEqual(len(wheel), 1)
+
+        timer.cancel()
+        timer = wheel.schedule(callable, -1, 0, verify = True)
+
+        self.assertNotEqual(timer, None)
+        self.assertEqual(wheel.pop(0), timer)
+        self.assertEqual(wheel.pop(0), None)
+
+    def test_cancel(self):
+        wheel = netius.TimerWheel()
+        current = time.time()
+
+        timer = wheel.schedule(lambda: None, current + 0.5, 0)
+        timer.cancel()
+
+        self.assertEqual(timer.callable, None)
+
+        wheel.harvest(current + 1.0)
+
+        self.assertEqual(wheel.pop(0), None)
+        self.assertEqual(wheel.count, 0)
+
+    def test_revolution(self):
+        wheel = netius.TimerWheel(resolution = 0.01, slots = 8)
+        current = time.time()
+
+        near = wheel.schedule(lambda: None, current + 0.02, 0)
+        far = wheel.schedule(lambda: None, current + 0.5, 0)
+        wheel.harvest(current + 0.1)
+
+        self.assertEqual(wheel.pop(0), near)
+        self.assertEqual(wheel.pop(0), None)
+
+        wheel.harvest(current + 1.0)
+
+        self.assertEqual(wheel.pop(0), far)
+        self.assertEqual(len(wheel), 0)
+
+    def test_timeout(self):
+        wheel = netius.TimerWheel()
+        current = time.time()
+
+        self.assertEqual(wheel.timeout(current), None)
+
+        timer = wheel.schedule(lambda: None, current + 0.5, 0)
+
+        self.assertAlmostEqual(wheel.timeout(current), 0.5, places = 3)
+
+        wheel.schedule(lambda: None, 0, 0)
+
+        self.assertEqual(wheel.timeout(current), 0.0)
+
+        wheel.pop(1)
+        timer.cancel()
+
+        self.assertEqual(wheel.timeout(current), None)
+        self.assertEqual(len(wheel), 0)
+
+        wheel = netius.TimerWheel(resolution = 0.01, slots = 8)
+        wheel.schedule(lambda: None, current + 30.0, 0)
+        wheel.schedule(lambda: None, current + 0.02, 0).cancel()
+
+        self.assertAlmostEqual(wheel.timeout(current), 30.0, places = 3)
+        self.assertEqual(len(wheel.ticks), 1)
+
+class DelayTest(unittest.TestCase):
+
+    def test_delay(self):
+        values = []
+        loop = netius.Base()
+
+        loop.delay(lambda: values.append(1))
+        handle = loop.delay(lambda: values.append(2))
+        loop.delay(lambda: values.append(3), immediately = True)
+        handle.cancel()
+        loop._lid += 1
+        loop._delays()
+
+        self.assertEqual(values, [3, 1])
+
+    def test_delay_s(self):
+        values = []
+        loop = netius.Base()
+
+        handle = loop.delay_s(lambda: values.append(1), wakeup = False)
+        loop.delay_s(lambda: values.append(2), wakeup = False)
+        handle.cancel()
+        loop._delays()
+
+        self.assertEqual(values, [2])
+
+    def test_get_timeout(self):
+        loop = netius.Base()
+
+        self.assertEqual(loop.get_timeout(), -1)
+
+        loop.delay(lambda: None, timeout = 5.0)
+
+        self.assertTrue(loop.get_timeout() > 4.0)
+        self.assertTrue(loop.get_timeout() <= 5.0)
+
+        loop.delay(lambda: None)
+
+        self.assertEqual(loop.get_timeout(), 0.0)
+
+        loop.poll_adaptive = False
+
+        self.assertEqual(loop.get_timeout(), loop.poll_timeout)
+
+    def test_container_delay(self):
+        values = []
+        container = netius.Container()
+        base = netius.Base()
+        container.add_base(base)
+
+        container.delay(lambda: values.append(1), immediately = True)
+        base.delay(lambda: values.append(2), immediately = True)
+
+        self.assertEqual(container.get_timeout(), 0.0)
+
+        container.ticks()
+
+        self.assertEqual(values, [1, 2])
+        self.assertEqual(container.get_timeout(), -1)
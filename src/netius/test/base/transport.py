@@ -60,3 +60,35 @@ class TransportTest(unittest.TestCase):
         self.assertEqual(connection.is_closed(), True)
 
         transport.write(b"")
+
+    def test_pause_reading(self):
+        class Owner(object):
+            def __init__(self): self.reading = set()
+            def sub_read(self, socket): self.reading.add(socket)
+            def unsub_read(self, socket): self.reading.discard(socket)
+
+        owner = Owner()
+        connection = netius.Connection(owner = owner, socket = "socket")
+        connection.status = netius.OPEN
+        owner.sub_read(connection.socket)
+        transport = netius.Transport(None, connection)
+
+        self.assertEqual(transport.is_reading(), True)
+
+        transport.pause_reading()
+
+        self.assertEqual(transport.is_reading(), False)
+        self.assertEqual(connection.renable, False)
+        self.assertEqual(owner.reading, set())
+
+        transport.resume_reading()
+
+        self.assertEqual(transport.is_reading(), True)
+        self.assertEqual(connection.renable, True)
+        self.assertEqual(owner.reading, set(("socket",)))
+
+        connection.status = netius.CLOSED
+        transport.pause_reading()
+
+        self.assertEqual(transport.is_reading(), False)
+        self.assertEqual(owner.reading, set(("socket",)))
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import time
+import socket
+import unittest
+
+import netius
+
+class WatchdogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.base = netius.Base()
+        self.base.watchdog_set(True, threshold = 0.01)
+
+    def tearDown(self):
+        self.base.watchdog_set(False)
+
+    def test_delays(self):
+        def slow(): time.sleep(0.02)
+        def fast(): pass
+
+        self.base.delay(slow, immediately = True)
+        self.base.delay(fast, immediately = True)
+        self.base._delays()
+
+        top = self.base.watchdog_dict()["top"]
+
+        self.assertEqual(self.base.watchdog_dict()["slow"], 1)
+        self.assertEqual(len(top), 1)
+        self.assertTrue(top[0]["name"].endswith("slow"))
+        self.assertEqual(top[0]["count"], 1)
+        self.assertEqual(top[0]["connection"], None)
+        self.assertTrue(top[0]["max"] >= 0.02)
+
+    def test_instrument(self):
+        base = netius.Base(instrument = True, poll_dispatch = True)
+        base.watchdog_set(True, threshold = 0.01)
+        base.poll = base.build_poll()
+        base.poll.open(timeout = 0)
+        try:
+            calls = []
+            base.dispatch = lambda timeout = None: calls.append(timeout) or 0
+            base.delay(lambda: None, timeout = 0.01)
+            base._running = True
+            base._loop_instrumented()
+
+            self.assertEqual(calls, [])
+        finally:
+            base.watchdog_set(False)
+            base.close()
+
+    def test_trigger(self):
+        server = netius.StreamServer()
+        local, remote = socket.socketpair()
+        try:
+            connection = server.build_connection(local)
+            connection.bind("custom", lambda connection: time.sleep(0.02))
+            connection.trigger("custom", connection)
+            connection.trigger("custom", connection)
+        finally:
+            server.cleanup()
+            local.close()
+            remote.close()
+
+        top = self.base.watchdog_dict()["top"]
+
+        self.assertEqual(len(top), 1)
+        self.assertEqual(top[0]["count"], 2)
+        self.assertEqual(top[0]["connection"], connection.id)
+        self.assertEqual(self.base._watchdog.suppressed, 1)
+
+    def test_disable(self):
+        self.assertIn("on_read", self.base.__dict__)
+        self.assertEqual(netius.Observable.watcher, self.base._watchdog)
+
+        self.base.watchdog_set(False)
+
+        self.assertNotIn("on_read", self.base.__dict__)
+        self.assertEqual(netius.Observable.watcher, None)
+        self.assertEqual(self.base.watchdog_dict()["enabled"], False)
@@ -310,6 +310,64 @@ class HTTPParserTest(unittest.TestCase):
         finally:
             parser.clear()
 
+    def test_views(self):
+        if not netius.common.HTTPParser.VIEWS: return
+
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True
+        )
+        try:
+            data = memoryview(bytearray(SIMPLE_REQUEST))
+            parser.parse(data[:20])
+            parser.parse(data[20:-5])
+            parser.parse(data[-5:])
+            data[:] = b"\0" * len(data)
+            message = parser.get_message()
+            headers = parser.get_headers()
+            self.assertEqual(parser.method, "get")
+            self.assertEqual(parser.content_l, 11)
+            self.assertEqual(message, b"Hello World")
+            self.assertEqual(headers["Content-Length"], "11")
+        finally:
+            parser.clear()
+
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True,
+            file_limit = -1
+        )
+        try:
+            data = memoryview(bytearray(SIMPLE_REQUEST))
+            parser.parse(data)
+            message_b = parser.get_message_b()
+            self.assertEqual(message_b.read(), b"Hello World")
+        finally:
+            parser.clear()
+
+        for size in (1, 3, 7, 64):
+            parser = netius.common.HTTPParser(
+                self,
+                type = netius.common.REQUEST,
+                store = True
+            )
+            try:
+                buffer = bytearray(size)
+                for index in range(0, len(CHUNKED_REQUEST), size):
+                    chunk = CHUNKED_REQUEST[index:index + size]
+                    buffer[:len(chunk)] = chunk
+                    parser.parse(memoryview(buffer)[:len(chunk)])
+                    buffer[:] = b"\0" * size
+                message = parser.get_message()
+                headers = parser.get_headers()
+                self.assertEqual(parser.path_s, "http://localhost")
+                self.assertEqual(message, b"Hello World")
+                self.assertEqual(headers["Transfer-Encoding"], "chunked")
+            finally:
+                parser.clear()
+
     def test_no_store(self):
         parser = netius.common.HTTPParser(
             self,
@@ -324,6 +382,139 @@ class HTTPParserTest(unittest.TestCase):
         finally:
             parser.clear()
 
+    def test_stream(self):
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True,
+            file_limit = -1
+        )
+        try:
+            partials = []
+            parser.bind("on_headers", parser.stream)
+            parser.bind("on_partial", partials.append)
+            parser.parse(CHUNKED_REQUEST)
+            message = parser.get_message()
+            self.assertEqual(message, b"")
+            self.assertEqual(parser.message_f, None)
+            self.assertEqual(b"".join(partials), b"Hello World")
+        finally:
+            parser.clear()
+
+    def test_pipelined(self):
+        messages = []
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True
+        )
+        parser.bind("on_data", lambda: messages.append(parser.get_message()))
+        try:
+            parser.parse(SIMPLE_REQUEST * 2 + SIMPLE_REQUEST[:40])
+            self.assertEqual(messages, [b"Hello World", b"Hello World"])
+            parser.parse(SIMPLE_REQUEST[40:])
+            self.assertEqual(len(messages), 3)
+            self.assertEqual(messages[2], b"Hello World")
+        finally:
+            parser.clear()
+
+    def test_incremental(self):
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True
+        )
+        try:
+            for index in range(len(SIMPLE_REQUEST)):
+                parser.parse(SIMPLE_REQUEST[index:index + 1])
+            self.assertEqual(parser.get_message(), b"Hello World")
+            self.assertEqual(parser.headers["server"], "Test Service/1.0.0")
+            self.assertEqual(parser.headers["content-length"], "11")
+            self.assertEqual(parser.headers_b, bytearray())
+        finally:
+            parser.clear()
+
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True
+        )
+        try:
+            parser.parse(SIMPLE_REQUEST[:80])
+            self.assertEqual(parser.state, netius.common.http.HEADERS_STATE)
+            self.assertEqual(parser.headers["date"], "Wed, 1 Jan 2014 00:00:00 GMT")
+            self.assertEqual("content-length" in parser.headers, False)
+        finally:
+            parser.clear()
+
+    def test_headers_limit(self):
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True,
+            headers_limit = 128
+        )
+        try:
+            parser.parse(b"GET / HTTP/1.1\r\n")
+            for _index in range(7): parser.parse(b"X-Header: value\r\n")
+            self.assertRaises(
+                netius.ParserError,
+                lambda: parser.parse(b"X-Header: value\r\n")
+            )
+        finally:
+            parser.clear()
+
+    def test_lazy(self):
+        if not netius.legacy.PYTHON_3: return
+
+        parser = netius.common.HTTPParser(
+            self,
+            type = netius.common.REQUEST,
+            store = True,
+            lazy = True
+        )
+        try:
+            parser.parse(SIMPLE_REQUEST)
+            headers = parser.headers
+            self.assertEqual(isinstance(headers, netius.common.HeadersView), True)
+            self.assertEqual(type(dict.__getitem__(headers, "server")), slice)
+            self.assertEqual(headers["server"], "Test Service/1.0.0")
+            self.assertEqual(dict.__getitem__(headers, "server"), "Test Service/1.0.0")
+            self.assertEqual(parser.content_l, 11)
+            self.assertEqual(parser.get_message(), b"Hello World")
+            self.assertEqual(dict(headers), {
+                "date" : "Wed, 1 Jan 2014 00:00:00 GMT",
+                "server" : "Test Service/1.0.0",
+                "content-length" : "11"
+            })
+            self.assertEqual(parser.get_headers()["Date"], "Wed, 1 Jan 2014 00:00:00 GMT")
+        finally:
+            parser.clear()
+
+        for request in (
+            SIMPLE_REQUEST,
+            EXTRA_SPACES_REQUEST,
+            INVALID_HEADERS_REQUEST,
+            INVALID_HEADERS_TAB_REQUEST,
+            INVALID_HEADERS_NEWLINE_REQUEST
+        ):
+            results = []
+            for lazy in (False, True):
+                parser = netius.common.HTTPParser(
+                    self,
+                    type = netius.common.REQUEST,
+                    store = True,
+                    lazy = lazy
+                )
+                try:
+                    parser.parse(request)
+                    results.append(dict(parser.headers))
+                except netius.ParserError:
+                    results.append(None)
+                finally:
+                    parser.clear()
+            self.assertEqual(results[0], results[1])
+
     def test_clear(self):
         parser = netius.common.HTTPParser(
             self,
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import struct
+import unittest
+
+import netius.common
+
+class HTTP2ParserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.settings = dict(netius.common.HTTP2_SETTINGS_OPTIMAL)
+        self.window = netius.common.HTTP2_WINDOW
+
+    def test_control(self):
+        frames = []
+        parser = netius.common.HTTP2Parser(self)
+        parser.bind("on_frame", lambda: frames.append(parser.type))
+        data = self._frame(netius.common.SETTINGS, 0x00, struct.pack("!HI", 0x03, 100)) +\
+            self._frame(netius.common.PING, 0x00, b"12345678") +\
+            self._frame(netius.common.WINDOW_UPDATE, 0x00, struct.pack("!I", 1024))
+        for index in range(0, len(data), 5): parser.parse(data[index:index + 5])
+        self.assertEqual(frames, [
+            netius.common.SETTINGS,
+            netius.common.PING,
+            netius.common.WINDOW_UPDATE
+        ])
+
+    def test_empty(self):
+        frames = []
+        parser = netius.common.HTTP2Parser(self)
+        parser.bind("on_frame", lambda: frames.append(parser.type))
+        parser.parse(self._frame(netius.common.SETTINGS, 0x01, b""))
+        self.assertEqual(frames, [netius.common.SETTINGS])
+
+    def _frame(self, type, flags, payload, stream = 0x00):
+        header = struct.pack("!I", len(payload))[1:]
+        return header + struct.pack("!BBI", type, flags, stream) + payload
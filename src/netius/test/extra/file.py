@@ -0,0 +1,119 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import netius.extra
+
+class FileServerTest(unittest.TestCase):
+
+    def setUp(self):
+        unittest.TestCase.setUp(self)
+        self.server = netius.extra.FileServer(variants = 4096)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        unittest.TestCase.tearDown(self)
+        self.server.cleanup()
+        shutil.rmtree(self.directory)
+
+    def test_variant_sibling(self):
+        path = os.path.join(self.directory, "style.css")
+        with open(path, "wb") as file: file.write(b"body {}")
+        with open(path + ".gz", "wb") as file: file.write(b"gzip")
+        modified = os.path.getmtime(path)
+
+        result = self.server._resolve_variant(None, path, modified, "text/css")
+        self.assertEqual(result, (path + ".gz", None))
+
+        result = self.server._resolve_variant(None, path, modified + 10, "text/css")
+        self.assertEqual(result, (None, None))
+
+    def test_variant_compress(self):
+        path = os.path.join(self.directory, "app.js")
+        with open(path, "wb") as file: file.write(b"netius " * 512)
+        size = os.path.getsize(path)
+        key = (path, os.path.getmtime(path), size)
+
+        data = self.server._compress_variant(key)
+        self.assertEqual(len(data) < size, True)
+        self.assertEqual(data[:2], b"\x1f\x8b")
+
+        self.server._variants_p.add(key)
+        self.server._store_variant(key, data)
+        self.assertEqual(self.server._variants_p, set())
+
+        result = self.server._resolve_variant(None, path, key[1], "application/javascript")
+        self.assertEqual(result, (None, data))
+
+    def test_variant_evict(self):
+        self.server._store_variant(("a", 0, 0), b"a" * 2048)
+        self.server._store_variant(("b", 0, 0), b"b" * 1024)
+        self.server._store_variant(("c", 0, 0), b"c" * 2048)
+
+        self.assertEqual(list(self.server._variants.keys()), [("b", 0, 0), ("c", 0, 0)])
+        self.assertEqual(self.server._variants_s, 3072)
+
+        self.server._store_variant(("d", 0, 0), b"d" * 8192)
+
+        self.assertEqual(("d", 0, 0) in self.server._variants, False)
+        self.assertEqual(self.server._variants_s, 3072)
+
+    def test_variant_count(self):
+        self.server.variants_count = 2
+        self.server._store_variant(("a", 0, 0), None)
+        self.server._store_variant(("b", 0, 0), b"b" * 1024)
+        self.server._store_variant(("c", 0, 0), None)
+
+        self.assertEqual(list(self.server._variants.keys()), [("b", 0, 0), ("c", 0, 0)])
+        self.assertEqual(self.server._variants_s, 1024)
+
+    def test_variant_failure(self):
+        path = os.path.join(self.directory, "missing.js")
+        key = (path, 0, 2048)
+
+        data = self.server._compress_variant(key)
+        self.assertEqual(data, False)
+
+        self.server._variants_p.add(key)
+        self.server._store_variant(key, data)
+        self.assertEqual(self.server._variants_p, set())
+        self.assertEqual(key in self.server._variants, False)
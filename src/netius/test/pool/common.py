@@ -49,3 +49,17 @@ class EventPoolTest(unittest.TestCase):
 
         self.assertNotEqual(pool.events, [])
         self.assertEqual(pool.pop_event(), ("test", 1))
+
+    def test_notify(self):
+        notifies = []
+        pool = netius.pool.EventPool()
+        pool.notify = lambda: notifies.append(True)
+        pool.push_event(("test", 1))
+        pool.push_event(("test", 2))
+
+        self.assertEqual(len(notifies), 1)
+        self.assertEqual(pool.pop_all(), [("test", 1), ("test", 2)])
+
+        pool.push_event(("test", 3))
+
+        self.assertEqual(len(notifies), 2)
@@ -37,6 +37,7 @@ __copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import socket
 import unittest
 
 import netius.servers
@@ -90,3 +91,120 @@ class HTTPServerTest(unittest.TestCase):
             "Content-Type" : "application/json;charset=utf-8",
             "Content-Length" : "12"
         })
+
+    def test_slots(self):
+        http_server = netius.servers.HTTP2Server()
+        http_server.encoding = netius.servers.http.PLAIN_ENCODING
+        http_server.poll = http_server.build_poll()
+        http_server.poll.open(timeout = 0)
+        local, remote = socket.socketpair()
+        try:
+            connection = http_server.build_connection(local, ("127.0.0.1", 0))
+            connection.open()
+
+            self.assertEqual(connection.__dict__, {})
+            self.assertEqual(connection.parser.__dict__, {})
+            self.assertEqual(hasattr(connection, "queue"), False)
+
+            connection.queue = []
+            connection.custom = True
+
+            self.assertEqual(connection.queue, [])
+            self.assertEqual(connection.__dict__, dict(custom = True))
+        finally:
+            http_server.cleanup()
+            local.close()
+            remote.close()
+
+    def test_stream_body(self):
+        http_server = netius.servers.HTTPServer()
+        http_server.encoding = netius.servers.http.PLAIN_ENCODING
+        http_server.poll = http_server.build_poll()
+        http_server.poll.open(timeout = 0)
+        local, remote = socket.socketpair()
+        try:
+            bodies = []
+            messages = []
+            http_server.on_headers_http = lambda connection, parser:\
+                bodies.append(connection.stream_body(limit = 8))
+            http_server.on_data_http = lambda connection, parser:\
+                messages.append(parser.get_message())
+
+            connection = http_server.build_connection(local, ("127.0.0.1", 0))
+            connection.open()
+            connection.parser.parse(
+                b"POST / HTTP/1.1\r\nContent-Length: 16\r\n\r\n0123"
+            )
+
+            body = bodies[0]
+            self.assertEqual(body.read(), b"0123")
+            self.assertEqual(body.read(), b"")
+            self.assertEqual(body.paused, False)
+
+            connection.parser.parse(b"456789ab")
+
+            self.assertEqual(body.paused, True)
+            self.assertEqual(connection.renable, False)
+            self.assertEqual(body.read(2), b"45")
+            self.assertEqual(body.paused, True)
+            self.assertEqual(body.read(2), b"67")
+            self.assertEqual(body.paused, False)
+            self.assertEqual(connection.renable, True)
+
+            connection.parser.parse(b"cdef")
+
+            self.assertEqual(body.is_finished(), True)
+            self.assertEqual(body.read(), b"89abcdef")
+            self.assertEqual(messages, [b""])
+            self.assertEqual(connection.body, None)
+        finally:
+            http_server.cleanup()
+            local.close()
+            remote.close()
+
+    def test_send_header(self):
+        http_server = netius.servers.HTTPServer()
+        http_server.encoding = netius.servers.http.PLAIN_ENCODING
+        http_server.poll = http_server.build_poll()
+        http_server.poll.open(timeout = 0)
+        local, remote = socket.socketpair()
+        try:
+            http_server._set_date("Thu, 01 Jan 2015 00:00:00 GMT")
+            connection = http_server.build_connection(local, ("127.0.0.1", 0))
+            connection.open()
+            connection.parser.parse(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+
+            buffer = []
+            connection.send = lambda data, **kwargs: buffer.append(data) or len(data)
+            headers = {"content-type" : "text/plain", "x-values" : ["a", "b"]}
+            connection.send_response(data = b"ok", headers = headers, apply = True)
+
+            # the order of the header lines follows the order of the
+            # headers map, which is not defined for older interpreters
+            lines = buffer[0].split(b"\r\n")
+            self.assertEqual(lines[0], b"HTTP/1.1 200 OK")
+            self.assertEqual(lines[-2:], [b"", b""])
+            self.assertEqual(sorted(lines[1:-2]), [
+                b"Connection: keep-alive",
+                b"Content-Length: 2",
+                b"Content-Type: text/plain",
+                b"Date: Thu, 01 Jan 2015 00:00:00 GMT",
+                b"Server: " + netius.legacy.bytes(netius.IDENTIFIER),
+                b"X-Values: a",
+                b"X-Values: b"
+            ])
+
+            http_server._set_date("Thu, 01 Jan 2015 00:00:01 GMT")
+
+            self.assertEqual(
+                ("Date", "Thu, 01 Jan 2015 00:00:00 GMT") in http_server._fragments,
+                False
+            )
+            self.assertEqual(
+                ("Date", "Thu, 01 Jan 2015 00:00:01 GMT") in http_server._fragments,
+                True
+            )
+        finally:
+            http_server.cleanup()
+            local.close()
+            remote.close()
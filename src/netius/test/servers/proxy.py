@@ -0,0 +1,65 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Netius System
+# Copyright (c) 2008-2020 Hive Solutions Lda.
+#
+# This file is part of Hive Netius System.
+#
+# Hive Netius System is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Netius System is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Netius System. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__version__ = "1.0.0"
+""" The version of the module """
+
+__revision__ = "$LastChangedRevision$"
+""" The revision number of the module """
+
+__date__ = "$LastChangedDate$"
+""" The last change date of the module """
+
+__copyright__ = "Copyright (c) 2008-2020 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import unittest
+
+import netius.servers
+
+class ProxyProtocolTest(unittest.TestCase):
+
+    def test_pending(self):
+        protocol = netius.servers.ProxyProtocol("GET", "http://localhost/")
+        count = protocol.send_base(b"hello")
+
+        self.assertEqual(count, 5)
+        self.assertEqual(protocol._delayed, [(b"hello", None, None)])
+        self.assertEqual(protocol.is_paused(), False)
+        self.assertEqual(protocol.is_exhausted(), False)
+        self.assertEqual(protocol.is_restored(), True)
+        self.assertEqual(protocol.get_socket(), None)
+
+    def test_closed(self):
+        connection = netius.Connection(owner = netius.Base())
+        transport = netius.Transport(None, connection)
+        protocol = netius.servers.ProxyProtocol("GET", "http://localhost/")
+        protocol.close()
+        protocol.connection_made(transport)
+
+        self.assertEqual(protocol.transport(), None)
+        self.assertEqual(transport.is_closing(), True)